@@ -1,6 +1,9 @@
 import 'dart:convert';
 import 'dart:io';
 import 'dart:async';
+import 'dart:typed_data';
+import 'package:flutter/foundation.dart' show visibleForTesting;
+import 'package:crypto/crypto.dart';
 import 'package:shelf/shelf.dart';
 import 'package:shelf/shelf_io.dart' as shelf_io;
 import 'package:shelf_router/shelf_router.dart' as shelf_router;
@@ -12,6 +15,24 @@ import '../providers/settings_provider.dart';
 import '../services/question_cache_service.dart';
 import '../services/star_transaction_service.dart';
 
+/// A response stored for replay to retried requests with the same idempotency key
+class _StoredResponse {
+  final int statusCode;
+  final String body;
+  final Map<String, String> headers;
+
+  _StoredResponse(this.statusCode, this.body, this.headers);
+}
+
+/// An idempotency key seen by the server, with the (possibly pending) result
+class _IdempotencyEntry {
+  final String fingerprint;
+  final DateTime createdAt;
+  final Future<_StoredResponse?> response;
+
+  _IdempotencyEntry(this.fingerprint, this.response) : createdAt = DateTime.now();
+}
+
 /// Service for running a local HTTP API server
 class ApiService {
   static const String _defaultBindAddress = '0.0.0.0';
@@ -19,11 +40,18 @@ class ApiService {
   static const int _maxRequestsPerMinute = 100;
   static const Duration _rateLimitWindow = Duration(minutes: 1);
   static const int _maxDailyStars = 150; // Maximum stars that can be added per day
+  static const int _maxIdempotencyEntries = 1000;
+  static const Duration _idempotencyKeyTtl = Duration(hours: 24);
+  static const int _maxIdempotencyKeyLength = 255;
+  static const int _compressionThreshold = 1024; // bytes; smaller bodies are sent as-is
+  static const int _maxQuestionIds = 500; // per `ids` lookup
+  static const int _streamChunkSize = 50; // questions encoded per stream chunk
 
   HttpServer? _server;
   bool _isRunning = false;
   final Map<String, List<DateTime>> _requestLog = {};
   final Map<String, int> _dailyStarsAdded = {}; // date -> total stars added
+  final Map<String, _IdempotencyEntry> _idempotencyCache = {}; // insertion ordered, oldest first
 
   /// Whether the API server is currently running
   bool get isRunning => _isRunning;
@@ -65,6 +93,9 @@ class ApiService {
     final cutoffDate = _getDateString(sevenDaysAgo);
 
     _dailyStarsAdded.removeWhere((date, _) => date.compareTo(cutoffDate) < 0);
+
+    _idempotencyCache.removeWhere(
+        (_, entry) => now.difference(entry.createdAt) > _idempotencyKeyTtl);
   }
 
   /// Get date string in YYYY-MM-DD format
@@ -93,6 +124,8 @@ class ApiService {
         ..get('/$_apiVersion/health', _handleHealth)
         ..get('/$_apiVersion/questions',
             _handleGetQuestions(questionCacheService))
+        ..get('/$_apiVersion/questions/stream',
+            _handleStreamQuestions(questionCacheService))
         ..get('/$_apiVersion/questions/<category>',
             _handleGetQuestionsByCategory(questionCacheService))
         ..get('/$_apiVersion/progress',
@@ -100,12 +133,15 @@ class ApiService {
         ..get('/$_apiVersion/stats', _handleGetStats(gameStatsProvider))
         ..get('/$_apiVersion/settings', _handleGetSettings(settingsProvider))
         ..get('/$_apiVersion/stars/balance', _handleGetStarBalance())
-        ..post('/$_apiVersion/stars/add', _handleAddStars())
-        ..post('/$_apiVersion/stars/spend', _handleSpendStars())
+        ..post('/$_apiVersion/stars/add',
+            _withIdempotency('stars/add', _handleAddStars()))
+        ..post('/$_apiVersion/stars/spend',
+            _withIdempotency('stars/spend', _handleSpendStars()))
         ..get('/$_apiVersion/stars/transactions', _handleGetStarTransactions())
         ..get('/$_apiVersion/stars/stats', _handleGetStarStats());
 
       final handler = const Pipeline()
+          .addMiddleware(_createCompressionMiddleware())
           .addMiddleware(_createSecurityHeadersMiddleware())
           .addMiddleware(_createRateLimitingMiddleware())
           .addMiddleware(_createPublicEndpointMiddleware(apiKey))
@@ -145,6 +181,7 @@ class ApiService {
       _server = null;
       _requestLog.clear();
       _dailyStarsAdded.clear();
+      _idempotencyCache.clear();
       AppLogger.info('API server stopped successfully');
     } catch (e) {
       AppLogger.error('Failed to stop API server: $e');
@@ -152,6 +189,7 @@ class ApiService {
       _server = null;
       _requestLog.clear();
       _dailyStarsAdded.clear();
+      _idempotencyCache.clear();
       // Don't throw exception on stop failure to avoid crashes during app shutdown
       AppLogger.warning('API server stopped with errors but continuing');
     }
@@ -264,6 +302,56 @@ class ApiService {
     };
   }
 
+  /// Middleware that gzips response bodies above [_compressionThreshold]
+  /// for clients that send `Accept-Encoding: gzip`
+  Middleware _createCompressionMiddleware() {
+    return (Handler innerHandler) {
+      return (Request request) async {
+        final response = await innerHandler(request);
+
+        // Streamed NDJSON is passed through so each line reaches the client
+        // as soon as it is written
+        if (!_acceptsGzip(request.headers['accept-encoding']) ||
+            response.statusCode == 304 ||
+            response.headers.containsKey('content-encoding') ||
+            response.mimeType == 'application/x-ndjson') {
+          return response;
+        }
+
+        final contentLength = response.contentLength;
+        if (contentLength != null && contentLength < _compressionThreshold) {
+          return response.change(headers: {'Vary': 'Accept-Encoding'});
+        }
+
+        final builder = await response.read().fold<BytesBuilder>(
+            BytesBuilder(copy: false), (b, chunk) => b..add(chunk));
+        final body = builder.takeBytes();
+        if (body.length < _compressionThreshold) {
+          return response.change(
+              body: body, headers: {'Vary': 'Accept-Encoding'});
+        }
+
+        return response.change(body: gzip.encode(body), headers: {
+          'Content-Encoding': 'gzip',
+          'Vary': 'Accept-Encoding',
+        });
+      };
+    };
+  }
+
+  /// Whether an Accept-Encoding header allows a gzip response
+  bool _acceptsGzip(String? acceptEncoding) {
+    if (acceptEncoding == null || acceptEncoding.isEmpty) return false;
+    for (final part in acceptEncoding.split(',')) {
+      final params = part.split(';').map((p) => p.trim()).toList();
+      if (params.first != 'gzip' && params.first != '*') continue;
+      final rejected = params.skip(1).any((p) =>
+          p.startsWith('q=') && (double.tryParse(p.substring(2)) ?? 1) == 0);
+      return !rejected;
+    }
+    return false;
+  }
+
   /// Middleware for security headers
   Middleware _createSecurityHeadersMiddleware() {
     return (Handler innerHandler) {
@@ -335,6 +423,99 @@ class ApiService {
     };
   }
 
+  /// Wraps a mutating handler so that a retried request carrying the same
+  /// Idempotency-Key header gets the original response replayed instead of
+  /// applying the change a second time
+  Handler _withIdempotency(String scope, Handler innerHandler) {
+    return (Request request) async {
+      final key = request.headers['idempotency-key'];
+      if (key == null || key.isEmpty) {
+        return await innerHandler(request);
+      }
+
+      if (key.length > _maxIdempotencyKeyLength) {
+        return Response.badRequest(
+            body: json.encode({
+              'error': 'Invalid idempotency key',
+              'message':
+                  'Idempotency-Key must be at most $_maxIdempotencyKeyLength characters',
+              'timestamp': DateTime.now().toIso8601String(),
+            }),
+            headers: {'Content-Type': 'application/json'});
+      }
+
+      final body = await request.readAsString();
+      final cacheKey = '$scope:$key';
+
+      // Loops when the attempt waited on was not cached (server error or rate
+      // limit): the first waiter to resume starts the retry and the rest wait
+      // for it, so a key is never processed twice at the same time
+      var existing = _idempotencyCache[cacheKey];
+      while (existing != null &&
+          DateTime.now().difference(existing.createdAt) <= _idempotencyKeyTtl) {
+        if (existing.fingerprint != body) {
+          return Response(422,
+              body: json.encode({
+                'error': 'Idempotency key reused',
+                'message':
+                    'This Idempotency-Key was already used with a different request body',
+                'timestamp': DateTime.now().toIso8601String(),
+              }),
+              headers: {'Content-Type': 'application/json'});
+        }
+
+        // Wait for the original request if it is still being processed
+        final stored = await existing.response;
+        if (stored != null) {
+          AppLogger.info('Replaying response for idempotency key on $scope');
+          return Response(stored.statusCode,
+              body: stored.body,
+              headers: {...stored.headers, 'Idempotent-Replayed': 'true'});
+        }
+        // A failed attempt removes its entry before waiters resume
+        existing = _idempotencyCache[cacheKey];
+      }
+
+      final completer = Completer<_StoredResponse?>();
+      _idempotencyCache.remove(cacheKey);
+      final entry = _IdempotencyEntry(body, completer.future);
+      _idempotencyCache[cacheKey] = entry;
+      while (_idempotencyCache.length > _maxIdempotencyEntries) {
+        _idempotencyCache.remove(_idempotencyCache.keys.first);
+      }
+
+      try {
+        final response = await innerHandler(request.change(body: body));
+        final responseBody = await response.readAsString();
+
+        // Only outcomes that a retry would reproduce are kept for replay
+        final cacheable =
+            response.statusCode < 500 && response.statusCode != 429;
+        completer.complete(cacheable
+            ? _StoredResponse(
+                response.statusCode, responseBody, {'Content-Type': 'application/json'})
+            : null);
+        if (!cacheable && identical(_idempotencyCache[cacheKey], entry)) {
+          _idempotencyCache.remove(cacheKey);
+        }
+
+        return Response(response.statusCode,
+            body: responseBody, headers: response.headers);
+      } catch (e) {
+        completer.complete(null);
+        if (identical(_idempotencyCache[cacheKey], entry)) {
+          _idempotencyCache.remove(cacheKey);
+        }
+        rethrow;
+      }
+    };
+  }
+
+  /// Exposes [_withIdempotency] to tests
+  @visibleForTesting
+  Handler withIdempotency(String scope, Handler innerHandler) =>
+      _withIdempotency(scope, innerHandler);
+
   /// Sanitizes headers to prevent sensitive data from being logged
   String _sanitizeHeader(String headerValue) {
     // Remove potential sensitive data from headers
@@ -385,7 +566,8 @@ class ApiService {
           'Access-Control-Allow-Origin': '*',
           'Access-Control-Allow-Methods': 'GET, POST, PUT, DELETE, OPTIONS',
           'Access-Control-Allow-Headers':
-              'Content-Type, Authorization, X-API-Key',
+              'Content-Type, Authorization, X-API-Key, Idempotency-Key, If-None-Match',
+          'Access-Control-Expose-Headers': 'ETag',
           'Access-Control-Max-Age': '86400', // 24 hours
         });
       };
@@ -424,6 +606,12 @@ class ApiService {
       final startTime = DateTime.now();
 
       try {
+        final idsParam = request.url.queryParameters['ids'];
+        if (idsParam != null) {
+          return await _getQuestionsByIds(
+              questionCacheService, idsParam, startTime);
+        }
+
         final category = request.url.queryParameters['category'];
         final limitParam = request.url.queryParameters['limit'] ?? '10';
         final difficulty = request.url.queryParameters['difficulty'];
@@ -456,41 +644,22 @@ class ApiService {
           }
         }
 
-        List<QuizQuestion> questions;
-
-        if (category != null && category.isNotEmpty) {
-          questions = await questionCacheService
-              .getQuestionsByCategory('nl', category, count: limit);
-        } else {
-          questions =
-              await questionCacheService.getQuestions('nl', count: limit);
-        }
-
-        // Filter by difficulty if specified
-        if (difficulty != null && difficulty.isNotEmpty) {
-          questions = questions
-              .where(
-                  (q) => q.difficulty.toLowerCase() == difficulty.toLowerCase())
-              .toList();
-        }
+        // Difficulty and category are applied before the limit, so up to
+        // `limit` matching questions are returned in one request
+        final questions = await questionCacheService.getFilteredQuestions('nl',
+            difficulty: difficulty, category: category, count: limit);
+        final totalMatching = await questionCacheService
+            .countFilteredQuestions('nl',
+                difficulty: difficulty, category: category);
 
         final questionsData = questions
-            .map((q) => {
-                  'question': q.question,
-                  'correctAnswer': q.correctAnswer,
-                  'incorrectAnswers': q.incorrectAnswers,
-                  'difficulty': q.difficulty,
-                  'type': q.type.name,
-                  'categories': q.categories,
-                  'biblicalReference': q.biblicalReference,
-                  'allOptions': q.allOptions,
-                  'correctAnswerIndex': q.correctAnswerIndex,
-                })
+            .map(_questionToJson)
             .toList();
 
         final response = {
           'questions': questionsData,
           'count': questions.length,
+          'total_matching': totalMatching,
           'category': category,
           'difficulty': difficulty,
           'timestamp': DateTime.now().toIso8601String(),
@@ -519,6 +688,149 @@ class ApiService {
     };
   }
 
+  /// Stream questions endpoint: one JSON question per line, without the
+  /// 50 question limit of the regular questions endpoint
+  Future<Response> Function(Request) _handleStreamQuestions(
+      QuestionCacheService questionCacheService) {
+    return (Request request) async {
+      final startTime = DateTime.now();
+      final category = request.url.queryParameters['category'];
+      final difficulty = request.url.queryParameters['difficulty'];
+      final limitParam = request.url.queryParameters['limit'];
+
+      int? limit;
+      if (limitParam != null) {
+        limit = int.tryParse(limitParam);
+        if (limit == null || limit < 1) {
+          return Response.badRequest(
+              body: json.encode({
+                'error': 'Invalid limit parameter',
+                'message': 'Limit must be a positive number',
+                'timestamp': DateTime.now().toIso8601String(),
+              }),
+              headers: {'Content-Type': 'application/json'});
+        }
+      }
+
+      if (difficulty != null && difficulty.isNotEmpty) {
+        final validDifficulties = ['1', '2', '3', '4', '5'];
+        if (!validDifficulties.contains(difficulty.toLowerCase())) {
+          return Response.badRequest(
+              body: json.encode({
+                'error': 'Invalid difficulty parameter',
+                'message': 'Difficulty must be a number between 1 and 5',
+                'timestamp': DateTime.now().toIso8601String(),
+                'valid_values': validDifficulties,
+              }),
+              headers: {'Content-Type': 'application/json'});
+        }
+      }
+
+      try {
+        final totalMatching = await questionCacheService.countFilteredQuestions(
+            'nl',
+            difficulty: difficulty,
+            category: category);
+        final total = limit == null || limit > totalMatching
+            ? totalMatching
+            : limit;
+        // Resolve the filter once; loading it a chunk at a time would read
+        // the question source again for every chunk
+        final questions = await questionCacheService.getFilteredQuestions('nl',
+            difficulty: difficulty, category: category, count: total);
+
+        return Response.ok(_questionLines(questions, startTime),
+            headers: {
+              'Content-Type': 'application/x-ndjson; charset=utf-8',
+              'X-Total-Matching': '$totalMatching',
+            },
+            context: {'shelf.io.buffer_output': false});
+      } catch (e) {
+        final duration = DateTime.now().difference(startTime);
+        AppLogger.error(
+            'Error in questions stream endpoint after ${duration.inMilliseconds}ms: $e');
+        return Response.internalServerError(
+            body: json.encode({
+              'error': 'Failed to load questions',
+              'message':
+                  'An internal error occurred while processing your request',
+              'timestamp': DateTime.now().toIso8601String(),
+              'processing_time_ms': duration.inMilliseconds,
+            }),
+            headers: {'Content-Type': 'application/json'});
+      }
+    };
+  }
+
+  /// Encodes the questions as one JSON line each, a chunk at a time
+  Stream<List<int>> _questionLines(
+      List<QuizQuestion> questions, DateTime startTime) async* {
+    for (var start = 0; start < questions.length; start += _streamChunkSize) {
+      final chunk = StringBuffer();
+      for (final question in questions.skip(start).take(_streamChunkSize)) {
+        chunk.writeln(json.encode(_questionToJson(question)));
+      }
+      yield utf8.encode(chunk.toString());
+    }
+
+    AppLogger.info(
+        'Questions stream endpoint: Streamed ${questions.length} questions in ${DateTime.now().difference(startTime).inMilliseconds}ms');
+  }
+
+  /// Looks up a comma separated list of question ids in one request
+  Future<Response> _getQuestionsByIds(QuestionCacheService questionCacheService,
+      String idsParam, DateTime startTime) async {
+    final ids = idsParam
+        .split(',')
+        .map((id) => id.trim())
+        .where((id) => id.isNotEmpty)
+        .toList();
+
+    if (ids.isEmpty || ids.length > _maxQuestionIds) {
+      return Response.badRequest(
+          body: json.encode({
+            'error': 'Invalid ids parameter',
+            'message':
+                'ids must be a comma separated list of 1 to $_maxQuestionIds question ids',
+            'timestamp': DateTime.now().toIso8601String(),
+            'valid_range': '1-$_maxQuestionIds',
+          }),
+          headers: {'Content-Type': 'application/json'});
+    }
+
+    final questions = await questionCacheService.getQuestionsByIds('nl', ids);
+    final missing = ids.where((id) => !questions.containsKey(id)).toSet();
+
+    final response = {
+      'questions': questions.values.map(_questionToJson).toList(),
+      'count': questions.length,
+      'missing': missing.toList(),
+      'timestamp': DateTime.now().toIso8601String(),
+      'processing_time_ms': DateTime.now().difference(startTime).inMilliseconds,
+    };
+
+    AppLogger.info(
+        'Questions endpoint: Resolved ${questions.length} of ${ids.length} ids in ${DateTime.now().difference(startTime).inMilliseconds}ms');
+    return Response.ok(json.encode(response),
+        headers: {'Content-Type': 'application/json'});
+  }
+
+  /// JSON representation of a question as returned by the questions endpoints
+  Map<String, dynamic> _questionToJson(QuizQuestion q) {
+    return {
+      'id': q.id,
+      'question': q.question,
+      'correctAnswer': q.correctAnswer,
+      'incorrectAnswers': q.incorrectAnswers,
+      'difficulty': q.difficulty,
+      'type': q.type.name,
+      'categories': q.categories,
+      'biblicalReference': q.biblicalReference,
+      'allOptions': q.allOptions,
+      'correctAnswerIndex': q.correctAnswerIndex,
+    };
+  }
+
   /// Get questions by category endpoint
   Future<Response> Function(Request) _handleGetQuestionsByCategory(
       QuestionCacheService questionCacheService) {
@@ -568,34 +880,21 @@ class ApiService {
           }
         }
 
-        final questions = await questionCacheService
-            .getQuestionsByCategory('nl', category, count: limit);
-
-        // Filter by difficulty if specified
-        final filteredQuestions = difficulty != null && difficulty.isNotEmpty
-            ? questions
-                .where((q) =>
-                    q.difficulty.toLowerCase() == difficulty.toLowerCase())
-                .toList()
-            : questions;
+        final filteredQuestions = await questionCacheService
+            .getFilteredQuestions('nl',
+                difficulty: difficulty, category: category, count: limit);
+        final totalMatching = await questionCacheService
+            .countFilteredQuestions('nl',
+                difficulty: difficulty, category: category);
 
         final questionsData = filteredQuestions
-            .map((q) => {
-                  'question': q.question,
-                  'correctAnswer': q.correctAnswer,
-                  'incorrectAnswers': q.incorrectAnswers,
-                  'difficulty': q.difficulty,
-                  'type': q.type.name,
-                  'categories': q.categories,
-                  'biblicalReference': q.biblicalReference,
-                  'allOptions': q.allOptions,
-                  'correctAnswerIndex': q.correctAnswerIndex,
-                })
+            .map(_questionToJson)
             .toList();
 
         final response = {
           'questions': questionsData,
           'count': filteredQuestions.length,
+          'total_matching': totalMatching,
           'category': category,
           'difficulty': difficulty,
           'timestamp': DateTime.now().toIso8601String(),
@@ -632,9 +931,18 @@ class ApiService {
 
       try {
         final exportData = progressProvider.getExportData();
-        final progressData = {
+        final state = {
           'unlockedCount': progressProvider.unlockedCount,
           'bestStarsByLesson': exportData['bestStarsByLesson'],
+        };
+
+        final etag = _computeETag(state);
+        if (_matchesIfNoneMatch(request, etag)) {
+          return _notModified(etag);
+        }
+
+        final progressData = {
+          ...state,
           'timestamp': DateTime.now().toIso8601String(),
           'processing_time_ms':
               DateTime.now().difference(startTime).inMilliseconds,
@@ -643,7 +951,7 @@ class ApiService {
         AppLogger.info(
             'Progress endpoint: Retrieved progress data in ${DateTime.now().difference(startTime).inMilliseconds}ms');
         return Response.ok(json.encode(progressData),
-            headers: {'Content-Type': 'application/json'});
+            headers: _conditionalHeaders(etag));
       } catch (e) {
         final duration = DateTime.now().difference(startTime);
         AppLogger.error(
@@ -661,6 +969,37 @@ class ApiService {
     };
   }
 
+  /// Strong ETag derived from the provider state a response is built from.
+  /// Volatile fields such as timestamps must not be part of [state].
+  String _computeETag(Map<String, dynamic> state) {
+    return '"${sha1.convert(utf8.encode(json.encode(state)))}"';
+  }
+
+  /// Whether the request's If-None-Match header matches [etag]
+  bool _matchesIfNoneMatch(Request request, String etag) {
+    final header = request.headers['if-none-match'];
+    if (header == null || header.isEmpty) return false;
+    return header
+        .split(',')
+        .map((tag) => tag.trim())
+        .any((tag) => tag == '*' || tag == etag || tag == 'W/$etag');
+  }
+
+  /// Headers for a JSON response that clients may revalidate with its ETag
+  Map<String, String> _conditionalHeaders(String etag) {
+    return {
+      'Content-Type': 'application/json',
+      'ETag': etag,
+      'Cache-Control': 'no-cache',
+    };
+  }
+
+  /// 304 response telling the client its cached body is still current
+  Response _notModified(String etag) {
+    return Response.notModified(
+        headers: {'ETag': etag, 'Cache-Control': 'no-cache'});
+  }
+
   /// Get game stats endpoint
   Future<Response> Function(Request) _handleGetStats(
       GameStatsProvider statsProvider) {
@@ -668,11 +1007,20 @@ class ApiService {
       final startTime = DateTime.now();
 
       try {
-        final statsData = {
+        final state = {
           'score': statsProvider.score,
           'currentStreak': statsProvider.currentStreak,
           'longestStreak': statsProvider.longestStreak,
           'incorrectAnswers': statsProvider.incorrectAnswers,
+        };
+
+        final etag = _computeETag(state);
+        if (_matchesIfNoneMatch(request, etag)) {
+          return _notModified(etag);
+        }
+
+        final statsData = {
+          ...state,
           'timestamp': DateTime.now().toIso8601String(),
           'processing_time_ms':
               DateTime.now().difference(startTime).inMilliseconds,
@@ -681,7 +1029,7 @@ class ApiService {
         AppLogger.info(
             'Stats endpoint: Retrieved stats data in ${DateTime.now().difference(startTime).inMilliseconds}ms');
         return Response.ok(json.encode(statsData),
-            headers: {'Content-Type': 'application/json'});
+            headers: _conditionalHeaders(etag));
       } catch (e) {
         final duration = DateTime.now().difference(startTime);
         AppLogger.error(
@@ -706,12 +1054,21 @@ class ApiService {
       final startTime = DateTime.now();
 
       try {
-        final settingsData = {
+        final state = {
           'themeMode': settingsProvider.themeMode.name,
           'gameSpeed': settingsProvider.gameSpeed,
           'mute': settingsProvider.mute,
           'analyticsEnabled': settingsProvider.analyticsEnabled,
           'notificationEnabled': settingsProvider.notificationEnabled,
+        };
+
+        final etag = _computeETag(state);
+        if (_matchesIfNoneMatch(request, etag)) {
+          return _notModified(etag);
+        }
+
+        final settingsData = {
+          ...state,
           'timestamp': DateTime.now().toIso8601String(),
           'processing_time_ms':
               DateTime.now().difference(startTime).inMilliseconds,
@@ -720,7 +1077,7 @@ class ApiService {
         AppLogger.info(
             'Settings endpoint: Retrieved settings data in ${DateTime.now().difference(startTime).inMilliseconds}ms');
         return Response.ok(json.encode(settingsData),
-            headers: {'Content-Type': 'application/json'});
+            headers: _conditionalHeaders(etag));
       } catch (e) {
         final duration = DateTime.now().difference(startTime);
         AppLogger.error(
@@ -966,6 +1323,7 @@ class ApiService {
         final limitParam = request.url.queryParameters['limit'] ?? '50';
         final type = request.url.queryParameters['type'];
         final lessonId = request.url.queryParameters['lessonId'];
+        final cursor = request.url.queryParameters['cursor'];
 
         // Validate and parse limit parameter
         final limit = int.tryParse(limitParam);
@@ -980,21 +1338,52 @@ class ApiService {
               headers: {'Content-Type': 'application/json'});
         }
 
+        // Validate and decode cursor parameter if provided
+        Map<String, dynamic>? position;
+        if (cursor != null && cursor.isNotEmpty) {
+          position = _decodeTransactionCursor(cursor);
+          if (position == null) {
+            return Response.badRequest(
+                body: json.encode({
+                  'error': 'Invalid cursor parameter',
+                  'message':
+                      'Cursor must be a next_cursor value returned by a previous request',
+                  'timestamp': DateTime.now().toIso8601String(),
+                }),
+                headers: {'Content-Type': 'application/json'});
+          }
+        }
+
         final starService = StarTransactionService.instance;
-        List<StarTransaction> transactions;
+        List<StarTransaction> matching;
 
         if (type != null && type.isNotEmpty) {
-          transactions =
-              starService.getTransactionsByType(type).take(limit).toList();
+          matching = starService.getTransactionsByType(type);
         } else if (lessonId != null && lessonId.isNotEmpty) {
-          transactions = starService
-              .getTransactionsForLesson(lessonId)
-              .take(limit)
-              .toList();
+          matching = starService.getTransactionsForLesson(lessonId);
         } else {
-          transactions = starService.getRecentTransactions(count: limit);
+          matching = starService.transactions;
         }
 
+        // Transactions are ordered newest first; resume after the cursor position
+        int start = 0;
+        if (position != null) {
+          final afterId = position['id'] as String;
+          final afterTimestamp = DateTime.parse(position['ts'] as String);
+          final index = matching.indexWhere((t) => t.id == afterId);
+          start = index >= 0
+              ? index + 1
+              // The cursor transaction was trimmed from history; continue with older ones
+              : matching.indexWhere((t) => t.timestamp.isBefore(afterTimestamp));
+          if (start < 0) start = matching.length;
+        }
+
+        final transactions = matching.skip(start).take(limit).toList();
+        final hasMore = start + transactions.length < matching.length;
+        final nextCursor = hasMore && transactions.isNotEmpty
+            ? _encodeTransactionCursor(transactions.last)
+            : null;
+
         final transactionsData = transactions.map((t) => t.toJson()).toList();
 
         final response = {
@@ -1002,6 +1391,8 @@ class ApiService {
           'count': transactions.length,
           'type_filter': type,
           'lesson_filter': lessonId,
+          'has_more': hasMore,
+          'next_cursor': nextCursor,
           'timestamp': DateTime.now().toIso8601String(),
           'processing_time_ms':
               DateTime.now().difference(startTime).inMilliseconds,
@@ -1028,6 +1419,31 @@ class ApiService {
     };
   }
 
+  /// Encodes an opaque pagination cursor pointing just after [transaction]
+  String _encodeTransactionCursor(StarTransaction transaction) {
+    return base64Url.encode(utf8.encode(json.encode({
+      'id': transaction.id,
+      'ts': transaction.timestamp.toIso8601String(),
+    })));
+  }
+
+  /// Decodes a pagination cursor, returning null if it is malformed
+  Map<String, dynamic>? _decodeTransactionCursor(String cursor) {
+    try {
+      final decoded =
+          json.decode(utf8.decode(base64Url.decode(base64Url.normalize(cursor))));
+      if (decoded is Map<String, dynamic> &&
+          decoded['id'] is String &&
+          decoded['ts'] is String &&
+          DateTime.tryParse(decoded['ts'] as String) != null) {
+        return decoded;
+      }
+    } catch (e) {
+      // Fall through to null for any decoding error
+    }
+    return null;
+  }
+
   /// Get star statistics endpoint
   Future<Response> Function(Request) _handleGetStarStats() {
     return (Request request) async {
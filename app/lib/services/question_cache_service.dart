@@ -56,6 +56,15 @@ class QuestionCacheService {
   // Track question metadata (simplified - no extra tracking)
   final Map<String, List<Map<String, dynamic>>> _questionMetadata = {};
 
+  // Metadata indices per language, keyed by (difficulty, category); built lazily
+  final Map<String, Map<String, List<int>>> _filterIndex = {};
+
+  // Metadata index per language, keyed by question id; built lazily
+  final Map<String, Map<String, int>> _idIndex = {};
+
+  /// Wildcard used in filter index keys for "any difficulty/category"
+  static const String _anyFilter = '*';
+
   /// Initialize the cache service
   Future<void> initialize() async {
     if (_isInitialized) return;
@@ -120,28 +129,44 @@ class QuestionCacheService {
       endIndex = _questionMetadata[language]?.length ?? 0;
     }
 
-    // Check which questions need to be loaded
-    final questionsToLoad = <int>[];
-    final loadedQuestions = <QuizQuestion>[];
+    final metadataLength = _questionMetadata[language]?.length ?? 0;
+    final indices = <int>[
+      for (int i = startIndex; i < endIndex && i < metadataLength; i++) i,
+    ];
 
-    for (int i = startIndex; i < endIndex; i++) {
-      if (i >= (_questionMetadata[language]?.length ?? 0)) break;
+    return _getQuestionsForIndices(language, indices);
+  }
 
-      final question = _getQuestionFromMemory(language, i);
+  /// Questions for metadata indices, in the order given. Questions in the
+  /// memory cache are served from there; only the misses are loaded.
+  Future<List<QuizQuestion>> _getQuestionsForIndices(
+    String language,
+    List<int> indices,
+  ) async {
+    final found = <int, QuizQuestion>{};
+    final questionsToLoad = <int>[];
+    for (final index in indices) {
+      final question = _getQuestionFromMemory(language, index);
       if (question != null) {
-        loadedQuestions.add(question);
+        found[index] = question;
       } else {
-        questionsToLoad.add(i);
+        questionsToLoad.add(index);
       }
     }
 
-    // Load any missing questions
     if (questionsToLoad.isNotEmpty) {
       final loaded = await _loadQuestionsByIndices(language, questionsToLoad);
-      loadedQuestions.addAll(loaded);
+      final idIndex = _getIdIndex(language);
+      for (final question in loaded) {
+        final index = idIndex[question.id];
+        if (index != null) found[index] = question;
+      }
     }
 
-    return loadedQuestions;
+    return [
+      for (final index in indices)
+        if (found.containsKey(index)) found[index]!,
+    ];
   }
 
   /// Get a batch of questions for a specific language
@@ -175,6 +200,8 @@ class QuestionCacheService {
       final cachedMetadata = await _getCachedMetadata(language);
       if (cachedMetadata != null && cachedMetadata.isNotEmpty) {
         _questionMetadata[language] = cachedMetadata;
+        _filterIndex.remove(language);
+        _idIndex.remove(language);
         completer.complete();
         return;
       }
@@ -212,6 +239,8 @@ class QuestionCacheService {
       });
 
       _questionMetadata[language] = metadata;
+      _filterIndex.remove(language);
+      _idIndex.remove(language);
 
       // Cache the metadata for faster startup next time
       await _cacheMetadata(language, metadata);
@@ -266,11 +295,12 @@ class QuestionCacheService {
             'Loaded ${loadedQuestions.length} questions from JSON (fallback) for indices: $indices');
       }
 
-      // Add loaded questions to memory cache with LRU tracking
-      for (int i = 0; i < loadedQuestions.length; i++) {
-        final question = loadedQuestions[i];
-        final index = indices[i];
-        _addToMemoryCache(language, index, question);
+      // Add loaded questions to memory cache with LRU tracking. Questions
+      // that failed to parse are skipped, so match them to indices by id
+      final idIndex = _getIdIndex(language);
+      for (final question in loadedQuestions) {
+        final index = idIndex[question.id];
+        if (index != null) _addToMemoryCache(language, index, question);
       }
 
       return loadedQuestions;
@@ -456,6 +486,8 @@ class QuestionCacheService {
       _memoryCache.clear();
       _lruList.clear();
       _questionMetadata.clear();
+      _filterIndex.clear();
+      _idIndex.clear();
 
       // Clear persistent caches
       final keys = _prefs.getKeys().where((key) =>
@@ -478,9 +510,8 @@ class QuestionCacheService {
       String language, List<int> indices) async {
     try {
       final client = SupabaseConfig.getClient();
-      final ids = indices
-          .map((index) => '000${(index + 1).toString().padLeft(3, '0')}')
-          .toList();
+      // Indices refer to the (difficulty sorted) metadata, so resolve them to ids
+      final ids = _idsForIndices(language, indices);
 
       final isEnglish = language == 'en';
       final tableName = isEnglish ? 'questions_en' : 'questions';
@@ -527,6 +558,10 @@ class QuestionCacheService {
         }
       }
 
+      // Return rows in the order they were requested
+      final order = {for (int i = 0; i < ids.length; i++) ids[i]: i};
+      questions.sort((a, b) =>
+          (order[a.id] ?? ids.length).compareTo(order[b.id] ?? ids.length));
       return questions;
     } catch (e) {
       AppLogger.error('Failed to load questions from database', e);
@@ -546,17 +581,25 @@ class QuestionCacheService {
       throw Exception('Question file is empty');
     }
 
+    // Indices refer to the (difficulty sorted) metadata, so look questions up by id
+    final byId = <String, Map<String, dynamic>>{};
+    for (final item in data) {
+      if (item is Map<String, dynamic>) {
+        byId.putIfAbsent(item['id']?.toString() ?? '', () => item);
+      }
+    }
+
     final loadedQuestions = <QuizQuestion>[];
 
-    for (final index in indices) {
-      if (index < 0 || index >= data.length) continue;
+    for (final id in _idsForIndices(language, indices)) {
+      final questionData = byId[id];
+      if (questionData == null) continue;
 
       try {
-        final questionData = data[index] as Map<String, dynamic>;
         final question = QuizQuestion.fromJson(questionData);
         loadedQuestions.add(question);
       } catch (e) {
-        AppLogger.error('Error parsing question at index $index', e);
+        AppLogger.error('Error parsing question with id $id', e);
       }
     }
 
@@ -640,6 +683,8 @@ class QuestionCacheService {
     _memoryCache.clear();
     _lruList.clear();
     _questionMetadata.clear();
+    _filterIndex.clear();
+    _idIndex.clear();
     _loadingCompleters.clear();
   }
 
@@ -765,27 +810,31 @@ class QuestionCacheService {
     String category, {
     int startIndex = 0,
     int? count,
+  }) {
+    return getFilteredQuestions(
+      language,
+      category: category,
+      startIndex: startIndex,
+      count: count,
+    );
+  }
+
+  /// Loads questions matching an optional difficulty and/or category.
+  ///
+  /// Filtering happens on the metadata index before any question is loaded,
+  /// so [count] matching questions are returned whenever that many exist.
+  /// Matches in the memory cache are not loaded again.
+  Future<List<QuizQuestion>> getFilteredQuestions(
+    String language, {
+    String? difficulty,
+    String? category,
+    int startIndex = 0,
+    int? count,
   }) async {
     await initialize();
     await _ensureMetadataLoaded(language);
 
-    final List<int> indices = [];
-    final metadata =
-        _questionMetadata[language] ?? const <Map<String, dynamic>>[];
-    for (int i = 0; i < metadata.length; i++) {
-      try {
-        final cats = (metadata[i]['categories'] as List?)
-                ?.map((e) => e.toString())
-                .toList() ??
-            const <String>[];
-        if (cats.contains(category)) {
-          indices.add(i);
-        }
-      } catch (e) {
-        AppLogger.error(
-            'Error processing metadata at $i for category filter', e);
-      }
-    }
+    final indices = _filteredIndices(language, difficulty, category);
 
     if (indices.isEmpty) return const [];
 
@@ -802,8 +851,129 @@ class QuestionCacheService {
 
     if (sliced.isEmpty) return const [];
 
-    final loaded = await _loadQuestionsByIndices(language, sliced);
-    // Keep original order
-    return loaded;
+    return _getQuestionsForIndices(language, sliced);
+  }
+
+  /// Number of questions matching an optional difficulty and/or category.
+  Future<int> countFilteredQuestions(
+    String language, {
+    String? difficulty,
+    String? category,
+  }) async {
+    await initialize();
+    await _ensureMetadataLoaded(language);
+
+    return _filteredIndices(language, difficulty, category).length;
+  }
+
+  String _filterKey(String difficulty, String category) =>
+      '$difficulty|$category';
+
+  /// Metadata indices matching the filters; empty filters match everything.
+  List<int> _filteredIndices(
+      String language, String? difficulty, String? category) {
+    final key = _filterKey(
+      difficulty == null || difficulty.isEmpty
+          ? _anyFilter
+          : difficulty.toLowerCase(),
+      category == null || category.isEmpty ? _anyFilter : category,
+    );
+    return _getFilterIndex(language)[key] ?? const <int>[];
+  }
+
+  /// Returns the (difficulty, category) -> metadata indices map for a language,
+  /// building it in a single pass over the metadata on first use.
+  Map<String, List<int>> _getFilterIndex(String language) {
+    final existing = _filterIndex[language];
+    if (existing != null) return existing;
+
+    final Map<String, List<int>> index = {};
+    final metadata =
+        _questionMetadata[language] ?? const <Map<String, dynamic>>[];
+    for (int i = 0; i < metadata.length; i++) {
+      try {
+        final difficulty =
+            metadata[i]['difficulty']?.toString().toLowerCase() ?? '';
+        final cats = (metadata[i]['categories'] as List?)
+                ?.map((e) => e.toString())
+                .toSet() ??
+            const <String>{};
+
+        // Indices are appended in metadata order, so every list stays
+        // sorted by difficulty just like the metadata itself
+        index.putIfAbsent(_filterKey(_anyFilter, _anyFilter), () => []).add(i);
+        index.putIfAbsent(_filterKey(difficulty, _anyFilter), () => []).add(i);
+        for (final c in cats) {
+          if (c.isEmpty) continue;
+          index.putIfAbsent(_filterKey(_anyFilter, c), () => []).add(i);
+          index.putIfAbsent(_filterKey(difficulty, c), () => []).add(i);
+        }
+      } catch (e) {
+        AppLogger.error('Error indexing metadata at $i for filters', e);
+      }
+    }
+
+    _filterIndex[language] = index;
+    return index;
+  }
+
+  /// Loads the questions with the given ids, keyed by id in the order of [ids].
+  ///
+  /// Unknown and duplicate ids are skipped, so callers can compare the
+  /// result's keys with [ids] to find the ones that do not exist.
+  Future<Map<String, QuizQuestion>> getQuestionsByIds(
+    String language,
+    List<String> ids,
+  ) async {
+    await initialize();
+    await _ensureMetadataLoaded(language);
+
+    final idIndex = _getIdIndex(language);
+    final requested = <String>[];
+    final indices = <int>[];
+    for (final id in ids.toSet()) {
+      final index = idIndex[id];
+      if (index == null) continue;
+      requested.add(id);
+      indices.add(index);
+    }
+
+    if (indices.isEmpty) return const {};
+
+    final loaded = await _getQuestionsForIndices(language, indices);
+    final byId = {for (final question in loaded) question.id: question};
+    return {
+      for (final id in requested)
+        if (byId.containsKey(id)) id: byId[id]!,
+    };
+  }
+
+  /// Question ids for metadata indices, skipping indices out of range
+  List<String> _idsForIndices(String language, List<int> indices) {
+    final metadata =
+        _questionMetadata[language] ?? const <Map<String, dynamic>>[];
+    return [
+      for (final index in indices)
+        if (index >= 0 && index < metadata.length)
+          metadata[index]['id']?.toString() ?? '',
+    ];
+  }
+
+  /// Returns the question id -> metadata index map for a language,
+  /// building it in a single pass over the metadata on first use.
+  Map<String, int> _getIdIndex(String language) {
+    final existing = _idIndex[language];
+    if (existing != null) return existing;
+
+    final Map<String, int> index = {};
+    final metadata =
+        _questionMetadata[language] ?? const <Map<String, dynamic>>[];
+    for (int i = 0; i < metadata.length; i++) {
+      final id = metadata[i]['id']?.toString() ?? '';
+      if (id.isNotEmpty) index.putIfAbsent(id, () => i);
+    }
+
+    _idIndex[language] = index;
+    return index;
   }
 }
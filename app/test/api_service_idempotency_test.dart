@@ -0,0 +1,99 @@
+import 'dart:async';
+import 'dart:convert';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:shelf/shelf.dart';
+import 'package:bijbelquiz/services/api_service.dart';
+
+Request _addStars(String key, {int amount = 5}) => Request(
+      'POST',
+      Uri.parse('http://localhost/v1/stars/add'),
+      headers: {'Idempotency-Key': key, 'Content-Type': 'application/json'},
+      body: json.encode({'amount': amount, 'reason': 'Quiz'}),
+    );
+
+void main() {
+  late ApiService service;
+  late int balance;
+  late int calls;
+
+  setUp(() {
+    service = ApiService();
+    balance = 0;
+    calls = 0;
+  });
+
+  /// An add-stars handler that answers each call with the next status in
+  /// [statuses] (200 once they run out), after [gate] completes if given
+  Handler starHandler({List<int> statuses = const [], Completer<void>? gate}) {
+    final pending = [...statuses];
+    return (Request request) async {
+      calls++;
+      final payload = json.decode(await request.readAsString());
+      if (gate != null) await gate.future;
+      final status = pending.isEmpty ? 200 : pending.removeAt(0);
+      if (status == 200) balance += payload['amount'] as int;
+      return Response(status,
+          body: json.encode({'balance': balance, 'call': calls}),
+          headers: {'Content-Type': 'application/json'});
+    };
+  }
+
+  group('ApiService idempotency', () {
+    test('should replay the first response for a repeated key', () async {
+      final handler = service.withIdempotency('stars/add', starHandler());
+
+      final first = await handler(_addStars('key-1'));
+      final second = await handler(_addStars('key-1'));
+
+      expect(first.statusCode, 200);
+      expect(second.statusCode, 200);
+      expect(second.headers['Idempotent-Replayed'], 'true');
+      expect(await second.readAsString(),
+          json.encode({'balance': 5, 'call': 1}));
+      expect(balance, 5);
+      expect(calls, 1);
+    });
+
+    test('should reject a reused key with a different body', () async {
+      final handler = service.withIdempotency('stars/add', starHandler());
+
+      await handler(_addStars('key-1'));
+      final reused = await handler(_addStars('key-1', amount: 10));
+
+      expect(reused.statusCode, 422);
+      expect(balance, 5);
+    });
+
+    test('should process a key again after a response that is not cached',
+        () async {
+      final handler =
+          service.withIdempotency('stars/add', starHandler(statuses: [503]));
+
+      final failed = await handler(_addStars('key-1'));
+      final retried = await handler(_addStars('key-1'));
+
+      expect(failed.statusCode, 503);
+      expect(retried.statusCode, 200);
+      expect(retried.headers['Idempotent-Replayed'], isNull);
+      expect(balance, 5);
+    });
+
+    test('should retry a failed in-flight key only once for all waiters',
+        () async {
+      final gate = Completer<void>();
+      final handler = service.withIdempotency(
+          'stars/add', starHandler(statuses: [429], gate: gate));
+
+      final responses = List.generate(3, (_) => handler(_addStars('key-1')));
+      gate.complete();
+      final results = await Future.wait(responses);
+
+      expect(results.map((r) => r.statusCode), [429, 200, 200]);
+      expect(results[1].headers['Idempotent-Replayed'], isNull);
+      expect(results[2].headers['Idempotent-Replayed'], 'true');
+      expect(balance, 5);
+      expect(calls, 2);
+    });
+  });
+}
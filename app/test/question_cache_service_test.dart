@@ -0,0 +1,114 @@
+import 'dart:convert';
+
+import 'package:flutter_test/flutter_test.dart';
+import 'package:package_info_plus/package_info_plus.dart';
+import 'package:shared_preferences/shared_preferences.dart';
+import 'package:bijbelquiz/services/connection_service.dart';
+import 'package:bijbelquiz/services/question_cache_service.dart';
+
+const String _appVersion = '1.0.0';
+
+final List<Map<String, dynamic>> _metadata = [
+  {'id': 'q1', 'difficulty': '1', 'categories': ['Genesis', 'Wet']},
+  {'id': 'q2', 'difficulty': '2', 'categories': ['Genesis']},
+  {'id': 'q3', 'difficulty': '2', 'categories': <String>[]},
+  {'id': 'q4', 'difficulty': '3', 'categories': ['Evangeliën']},
+];
+
+Map<String, dynamic> _questionJson(Map<String, dynamic> metadata) => {
+      'id': metadata['id'],
+      'vraag': 'Vraag ${metadata['id']}',
+      'juisteAntwoord': 'A',
+      'fouteAntwoorden': ['B', 'C', 'D'],
+      'moeilijkheidsgraad': metadata['difficulty'],
+      'type': 'mc',
+      'categories': metadata['categories'],
+    };
+
+void main() {
+  late QuestionCacheService service;
+
+  setUp(() {
+    PackageInfo.setMockInitialValues(
+      appName: 'BijbelQuiz',
+      packageName: 'app.bijbelquiz',
+      version: _appVersion,
+      buildNumber: '1',
+      buildSignature: '',
+    );
+    // Metadata and questions come from the offline cache, so no database
+    // or asset is touched
+    SharedPreferences.setMockInitialValues({
+      'app_version': _appVersion,
+      'cached_metadata_nl': json.encode(_metadata),
+      'cached_questions_nl': json.encode(_metadata.map(_questionJson).toList()),
+      'cache_timestamp_nl': DateTime.now().millisecondsSinceEpoch,
+    });
+    service = QuestionCacheService(ConnectionService());
+  });
+
+  tearDown(() {
+    service.dispose();
+  });
+
+  group('QuestionCacheService filter index', () {
+    test('should count every difficulty|category combination', () async {
+      expect(await service.countFilteredQuestions('nl', difficulty: '2'), 2);
+      expect(await service.countFilteredQuestions('nl', category: 'Genesis'), 2);
+      expect(
+          await service.countFilteredQuestions('nl',
+              difficulty: '2', category: 'Genesis'),
+          1);
+      expect(
+          await service.countFilteredQuestions('nl',
+              difficulty: '3', category: 'Genesis'),
+          0);
+      expect(await service.countFilteredQuestions('nl', difficulty: '5'), 0);
+      expect(
+          await service.countFilteredQuestions('nl', category: 'Onbekend'), 0);
+    });
+
+    test('should treat missing, empty and * filters as the wildcard', () async {
+      expect(await service.countFilteredQuestions('nl'), 4);
+      expect(
+          await service.countFilteredQuestions('nl',
+              difficulty: '', category: ''),
+          4);
+      expect(
+          await service.countFilteredQuestions('nl',
+              difficulty: '*', category: '*'),
+          4);
+      expect(
+          await service.countFilteredQuestions('nl',
+              difficulty: '*', category: 'Genesis'),
+          2);
+      expect(
+          await service.countFilteredQuestions('nl',
+              difficulty: '2', category: '*'),
+          2);
+    });
+
+    test('should return count matches in metadata order', () async {
+      final byDifficulty =
+          await service.getFilteredQuestions('nl', difficulty: '2');
+      expect(byDifficulty.map((q) => q.id), ['q2', 'q3']);
+
+      final page = await service.getFilteredQuestions('nl',
+          category: 'Genesis', startIndex: 1, count: 5);
+      expect(page.map((q) => q.id), ['q2']);
+    });
+
+    test('should serve repeated filters from the memory cache', () async {
+      final first = await service.getFilteredQuestions('nl', difficulty: '2');
+
+      // Without the offline cache a miss would have to load the questions
+      // from the database or the bundled asset, neither of which has them
+      final prefs = await SharedPreferences.getInstance();
+      await prefs.remove('cached_questions_nl');
+
+      final second = await service.getFilteredQuestions('nl', difficulty: '2');
+      expect(second.map((q) => q.id), ['q2', 'q3']);
+      expect(identical(second.first, first.first), isTrue);
+    });
+  });
+}
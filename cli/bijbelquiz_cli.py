@@ -6,89 +6,848 @@ A command-line interface for interacting with the BijbelQuiz local API.
 """
 
 import argparse
+import asyncio
+import copy
+import csv
+import gzip
+import http.client
 import json
+import math
+import os
+import queue
+import shlex
 import sys
-import urllib.request
+import threading
 import urllib.parse
-import urllib.error
+import uuid
+import zlib
 import time
 import random
-from typing import Optional
+from typing import Iterator, Optional
 from dataclasses import dataclass
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locking for the star journal
+    fcntl = None
+
+
+class BijbelQuizError(Exception):
+    """Base class for errors raised by the API clients."""
+
+
+class APIError(BijbelQuizError):
+    """An error response returned by the API."""
+
+    def __init__(self, status: int, reason: str, data: Optional[dict] = None):
+        self.status = status
+        self.reason = reason
+        self.data = data or {}
+        super().__init__(f"HTTP {status}: {self.data.get('message') or self.data.get('error') or reason}")
+
+
+class TransportError(BijbelQuizError):
+    """The API could not be reached or the connection failed mid-request."""
+
+
+class CircuitOpenError(TransportError):
+    """Requests are failing fast because the API has been unreachable."""
+
+
+class InvalidResponseError(BijbelQuizError):
+    """The API answered with a body that is not valid JSON."""
+
+
+def decode_response(status: int, reason: str, payload: bytes) -> dict:
+    """Decode a JSON API response, raising APIError for error responses."""
+    if status >= 400:
+        try:
+            error_data = json.loads(payload.decode('utf-8'))
+        except ValueError:
+            error_data = None
+        raise APIError(status, reason, error_data if isinstance(error_data, dict) else None)
+
+    try:
+        return json.loads(payload.decode('utf-8'))
+    except ValueError as e:
+        raise InvalidResponseError(f"invalid JSON response ({e})") from e
+
+
+def report_error(error: BijbelQuizError):
+    """Print a client error to stderr the way the CLI reports it."""
+    if isinstance(error, APIError):
+        print(f"Error: HTTP Error {error.status}: {error.reason}", file=sys.stderr)
+        if error.data:
+            print(f"API Error: {error.data.get('error', 'Unknown error')}", file=sys.stderr)
+            print(f"Message: {error.data.get('message', '')}", file=sys.stderr)
+    elif isinstance(error, TransportError):
+        print(f"Connection Error: {error}", file=sys.stderr)
+    else:
+        print(f"Unexpected error: {error}", file=sys.stderr)
+
+
+def parse_retry_after(status: int, headers: dict, payload: bytes) -> Optional[float]:
+    """Return the number of seconds to wait for a retryable 429, or None.
+
+    The API reports the wait in the `retry_after` field of the JSON body;
+    a standard Retry-After header is honoured as a fallback. A 429 without
+    either (e.g. the daily star limit) is not retryable.
+    """
+    if status != 429:
+        return None
+    try:
+        retry_after = json.loads(payload.decode('utf-8')).get('retry_after')
+    except (ValueError, AttributeError):
+        retry_after = None
+    if retry_after is None:
+        retry_after = headers.get('retry-after')
+    try:
+        return max(0.0, float(retry_after)) if retry_after is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def idempotency_headers(key: Optional[str] = None) -> dict:
+    """Headers that make a star mutation safe to retry."""
+    return {"Idempotency-Key": key or uuid.uuid4().hex}
+
+
+class RateLimiter:
+    """Thread-safe token bucket that paces requests to stay under the server limit.
+
+    The server allows `max_requests` per sliding `window`. A bucket holding
+    `burst` tokens that refills at (max_requests - burst) / window tokens per
+    second can never exceed that limit within any window.
+    """
+
+    def __init__(self, max_requests: int = 100, window: float = 60.0, burst: int = 10):
+        self.burst = max(1, min(burst, max_requests))
+        self.rate = max(max_requests - self.burst, 1) / window
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """Take a token and return how many seconds the caller must wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return max(0.0, -self._tokens / self.rate)
+
+    def pause(self, seconds: float):
+        """Empty the bucket so that no tokens are available for `seconds`."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._tokens, -seconds * self.rate)
+            self._updated = now
+
+
+class RetryPolicy:
+    """Exponential backoff with full jitter for failed requests.
+
+    Only requests that are safe to repeat are retried: idempotent methods,
+    and POSTs that carry an Idempotency-Key (the server replays the original
+    response instead of applying them twice).
+    """
+
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+    RETRYABLE_STATUSES = frozenset({502, 503, 504})
+
+    def __init__(self, max_retries: int = 3, initial_backoff: float = 0.5, max_backoff: float = 10.0):
+        self.max_retries = max(0, max_retries)
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+
+    @classmethod
+    def can_retry(cls, method: str, headers: Optional[dict] = None) -> bool:
+        """Whether a request with this method and these headers may be sent again.
+
+        Also decides whether a request is resent after its keep-alive
+        connection dropped mid-request, which needs no RetryPolicy instance.
+        """
+        return method.upper() in cls.IDEMPOTENT_METHODS or bool(headers and headers.get("Idempotency-Key"))
+
+    def delay(self, attempt: int) -> float:
+        """Seconds to wait before retry number `attempt` (starting at 0)."""
+        return random.uniform(0, min(self.max_backoff, self.initial_backoff * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Fails requests fast while the API is down.
+
+    After `failure_threshold` consecutive failures the circuit opens and
+    requests raise CircuitOpenError without touching the network. Once
+    `reset_timeout` seconds have passed, one caller probes the API (the
+    client uses /health); if the probe succeeds the circuit closes again,
+    otherwise it stays open for another `reset_timeout`.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 10.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._lock = threading.Lock()
+
+    def before_request(self, probe):
+        """Raise CircuitOpenError unless a request may be sent now.
+
+        `probe` is called (without arguments) when the circuit is due for a
+        health check and must return True if the API is healthy again.
+        """
+        with self._lock:
+            if self.state == self.CLOSED:
+                return
+            remaining = self._opened_at + self.reset_timeout - time.monotonic()
+            if self.state == self.HALF_OPEN or remaining > 0:
+                raise CircuitOpenError(f"API unavailable, not retrying for another {max(remaining, 0):.1f}s")
+            self.state = self.HALF_OPEN
+
+        try:
+            healthy = probe()
+        except Exception:
+            healthy = False
+        with self._lock:
+            if healthy:
+                self.state = self.CLOSED
+                self._failures = 0
+                return
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+        raise CircuitOpenError(f"API still unavailable, next health check in {self.reset_timeout:.1f}s")
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.CLOSED and self._failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class ConnectionPool:
+    """Pool of reusable HTTP/1.1 keep-alive connections to a single host."""
+
+    def __init__(self, base_url: str, maxsize: int = 4, idle_timeout: float = 30.0, timeout: float = 30.0):
+        parsed = urllib.parse.urlsplit(base_url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {parsed.scheme!r}")
+        self.scheme = parsed.scheme
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or (443 if self.scheme == "https" else 80)
+        self.maxsize = max(1, maxsize)
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._idle = []  # (connection, time it was returned to the pool)
+        self._lock = threading.Lock()
+
+    def _new_connection(self) -> http.client.HTTPConnection:
+        """Create a new (not yet connected) connection to the pool's host."""
+        if self.scheme == "https":
+            return http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        return http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+
+    def acquire(self):
+        """Get a connection, preferring an idle one. Returns (connection, reused)."""
+        now = time.monotonic()
+        with self._lock:
+            while self._idle:
+                conn, released_at = self._idle.pop()
+                if now - released_at <= self.idle_timeout and conn.sock is not None:
+                    return conn, True
+                conn.close()
+        return self._new_connection(), False
+
+    def release(self, conn: http.client.HTTPConnection):
+        """Return a connection to the pool, closing it if the pool is full."""
+        with self._lock:
+            if len(self._idle) < self.maxsize and conn.sock is not None:
+                self._idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn, _ in idle:
+            conn.close()
+
+
+class RequestTracer:
+    """Collects per-request phase timings for the synchronous client.
+
+    Each request is split into queue (client-side rate limiting and 429
+    pauses), connect (DNS lookup, TCP and TLS setup for new connections),
+    ttfb (sending the request until the response headers arrive), read
+    (response body) and decode (JSON parsing). The server's own
+    processing_time_ms is kept alongside so client, network and handler time
+    can be told apart.
+    """
+
+    PHASES = ("queue", "connect", "ttfb", "read", "decode")
+
+    def __init__(self):
+        self.events = []  # (thread, method, endpoint, status, start offset, {phase: ms}, server ms)
+        self._thread_names = {}
+        self._started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def record(self, method: str, endpoint: str, status: Optional[int], started: float, timings: dict,
+               server_ms: Optional[float] = None):
+        """Record one finished request that began at perf_counter() time `started`."""
+        with self._lock:
+            self._thread_names.setdefault(threading.get_ident(), threading.current_thread().name)
+            self.events.append((threading.get_ident(), method, endpoint, status,
+                                started - self._started, dict(timings), server_ms))
+
+    def chrome_trace(self) -> dict:
+        """Return the recorded requests as Chrome trace-event JSON (chrome://tracing, Perfetto)."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self.events)
+            thread_names = dict(self._thread_names)
+        trace_events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}}
+                        for tid, name in thread_names.items()]
+        for tid, method, endpoint, status, offset, timings, server_ms in events:
+            ts = offset * 1e6
+            args = {"status": status, **{f"{phase}_ms": round(ms, 3) for phase, ms in timings.items()}}
+            if server_ms is not None:
+                args["server_processing_ms"] = server_ms
+            trace_events.append({"name": f"{method} /{endpoint}", "cat": "request", "ph": "X", "ts": ts,
+                                 "dur": sum(timings.values()) * 1000, "pid": pid, "tid": tid, "args": args})
+            phase_start = ts
+            for phase in self.PHASES:
+                if phase not in timings:
+                    continue
+                duration = timings[phase] * 1000
+                trace_events.append({"name": phase, "cat": "phase", "ph": "X", "ts": phase_start, "dur": duration,
+                                     "pid": pid, "tid": tid})
+                if phase == "ttfb" and server_ms is not None:
+                    # The server only reports a duration; place it just before the first byte
+                    server_duration = min(server_ms * 1000, duration)
+                    trace_events.append({"name": "server", "cat": "server", "ph": "X",
+                                         "ts": phase_start + duration - server_duration, "dur": server_duration,
+                                         "pid": pid, "tid": tid})
+                phase_start += duration
+        return {"traceEvents": trace_events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str):
+        """Write the Chrome trace to `path`."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.chrome_trace(), f)
+
+    def print_summary(self, file=None):
+        """Print per-phase percentiles and a latency histogram of all traced requests."""
+        file = file or sys.stderr
+        with self._lock:
+            events = list(self.events)
+        if not events:
+            print("Trace: no requests recorded", file=file)
+            return
+
+        columns = {phase: [] for phase in self.PHASES}
+        columns["server"] = []
+        totals = []
+        for *_, timings, server_ms in events:
+            for phase, ms in timings.items():
+                columns[phase].append(ms)
+            if server_ms is not None:
+                columns["server"].append(server_ms)
+            totals.append(sum(timings.values()))
+        columns["total"] = totals
+
+        print(f"\nTrace: {len(events)} request(s)", file=file)
+        header = f"{'phase':<10}{'count':>7}{'p50':>9}{'p95':>9}{'max':>9}"
+        print(header, file=file)
+        print("-" * len(header), file=file)
+        for phase, values in columns.items():
+            if not values:
+                continue
+            values.sort()
+            print(f"{phase:<10}{len(values):>7}{percentile(values, 50):>9.2f}{percentile(values, 95):>9.2f}"
+                  f"{values[-1]:>9.2f}", file=file)
+
+        # Power-of-two millisecond buckets for the end-to-end latency
+        buckets = {}
+        for ms in totals:
+            bucket = 0 if ms < 1 else 2 ** math.floor(math.log2(ms))
+            buckets[bucket] = buckets.get(bucket, 0) + 1
+        print("\nTotal latency (ms):", file=file)
+        widest = max(buckets.values())
+        for bucket in sorted(buckets):
+            label = "<1" if bucket == 0 else f"{bucket}-{bucket * 2}"
+            bar = "#" * max(1, round(40 * buckets[bucket] / widest))
+            print(f"{label:>12} | {bar} {buckets[bucket]}", file=file)
+        print("\nLatencies in milliseconds; 'server' is the server's own processing_time_ms.", file=file)
+
+
+class ResponseCache:
+    """Short-lived cache for read-mostly GET endpoints.
+
+    Responses are kept for a per-endpoint TTL in seconds; endpoints without
+    a TTL are never cached. Any star mutation clears the cache, and a response
+    that was requested before such a mutation is not stored afterwards.
+    """
+
+    DEFAULT_TTLS = {"settings": 30.0, "progress": 5.0, "stats": 5.0, "stars/balance": 2.0}
+
+    def __init__(self, ttls: Optional[dict] = None):
+        self.ttls = dict(self.DEFAULT_TTLS if ttls is None else ttls)
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}  # key -> (expires at, response)
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every invalidation."""
+        return self._generation
+
+    def get(self, endpoint: str, key) -> Optional[dict]:
+        """Return a copy of a fresh cached response, or None."""
+        if endpoint not in self.ttls:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                self.misses += 1
+                return None
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, endpoint: str, key, response: dict, generation: int):
+        """Store a response fetched while the cache was at `generation`."""
+        ttl = self.ttls.get(endpoint)
+        if not ttl:
+            return
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (time.monotonic() + ttl, copy.deepcopy(response))
+
+    def invalidate(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+class _InFlightRequest:
+    """A GET that other threads are waiting on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.followers = 0
+        self.result = None
+        self.error = None
+
 
 class BijbelQuizAPI:
     """Client for the BijbelQuiz local API."""
 
-    def __init__(self, base_url: str = "http://localhost:7777/v1", api_key: Optional[str] = None):
+    MAX_QUESTIONS_LIMIT = 50  # Server-side cap on the questions `limit` parameter
+    MAX_QUESTION_IDS = 500  # Server-side cap on the questions `ids` parameter
+
+    def __init__(self, base_url: str = "http://localhost:7777/v1", api_key: Optional[str] = None,
+                 pool_size: int = 4, idle_timeout: float = 30.0, timeout: float = 30.0,
+                 rate_limiter: Optional["RateLimiter"] = None, max_rate_limit_retries: int = 5,
+                 tracer: Optional[RequestTracer] = None, retry_policy: Optional[RetryPolicy] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None, cache: Optional[ResponseCache] = None,
+                 compression: bool = True):
         self.base_url = base_url.rstrip('/')
+        self.base_path = urllib.parse.urlsplit(self.base_url).path
         self.api_key = api_key
         self.headers = {"Content-Type": "application/json"}
         if api_key:
             self.headers.update({"X-API-Key": api_key})
+        if compression:
+            self.headers["Accept-Encoding"] = "gzip"
+        self.pool = ConnectionPool(self.base_url, maxsize=pool_size, idle_timeout=idle_timeout, timeout=timeout)
+        self.rate_limiter = rate_limiter
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self.tracer = tracer
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.cache = cache
+        self.coalesced = 0  # GETs answered by another thread's identical request
+        self.not_modified = 0  # GETs answered with 304 from a stored ETag
+        self._etags = {}  # path -> (ETag, body) of the last response that carried an ETag
+        self._in_flight = {}
+        self._in_flight_lock = threading.Lock()
+        self.wire_bytes = 0  # response body bytes as received, possibly compressed
+        self.body_bytes = 0  # response body bytes after decompression
+        self._bytes_lock = threading.Lock()
+        self._last_response = threading.local()  # wire size of this thread's last response
 
-    def _get(self, endpoint: str, params: Optional[dict] = None) -> dict:
-        """Make a GET request to the API."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+    def close(self):
+        """Close all pooled connections."""
+        self.pool.close()
+
+    def _send(self, method: str, path: str, body: Optional[bytes] = None, headers: Optional[dict] = None,
+              timings: Optional[dict] = None):
+        """Send a request over a pooled connection. Returns (status, reason, headers, body bytes).
+
+        gzip-encoded bodies are decompressed. If `timings` is given, the
+        connect, ttfb and read phases are stored in it in milliseconds.
+        """
+        request_headers = {**self.headers, **headers} if headers else self.headers
+        while True:
+            conn, reused = self.pool.acquire()
+            try:
+                started = time.perf_counter()
+                if conn.sock is None:
+                    conn.connect()
+                connected = time.perf_counter()
+                conn.request(method, path, body=body, headers=request_headers)
+                response = conn.getresponse()
+                first_byte = time.perf_counter()
+                payload = response.read()
+                wire_size = len(payload)
+                if response.getheader('Content-Encoding', '').lower() == 'gzip':
+                    try:
+                        payload = gzip.decompress(payload)
+                    except (EOFError, zlib.error) as e:
+                        raise http.client.HTTPException(f"invalid gzip response body ({e})") from e
+                if timings is not None:
+                    timings["connect"] = (connected - started) * 1000
+                    timings["ttfb"] = (first_byte - connected) * 1000
+                    timings["read"] = (time.perf_counter() - first_byte) * 1000
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                conn.close()
+                # The server may have dropped an idle keep-alive connection;
+                # retry on a fresh connection if that cannot apply it twice.
+                if reused and RetryPolicy.can_retry(method, request_headers):
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                self.pool.release(conn)
+            with self._bytes_lock:
+                self.wire_bytes += wire_size
+                self.body_bytes += len(payload)
+            self._last_response.wire_size = wire_size
+            headers = {name.lower(): value for name, value in response.getheaders()}
+            return response.status, response.reason, headers, payload
+
+    def _path(self, endpoint: str, params: Optional[dict] = None) -> str:
+        """Build the request path (including query string) for an endpoint."""
+        path = f"{self.base_path}/{endpoint.lstrip('/')}"
         if params:
-            url += "?" + urllib.parse.urlencode(params)
-        
-        try:
-            request = urllib.request.Request(url, headers=self.headers)
-            with urllib.request.urlopen(request) as response:
-                return json.loads(response.read().decode('utf-8'))
-        except urllib.error.HTTPError as e:
-            print(f"Error: {e}", file=sys.stderr)
+            path += "?" + urllib.parse.urlencode(params)
+        return path
+
+    def _probe_health(self) -> bool:
+        """Check /health directly, bypassing retries and the circuit breaker."""
+        status, _, _, _ = self._send("GET", self._path("health"))
+        return status == 200
+
+    def _request(self, method: str, endpoint: str, params: Optional[dict] = None, data: Optional[dict] = None,
+                 headers: Optional[dict] = None) -> dict:
+        """Make a request to the API and decode the JSON response.
+
+        Raises APIError for error responses, TransportError (or
+        CircuitOpenError) when the API cannot be reached and
+        InvalidResponseError for bodies that are not JSON.
+        """
+        path = self._path(endpoint, params)
+        body = json.dumps(data).encode('utf-8') if data is not None else None
+
+        # Revalidate bodies we already have instead of downloading them again
+        validated = self._etags.get(path) if method == "GET" else None
+        if validated is not None:
+            headers = {**(headers or {}), "If-None-Match": validated[0]}
+
+        timings = {} if self.tracer else None
+        started = time.perf_counter()
+        # Health checks are never paced or short-circuited
+        guarded = endpoint.strip('/') != "health"
+        retryable = self.retry_policy is not None and self.retry_policy.can_retry(method, headers)
+        retries = rate_limit_retries = 0
+        while True:
+            if self.circuit_breaker and guarded:
+                self.circuit_breaker.before_request(self._probe_health)
+            if self.rate_limiter and guarded:
+                time.sleep(self.rate_limiter.reserve())
+            if timings is not None:
+                # Rate limiter waits and earlier attempts all count as queueing
+                timings["queue"] = (time.perf_counter() - started) * 1000
             try:
-                error_data = json.loads(e.read().decode('utf-8'))
-                print(f"API Error: {error_data.get('error', 'Unknown error')}", file=sys.stderr)
-                print(f"Message: {error_data.get('message', '')}", file=sys.stderr)
-            except:
-                print(f"HTTP {e.code}: {e.reason}", file=sys.stderr)
-            sys.exit(1)
-        except urllib.error.URLError as e:
-            print(f"URL Error: {e.reason}", file=sys.stderr)
-            sys.exit(1)
+                status, reason, response_headers, payload = self._send(method, path, body, headers, timings)
+            except (OSError, http.client.HTTPException) as e:
+                if self.circuit_breaker and guarded:
+                    self.circuit_breaker.record_failure()
+                if retryable and retries < self.retry_policy.max_retries:
+                    delay = self.retry_policy.delay(retries)
+                    retries += 1
+                    print(f"Connection error ({e or type(e).__name__}), retrying in {delay:.1f}s...", file=sys.stderr)
+                    time.sleep(delay)
+                    continue
+                if timings is not None:
+                    self.tracer.record(method, endpoint, None, started, timings)
+                raise TransportError(str(e) or type(e).__name__) from e
+
+            if self.circuit_breaker and guarded:
+                if status >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+
+            retry_after = parse_retry_after(status, response_headers, payload)
+            if retry_after is not None and rate_limit_retries < self.max_rate_limit_retries:
+                rate_limit_retries += 1
+                print(f"Rate limited by server, retrying in {retry_after:.0f}s...", file=sys.stderr)
+                if self.rate_limiter:
+                    self.rate_limiter.pause(retry_after)
+                else:
+                    time.sleep(retry_after)
+                continue
+
+            if (retryable and status in self.retry_policy.RETRYABLE_STATUSES
+                    and retries < self.retry_policy.max_retries):
+                delay = self.retry_policy.delay(retries)
+                retries += 1
+                print(f"Server error (HTTP {status}), retrying in {delay:.1f}s...", file=sys.stderr)
+                time.sleep(delay)
+                continue
+            break
+
+        if validated is not None and status == 304:
+            status, reason, payload = 200, "OK", validated[1]
+            self.not_modified += 1
+        elif method == "GET" and status == 200 and "etag" in response_headers:
+            self._etags[path] = (response_headers["etag"], payload)
+
+        if timings is None:
+            return decode_response(status, reason, payload)
+        decode_started = time.perf_counter()
+        result = None
+        try:
+            result = decode_response(status, reason, payload)
+            return result
+        finally:
+            timings["decode"] = (time.perf_counter() - decode_started) * 1000
+            server_ms = result.get("processing_time_ms") if isinstance(result, dict) else None
+            self.tracer.record(method, endpoint, status, started, timings, server_ms)
+
+    def _get(self, endpoint: str, params: Optional[dict] = None) -> dict:
+        """Make a GET request to the API.
+
+        Fresh responses come from the cache if one is configured, and
+        identical GETs issued concurrently share a single network request.
+        """
+        key = self._path(endpoint, params)
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, key)
+            if cached is not None:
+                return cached
+            generation = self.cache.generation
+
+        with self._in_flight_lock:
+            in_flight = self._in_flight.get(key)
+            leader = in_flight is None
+            if leader:
+                in_flight = self._in_flight[key] = _InFlightRequest()
+            else:
+                in_flight.followers += 1
+                self.coalesced += 1
+
+        if not leader:
+            in_flight.done.wait()
+            if in_flight.error is not None:
+                raise in_flight.error
+            return copy.deepcopy(in_flight.result)
+
+        try:
+            in_flight.result = self._request("GET", endpoint, params=params)
         except Exception as e:
-            print(f"Unexpected error: {e}", file=sys.stderr)
-            sys.exit(1)
+            in_flight.error = e
+            raise
+        finally:
+            with self._in_flight_lock:
+                del self._in_flight[key]
+            in_flight.done.set()
+
+        if self.cache is not None:
+            self.cache.put(endpoint, key, in_flight.result, generation)
+        # Followers copy the shared result, so only hand out a copy if there were any
+        return copy.deepcopy(in_flight.result) if in_flight.followers else in_flight.result
 
-    def _post(self, endpoint: str, data: dict) -> dict:
+    def _post(self, endpoint: str, data: dict, headers: Optional[dict] = None) -> dict:
         """Make a POST request to the API."""
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
         try:
-            json_data = json.dumps(data).encode('utf-8')
-            request = urllib.request.Request(url, data=json_data, headers=self.headers, method='POST')
-            with urllib.request.urlopen(request) as response:
-                return json.loads(response.read().decode('utf-8'))
-        except urllib.error.HTTPError as e:
-            print(f"Error: {e}", file=sys.stderr)
-            try:
-                error_data = json.loads(e.read().decode('utf-8'))
-                print(f"API Error: {error_data.get('error', 'Unknown error')}", file=sys.stderr)
-                print(f"Message: {error_data.get('message', '')}", file=sys.stderr)
-            except:
-                print(f"HTTP {e.code}: {e.reason}", file=sys.stderr)
-            sys.exit(1)
-        except urllib.error.URLError as e:
-            print(f"URL Error: {e.reason}", file=sys.stderr)
-            sys.exit(1)
-        except Exception as e:
-            print(f"Unexpected error: {e}", file=sys.stderr)
-            sys.exit(1)
+            return self._request("POST", endpoint, data=data, headers=headers)
+        finally:
+            if self.cache is not None:
+                # Star updates change the balance, stats and progress
+                self.cache.invalidate()
 
     def health(self) -> dict:
         """Check API health."""
         return self._get("health")
 
     def get_questions(self, category: Optional[str] = None, limit: int = 10, difficulty: Optional[int] = None) -> dict:
-        """Get quiz questions."""
+        """Get quiz questions.
+
+        Current servers filter by difficulty before applying the limit and say
+        so with `total_matching`. Older servers filter afterwards, so for them
+        the request is repeated with a larger limit until enough questions
+        match or the server-side maximum is reached.
+        """
         params = {"limit": limit}
         if category:
             params["category"] = category
         if difficulty:
             params["difficulty"] = difficulty
-        return self._get("questions", params)
+        result = self._get("questions", params)
+        if not difficulty or "total_matching" in result:
+            return result
+
+        questions = result.get("questions") or []
+        fetch_limit = limit
+        while len(questions) < limit and fetch_limit < self.MAX_QUESTIONS_LIMIT:
+            fetch_limit = min(fetch_limit * 2, self.MAX_QUESTIONS_LIMIT)
+            params["limit"] = fetch_limit
+            seen = {q.get("question") for q in questions}
+            more = self._get("questions", params).get("questions") or []
+            questions += [q for q in more if q.get("question") not in seen]
+        result["questions"] = questions[:limit]
+        result["count"] = len(result["questions"])
+        return result
+
+    def get_questions_by_ids(self, ids, chunk_size: int = 200) -> dict:
+        """Look up questions by id, in as few round-trips as possible.
+
+        Ids are sent as `?ids=` lists of at most `chunk_size` (capped at the
+        server maximum). The result keeps the order of `ids`, drops duplicates
+        and lists ids the server does not know under `missing`.
+        """
+        ids = list(dict.fromkeys(str(i) for i in ids))
+        chunk_size = max(1, min(chunk_size, self.MAX_QUESTION_IDS))
+        found = {}
+        missing = []
+        for start in range(0, len(ids), chunk_size):
+            result = self._get("questions", {"ids": ",".join(ids[start:start + chunk_size])})
+            for question in result.get("questions") or []:
+                found[str(question.get("id"))] = question
+            missing += result.get("missing") or []
+
+        questions = [found[i] for i in ids if i in found]
+        return {"questions": questions, "count": len(questions), "missing": missing}
+
+    def iter_questions(self, category: Optional[str] = None, difficulty: Optional[int] = None,
+                       limit: Optional[int] = None) -> Iterator[dict]:
+        """Yield questions from /questions/stream as their lines arrive.
+
+        The stream endpoint sends one JSON question per line and has no
+        50 question cap; without `limit` every matching question is sent.
+        The connection goes back to the pool once the stream is read to the
+        end, and is closed if the generator is abandoned early.
+        """
+        params = {}
+        if category:
+            params["category"] = category
+        if difficulty:
+            params["difficulty"] = difficulty
+        if limit:
+            params["limit"] = limit
+        path = self._path("questions/stream", params)
+        # Stream lines are small and must not wait on a gzip window
+        headers = {**self.headers, "Accept-Encoding": "identity"}
+
+        started = time.perf_counter()
+        rate_limit_retries = 0
+        while True:
+            if self.circuit_breaker:
+                self.circuit_breaker.before_request(self._probe_health)
+            if self.rate_limiter:
+                time.sleep(self.rate_limiter.reserve())
+            conn, reused = self.pool.acquire()
+            try:
+                if conn.sock is None:
+                    conn.connect()
+                conn.request("GET", path, headers=headers)
+                response = conn.getresponse()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError) as e:
+                conn.close()
+                if reused:
+                    continue
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_failure()
+                raise TransportError(str(e) or type(e).__name__) from e
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_failure()
+                raise TransportError(str(e) or type(e).__name__) from e
+
+            if self.circuit_breaker:
+                if response.status >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
+            if response.status == 200 and "ndjson" in response.getheader("Content-Type", ""):
+                break
+
+            # Error responses (and servers that predate the stream endpoint)
+            # answer with a single JSON body
+            payload = response.read()
+            conn.close()
+            response_headers = {name.lower(): value for name, value in response.getheaders()}
+            retry_after = parse_retry_after(response.status, response_headers, payload)
+            if retry_after is not None and rate_limit_retries < self.max_rate_limit_retries:
+                rate_limit_retries += 1
+                print(f"Rate limited by server, retrying in {retry_after:.0f}s...", file=sys.stderr)
+                if self.rate_limiter:
+                    self.rate_limiter.pause(retry_after)
+                else:
+                    time.sleep(retry_after)
+                continue
+            decode_response(response.status, response.reason, payload)
+            raise InvalidResponseError("server does not support streaming questions")
+
+        first_byte = time.perf_counter()
+        received = 0
+        finished = False
+        try:
+            for line in response:
+                received += len(line)
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    question = json.loads(line.decode('utf-8'))
+                except ValueError as e:
+                    raise InvalidResponseError(f"invalid JSON line in question stream ({e})") from e
+                yield question
+            finished = True
+        except (OSError, http.client.HTTPException) as e:
+            raise TransportError(str(e) or type(e).__name__) from e
+        finally:
+            if finished and not response.will_close:
+                self.pool.release(conn)
+            else:
+                conn.close()
+            with self._bytes_lock:
+                self.wire_bytes += received
+                self.body_bytes += received
+            if self.tracer:
+                self.tracer.record("GET", "questions/stream", response.status, started, {
+                    "ttfb": (first_byte - started) * 1000,
+                    "read": (time.perf_counter() - first_byte) * 1000,
+                })
 
     def get_progress(self) -> dict:
         """Get user progress."""
@@ -106,34 +865,564 @@ class BijbelQuizAPI:
         """Get star balance."""
         return self._get("stars/balance")
 
-    def add_stars(self, amount: int, reason: str, lesson_id: Optional[str] = None) -> dict:
-        """Add stars to balance."""
+    def add_stars(self, amount: int, reason: str, lesson_id: Optional[str] = None,
+                  idempotency_key: Optional[str] = None) -> dict:
+        """Add stars to balance. A fresh idempotency key is generated unless one is given."""
         data = {"amount": amount, "reason": reason}
         if lesson_id:
             data["lessonId"] = lesson_id
-        return self._post("stars/add", data)
+        return self._post("stars/add", data, headers=idempotency_headers(idempotency_key))
 
-    def spend_stars(self, amount: int, reason: str, lesson_id: Optional[str] = None) -> dict:
-        """Spend stars from balance."""
+    def spend_stars(self, amount: int, reason: str, lesson_id: Optional[str] = None,
+                    idempotency_key: Optional[str] = None) -> dict:
+        """Spend stars from balance. A fresh idempotency key is generated unless one is given."""
         data = {"amount": amount, "reason": reason}
         if lesson_id:
             data["lessonId"] = lesson_id
-        return self._post("stars/spend", data)
+        return self._post("stars/spend", data, headers=idempotency_headers(idempotency_key))
 
-    def get_star_transactions(self, limit: int = 50, type_filter: Optional[str] = None, lesson_id: Optional[str] = None) -> dict:
+    def get_star_transactions(self, limit: int = 50, type_filter: Optional[str] = None, lesson_id: Optional[str] = None,
+                              cursor: Optional[str] = None) -> dict:
         """Get star transactions."""
         params = {"limit": limit}
         if type_filter:
             params["type"] = type_filter
         if lesson_id:
             params["lessonId"] = lesson_id
+        if cursor:
+            params["cursor"] = cursor
         return self._get("stars/transactions", params)
 
+    def iter_star_transactions(self, page_size: int = 1000, type_filter: Optional[str] = None,
+                               lesson_id: Optional[str] = None) -> Iterator[dict]:
+        """Yield every star transaction, newest first, one page at a time.
+
+        Follows the server's ``next_cursor`` so only a single page is held in
+        memory. Servers without cursor support return just the first page.
+        """
+        cursor = None
+        while True:
+            page = self.get_star_transactions(page_size, type_filter, lesson_id, cursor)
+            yield from page.get("transactions", [])
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return
+
     def get_star_stats(self) -> dict:
         """Get star statistics."""
         return self._get("stars/stats")
 
 
+class AsyncBijbelQuizAPI:
+    """asyncio client for the BijbelQuiz local API.
+
+    Mirrors BijbelQuizAPI, but every endpoint method is a coroutine so many
+    requests can be in flight at once. At most `concurrency` requests run
+    concurrently; finished connections are kept alive and reused.
+    """
+
+    def __init__(self, base_url: str = "http://localhost:7777/v1", api_key: Optional[str] = None,
+                 concurrency: int = 8, idle_timeout: float = 30.0, timeout: float = 30.0,
+                 rate_limiter: Optional["RateLimiter"] = None, max_rate_limit_retries: int = 5):
+        self.base_url = base_url.rstrip('/')
+        parsed = urllib.parse.urlsplit(self.base_url)
+        if parsed.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme: {parsed.scheme!r}")
+        self.base_path = parsed.path
+        self.ssl = parsed.scheme == "https"
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or (443 if self.ssl else 80)
+        self.api_key = api_key
+        self.headers = {"Content-Type": "application/json"}
+        if api_key:
+            self.headers.update({"X-API-Key": api_key})
+        self.concurrency = max(1, concurrency)
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self.rate_limiter = rate_limiter
+        self.max_rate_limit_retries = max_rate_limit_retries
+        self._semaphore = None
+        self._idle = []  # (reader, writer, time it was returned to the pool)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close all idle connections."""
+        idle, self._idle = self._idle, []
+        for _, writer, _ in idle:
+            writer.close()
+        for _, writer, _ in idle:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+    async def _acquire(self):
+        """Get an open connection, preferring an idle one. Returns (reader, writer, reused)."""
+        now = time.monotonic()
+        while self._idle:
+            reader, writer, released_at = self._idle.pop()
+            if now - released_at <= self.idle_timeout and not writer.is_closing() and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl or None)
+        return reader, writer, False
+
+    def _release(self, reader, writer):
+        """Return a connection to the pool, closing it if the pool is full."""
+        if len(self._idle) < self.concurrency and not writer.is_closing():
+            self._idle.append((reader, writer, time.monotonic()))
+        else:
+            writer.close()
+
+    @staticmethod
+    async def _read_response(reader):
+        """Read one HTTP/1.1 response. Returns (status, reason, headers, body, keep_alive)."""
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionResetError("Connection closed by server")
+        version, status, *reason = status_line.decode('latin-1').rstrip('\r\n').split(' ', 2)
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get('transfer-encoding', '').lower() == 'chunked':
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if size == 0:
+                    # Skip trailers up to the terminating blank line
+                    while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            body = b''.join(chunks)
+            framed = True
+        elif 'content-length' in headers:
+            body = await reader.readexactly(int(headers['content-length']))
+            framed = True
+        else:
+            body = await reader.read()
+            framed = False
+
+        connection = headers.get('connection', '').lower()
+        keep_alive = framed and connection != 'close' and (version != 'HTTP/1.0' or connection == 'keep-alive')
+        return int(status), reason[0] if reason else '', headers, body, keep_alive
+
+    async def _send(self, method: str, path: str, body: Optional[bytes] = None, headers: Optional[dict] = None):
+        """Send a request over a pooled connection. Returns (status, reason, headers, body bytes)."""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self.host}:{self.port}", "Connection: keep-alive"]
+        request_headers = {**self.headers, **headers} if headers else self.headers
+        lines += [f"{name}: {value}" for name, value in request_headers.items()]
+        lines.append(f"Content-Length: {len(body) if body else 0}")
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1') + (body or b'')
+
+        async with self._semaphore:
+            while True:
+                reader, writer, reused = await self._acquire()
+                try:
+                    writer.write(request)
+                    await writer.drain()
+                    status, reason, headers, payload, keep_alive = await asyncio.wait_for(
+                        self._read_response(reader), self.timeout)
+                except (ConnectionResetError, BrokenPipeError, asyncio.IncompleteReadError):
+                    writer.close()
+                    # The server may have dropped an idle keep-alive connection;
+                    # retry on a fresh connection if that cannot apply it twice.
+                    if reused and RetryPolicy.can_retry(method, request_headers):
+                        continue
+                    raise
+                except BaseException:
+                    writer.close()
+                    raise
+                if keep_alive:
+                    self._release(reader, writer)
+                else:
+                    writer.close()
+                return status, reason, headers, payload
+
+    async def _request(self, method: str, endpoint: str, params: Optional[dict] = None, data: Optional[dict] = None,
+                       headers: Optional[dict] = None) -> dict:
+        """Make a request to the API and decode the JSON response."""
+        path = f"{self.base_path}/{endpoint.lstrip('/')}"
+        if params:
+            path += "?" + urllib.parse.urlencode(params)
+        body = json.dumps(data).encode('utf-8') if data is not None else None
+
+        rate_limited = endpoint.strip('/') != "health"
+        for attempt in range(self.max_rate_limit_retries + 1):
+            if self.rate_limiter and rate_limited:
+                await asyncio.sleep(self.rate_limiter.reserve())
+            try:
+                status, reason, response_headers, payload = await self._send(method, path, body, headers)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                raise TransportError(str(e) or type(e).__name__) from e
+
+            retry_after = parse_retry_after(status, response_headers, payload)
+            if retry_after is None or attempt == self.max_rate_limit_retries:
+                break
+            print(f"Rate limited by server, retrying in {retry_after:.0f}s...", file=sys.stderr)
+            if self.rate_limiter:
+                self.rate_limiter.pause(retry_after)
+            else:
+                await asyncio.sleep(retry_after)
+
+        return decode_response(status, reason, payload)
+
+    async def _get(self, endpoint: str, params: Optional[dict] = None) -> dict:
+        """Make a GET request to the API."""
+        return await self._request("GET", endpoint, params=params)
+
+    async def _post(self, endpoint: str, data: dict, headers: Optional[dict] = None) -> dict:
+        """Make a POST request to the API."""
+        return await self._request("POST", endpoint, data=data, headers=headers)
+
+    async def gather(self, **calls) -> dict:
+        """Await several coroutines concurrently and return their results by name.
+
+        Example: await api.gather(stats=api.get_stats(), balance=api.get_star_balance())
+        """
+        results = await asyncio.gather(*calls.values())
+        return dict(zip(calls.keys(), results))
+
+    async def health(self) -> dict:
+        """Check API health."""
+        return await self._get("health")
+
+    async def get_questions(self, category: Optional[str] = None, limit: int = 10, difficulty: Optional[int] = None) -> dict:
+        """Get quiz questions."""
+        params = {"limit": limit}
+        if category:
+            params["category"] = category
+        if difficulty:
+            params["difficulty"] = difficulty
+        return await self._get("questions", params)
+
+    async def get_progress(self) -> dict:
+        """Get user progress."""
+        return await self._get("progress")
+
+    async def get_stats(self) -> dict:
+        """Get game statistics."""
+        return await self._get("stats")
+
+    async def get_settings(self) -> dict:
+        """Get app settings."""
+        return await self._get("settings")
+
+    async def get_star_balance(self) -> dict:
+        """Get star balance."""
+        return await self._get("stars/balance")
+
+    async def add_stars(self, amount: int, reason: str, lesson_id: Optional[str] = None,
+                        idempotency_key: Optional[str] = None) -> dict:
+        """Add stars to balance. A fresh idempotency key is generated unless one is given."""
+        data = {"amount": amount, "reason": reason}
+        if lesson_id:
+            data["lessonId"] = lesson_id
+        return await self._post("stars/add", data, headers=idempotency_headers(idempotency_key))
+
+    async def spend_stars(self, amount: int, reason: str, lesson_id: Optional[str] = None,
+                          idempotency_key: Optional[str] = None) -> dict:
+        """Spend stars from balance. A fresh idempotency key is generated unless one is given."""
+        data = {"amount": amount, "reason": reason}
+        if lesson_id:
+            data["lessonId"] = lesson_id
+        return await self._post("stars/spend", data, headers=idempotency_headers(idempotency_key))
+
+    async def get_star_transactions(self, limit: int = 50, type_filter: Optional[str] = None, lesson_id: Optional[str] = None,
+                                    cursor: Optional[str] = None) -> dict:
+        """Get star transactions."""
+        params = {"limit": limit}
+        if type_filter:
+            params["type"] = type_filter
+        if lesson_id:
+            params["lessonId"] = lesson_id
+        if cursor:
+            params["cursor"] = cursor
+        return await self._get("stars/transactions", params)
+
+    async def get_star_stats(self) -> dict:
+        """Get star statistics."""
+        return await self._get("stars/stats")
+
+    async def dashboard(self) -> dict:
+        """Fetch stats, progress and star balance/statistics concurrently."""
+        return await self.gather(
+            stats=self.get_stats(),
+            progress=self.get_progress(),
+            star_balance=self.get_star_balance(),
+            star_stats=self.get_star_stats(),
+        )
+
+
+class StarJournal:
+    """Write-behind journal for star mutations.
+
+    Every add/spend is appended to a local JSON-lines file before anything is
+    sent, so earned stars survive network failures and crashes. A background
+    flusher coalesces consecutive operations with the same type, reason and
+    lesson into a single request, retries failures with exponential backoff,
+    and replays whatever is left in the journal the next time it is opened.
+
+    The server rejects an add that would take the day's total past its daily
+    limit as a whole. A combined batch that hits the limit is therefore split
+    and its entries are sent one at a time, and a single entry that hits the
+    limit is dropped: retrying it cannot succeed until the limit resets.
+    """
+
+    DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".bijbelquiz", "star_journal.jsonl")
+    MAX_BATCH = 100
+    # Largest combined amount sent in one request, well under the server's
+    # daily limit of 150 so one batch does not use up the day on its own
+    MAX_BATCH_AMOUNT = 50
+    # Client errors that will never succeed on retry (invalid amount, insufficient stars, ...)
+    PERMANENT_STATUSES = {400, 404, 413}
+
+    def __init__(self, api: BijbelQuizAPI, path: Optional[str] = None,
+                 initial_backoff: float = 1.0, max_backoff: float = 300.0):
+        self.api = api
+        self.path = path or self.DEFAULT_PATH
+        self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.last_result = None
+        self.failed = []
+        self._pending = []
+        self._in_flight = []
+        self._file = None
+        self._closing = False
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def open(self) -> bool:
+        """Lock and load the journal and start flushing. Returns False if another process holds it."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._file = open(self.path, 'a+', encoding='utf-8')
+        if fcntl is not None:
+            try:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                self._file.close()
+                self._file = None
+                return False
+
+        self._file.seek(0)
+        entries, done, batches = {}, set(), {}
+        for line in self._file:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Torn write from a crash; the entry was never acknowledged
+            if 'done' in record:
+                done.update(record['done'])
+            elif 'batch' in record and 'ids' in record:
+                batches.update((entry_id, record['batch']) for entry_id in record['ids'])
+            elif 'id' in record:
+                entries[record['id']] = record
+        for entry_id, batch_key in batches.items():
+            if entry_id in entries:
+                entries[entry_id]['batch'] = batch_key
+        self._pending = [entry for entry_id, entry in entries.items() if entry_id not in done]
+        self._compact()
+
+        self._thread = threading.Thread(target=self._run, name="star-journal", daemon=True)
+        self._thread.start()
+        return True
+
+    def _compact(self):
+        """Rewrite the journal so it only contains unacknowledged entries."""
+        self._file.seek(0)
+        self._file.truncate()
+        for entry in self._pending + self._in_flight:
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _write(self, record: dict):
+        if self._file is None:
+            return  # Closed while a request was still in flight
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._sync()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of operations not yet acknowledged by the server."""
+        with self._cond:
+            return len(self._pending) + len(self._in_flight)
+
+    def _append(self, op: str, amount: int, reason: str, lesson_id: Optional[str]):
+        entry = {
+            'id': uuid.uuid4().hex,
+            'op': op,
+            'amount': amount,
+            'reason': reason,
+            'lessonId': lesson_id,
+            'ts': time.time(),
+        }
+        with self._cond:
+            self._write(entry)
+            self._pending.append(entry)
+            self._cond.notify_all()
+
+    def add_stars(self, amount: int, reason: str, lesson_id: Optional[str] = None):
+        """Queue stars to be added to the balance."""
+        self._append('add', amount, reason, lesson_id)
+
+    def spend_stars(self, amount: int, reason: str, lesson_id: Optional[str] = None):
+        """Queue stars to be spent from the balance."""
+        self._append('spend', amount, reason, lesson_id)
+
+    def _next_batch(self) -> list:
+        """Take the longest run of pending entries that can be sent as one request.
+
+        Each batch gets an idempotency key that is journaled before the request
+        is sent, so a retry or a replay after a crash resends exactly the same
+        batch under the same key and the server applies it only once.
+        """
+        first = self._pending[0]
+        if first.get('batch'):
+            batch = [entry for entry in self._pending if entry.get('batch') == first['batch']]
+            self._pending = [entry for entry in self._pending if entry.get('batch') != first['batch']]
+            return batch
+
+        key = (first['op'], first['reason'], first.get('lessonId'))
+        size, amount = 1, first['amount']
+        while size < min(len(self._pending), self.MAX_BATCH):
+            entry = self._pending[size]
+            if entry.get('batch') or (entry['op'], entry['reason'], entry.get('lessonId')) != key:
+                break
+            if amount + entry['amount'] > self.MAX_BATCH_AMOUNT:
+                break
+            amount += entry['amount']
+            size += 1
+        batch, self._pending = self._pending[:size], self._pending[size:]
+        self._assign_batch(batch)
+        return batch
+
+    def _assign_batch(self, batch: list):
+        """Journal a new idempotency key for a batch and tag its entries with it."""
+        batch_key = uuid.uuid4().hex
+        self._write({'batch': batch_key, 'ids': [entry['id'] for entry in batch]})
+        for entry in batch:
+            entry['batch'] = batch_key
+
+    @staticmethod
+    def _is_daily_limit(error: APIError) -> bool:
+        """Whether a 429 is the daily star limit rather than request rate limiting."""
+        return error.status == 429 and 'retry_after' not in error.data
+
+    def _send_batch(self, batch: list) -> dict:
+        first = batch[0]
+        data = {"amount": sum(entry['amount'] for entry in batch), "reason": first['reason']}
+        if first.get('lessonId'):
+            data["lessonId"] = first['lessonId']
+        endpoint = "stars/add" if first['op'] == 'add' else "stars/spend"
+        return self.api._post(endpoint, data, headers=idempotency_headers(first['batch']))
+
+    def _run(self):
+        backoff = self.initial_backoff
+        while True:
+            with self._cond:
+                while not self._pending and not self._closing:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                batch = self._in_flight = self._next_batch()
+
+            try:
+                result = self._send_batch(batch)
+            except APIError as e:
+                if self._is_daily_limit(e) and len(batch) > 1:
+                    # Some entries may still fit under the limit on their own.
+                    # The rejected batch was not applied, so new keys are safe.
+                    with self._cond:
+                        for entry in batch:
+                            self._assign_batch([entry])
+                        self._pending[:0] = batch
+                        self._in_flight = []
+                        self._cond.notify_all()
+                    continue
+                if e.status in self.PERMANENT_STATUSES or self._is_daily_limit(e):
+                    print(f"Warning: dropping queued star {batch[0]['op']} of "
+                          f"{sum(entry['amount'] for entry in batch)} ({e})", file=sys.stderr)
+                    with self._cond:
+                        self.failed.extend(batch)
+                        self._write({'done': [entry['id'] for entry in batch], 'failed': True})
+                        self._in_flight = []
+                        self._cond.notify_all()
+                    continue
+                error = e
+            except (TransportError, InvalidResponseError) as e:
+                error = e
+            else:
+                backoff = self.initial_backoff
+                with self._cond:
+                    self.last_result = result
+                    self._write({'done': [entry['id'] for entry in batch]})
+                    self._in_flight = []
+                    self._cond.notify_all()
+                continue
+
+            # Transient failure: put the batch back and retry later. When closing,
+            # stop right away and leave it in the journal for the next run.
+            with self._cond:
+                self._pending[:0] = batch
+                self._in_flight = []
+                self._cond.notify_all()
+                if self._closing:
+                    return
+                self._cond.wait(backoff * random.uniform(0.5, 1.0))
+            print(f"Warning: could not sync queued stars ({error}), retrying", file=sys.stderr)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued operation has been acknowledged. Returns True if so."""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        with self._cond:
+            while self._pending or self._in_flight:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float = 5.0) -> int:
+        """Flush for up to `timeout` seconds, stop the flusher and release the journal.
+
+        Returns the number of operations left in the journal for the next run.
+        """
+        if self._file is None:
+            return 0
+        self.flush(timeout)
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self._thread.join(timeout=1.0)
+        with self._cond:
+            left = len(self._pending) + len(self._in_flight)
+            if not self._thread.is_alive():
+                self._compact()
+            self._file.close()
+            self._file = None
+        return left
+
+
 @dataclass
 class QuizQuestion:
     """Represents a quiz question."""
@@ -146,13 +1435,161 @@ class QuizQuestion:
     biblicalReference: str
     allOptions: list
     correctAnswerIndex: int
+    id: Optional[str] = None
+
+
+class QuestionPrefetcher:
+    """Background producer that keeps a buffer of upcoming questions filled.
+
+    Questions are read from the NDJSON stream endpoint on a daemon thread
+    while the player is answering, so the game never waits on the network
+    between rounds and the first question is playable as soon as its line
+    arrives. Servers without the stream endpoint are asked for batches
+    instead. With `total=None` questions keep coming for as long as the game
+    runs, or until `exhausted` is set because the server has no new ones.
+    """
+
+    MAX_BATCH_SIZE = 50  # Server-side cap on the `limit` parameter
+    MAX_STALE_BATCHES = 3  # Batches without a new question before giving up
+    _DONE = object()
+
+    def __init__(self, api: BijbelQuizAPI, category: Optional[str] = None, difficulty: Optional[int] = None,
+                 total: Optional[int] = None, buffer_size: int = 10):
+        self.api = api
+        self.category = category
+        self.difficulty = difficulty
+        self.total = total
+        self.batch_size = max(1, min(buffer_size, self.MAX_BATCH_SIZE))
+        self.error = None
+        self.exhausted = False
+        self._queue = queue.Queue(maxsize=max(1, buffer_size))
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="question-prefetcher", daemon=True)
+
+    @property
+    def buffered(self) -> int:
+        """Number of questions currently waiting in the buffer."""
+        return self._queue.qsize()
+
+    def start(self):
+        """Start filling the buffer in the background."""
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the producer thread."""
+        self._stop.set()
+
+    def _put(self, item) -> bool:
+        """Block until there is room in the buffer. Returns False once stopped."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            if not self._stream():
+                self._fetch_batches()
+        except Exception as e:
+            self.error = e
+        finally:
+            self._put(self._DONE)
+
+    def _stream(self) -> bool:
+        """Fill the buffer from the stream endpoint. Returns False if the server has none.
+
+        An endless game opens a new stream each time the corpus runs out.
+        """
+        produced = 0
+        while not self._stop.is_set() and (self.total is None or produced < self.total):
+            limit = None if self.total is None else self.total - produced
+            questions = self.api.iter_questions(category=self.category, difficulty=self.difficulty, limit=limit)
+            received = 0
+            try:
+                for question_data in questions:
+                    received += 1
+                    if not self._put(question_data):
+                        return True
+                    produced += 1
+            except (APIError, InvalidResponseError):
+                if produced or received:
+                    raise
+                return False
+            finally:
+                questions.close()
+            if not received or self.total is not None:
+                break
+        return True
+
+    @staticmethod
+    def _key(question_data: dict):
+        return question_data.get('id') or question_data.get('question')
+
+    def _fetch_batches(self):
+        """Fill the buffer from /questions batches, skipping questions already served.
+
+        That endpoint has no paging, so an endless game only gets new
+        questions from a server that picks them at random. It starts over
+        once every matching question has been served; if batches stop
+        bringing new questions before that, it ends with `exhausted` set
+        rather than replaying the same batch.
+        """
+        produced = 0
+        stale = 0
+        seen = set()
+        while not self._stop.is_set() and (self.total is None or produced < self.total):
+            wanted = self.batch_size if self.total is None else min(self.batch_size, self.total - produced)
+            # Ask for the served questions too, so a server that always returns
+            # the first matches still has new ones in the batch
+            limit = min(self.MAX_BATCH_SIZE, len(seen) + wanted)
+            result = self.api.get_questions(category=self.category, limit=limit, difficulty=self.difficulty)
+            batch = result.get('questions') or []
+            fresh = [q for q in batch if self._key(q) not in seen]
+            if not fresh:
+                # The server has nothing new for us. A fixed-length game ends here.
+                if not batch or self.total is not None:
+                    break
+                total_matching = result.get('total_matching')
+                if total_matching is not None and len(seen) >= total_matching:
+                    seen.clear()
+                    fresh = batch
+                else:
+                    stale += 1
+                    if stale >= self.MAX_STALE_BATCHES:
+                        self.exhausted = True
+                        break
+                    continue
+            stale = 0
+            for question_data in fresh:
+                if self.total is not None and produced >= self.total:
+                    break
+                seen.add(self._key(question_data))
+                if not self._put(question_data):
+                    return
+                produced += 1
+
+    def get(self) -> Optional[dict]:
+        """Return the next question, or None when no more questions will arrive."""
+        item = self._queue.get()
+        if item is self._DONE:
+            # Leave the marker in place so later calls also see the end.
+            self._queue.put(item)
+            if self.error is not None:
+                raise self.error
+            return None
+        return item
 
 
 class QuizGame:
     """Interactive quiz game."""
     
-    def __init__(self, api: BijbelQuizAPI):
+    def __init__(self, api: BijbelQuizAPI, journal: Optional[StarJournal] = None):
         self.api = api
+        self.journal = journal
         self.score = 0
         self.total_questions = 0
         self.correct_answers = 0
@@ -214,20 +1651,9 @@ class QuizGame:
             
         return question
         
-    def play_round(self, question_data: dict) -> bool:
-        """Play a single question round."""
-        question = self.display_question(question_data)
-        
-        # Get user choice
-        valid_choices = [str(i) for i in range(1, len(question.allOptions) + 1)]
-        choice = self.get_user_input(f"\nEnter your choice (1-{len(question.allOptions)}): ", valid_choices)
-        
-        user_answer_index = int(choice) - 1
-        user_answer = question.allOptions[user_answer_index]
-        correct_answer = question.correctAnswer
-        
-        # Check if answer is correct
-        is_correct = user_answer_index == question.correctAnswerIndex
+    def grade(self, question: QuizQuestion, answer_index: int) -> tuple:
+        """Score an answer and update the game totals. Returns (is_correct, points, stars)."""
+        is_correct = answer_index == question.correctAnswerIndex
         
         # Convert difficulty to int to avoid string multiplication error
         difficulty = int(question.difficulty) if isinstance(question.difficulty, str) else question.difficulty
@@ -242,6 +1668,21 @@ class QuizGame:
             self.correct_answers += 1
             self.score += points
             self.stars_earned += stars_earned
+        return is_correct, points, stars_earned
+        
+    def play_round(self, question_data: dict) -> bool:
+        """Play a single question round."""
+        question = self.display_question(question_data)
+        
+        # Get user choice
+        valid_choices = [str(i) for i in range(1, len(question.allOptions) + 1)]
+        choice = self.get_user_input(f"\nEnter your choice (1-{len(question.allOptions)}): ", valid_choices)
+        
+        user_answer_index = int(choice) - 1
+        user_answer = question.allOptions[user_answer_index]
+        correct_answer = question.correctAnswer
+        
+        is_correct, points, stars_earned = self.grade(question, user_answer_index)
             
         # Show result
         self.clear_screen()
@@ -264,6 +1705,21 @@ class QuizGame:
         
         return is_correct
         
+    def award_stars(self) -> Optional[dict]:
+        """Add the stars earned this game to the balance.
+
+        With a journal the update is queued and sent in the background, so
+        nothing is lost if the API is unreachable, and None is returned.
+        Otherwise the API's response is returned.
+        """
+        if self.stars_earned <= 0:
+            return None
+        reason = f"Quiz game completed - {self.correct_answers}/{self.total_questions} correct"
+        if self.journal is not None:
+            self.journal.add_stars(self.stars_earned, reason)
+            return None
+        return self.api.add_stars(self.stars_earned, reason)
+        
     def end_game(self):
         """End the game and show final results."""
         self.clear_screen()
@@ -279,12 +1735,12 @@ class QuizGame:
         print(f"   • Stars earned: {self.stars_earned}")
         
         # Award stars via API
-        if self.stars_earned > 0:
+        if self.stars_earned > 0 and self.journal is not None:
+            self.award_stars()
+            print(f"   • Stars queued for your balance")
+        elif self.stars_earned > 0:
             try:
-                result = self.api.add_stars(
-                    self.stars_earned,
-                    f"Quiz game completed - {self.correct_answers}/{self.total_questions} correct"
-                )
+                result = self.award_stars()
                 if result.get('success'):
                     print(f"   • New star balance: {result.get('balance', 'Unknown')}")
                 else:
@@ -294,37 +1750,57 @@ class QuizGame:
                 
         print("\nThank you for playing! 🙏")
         
-    def start(self, category: str = None, difficulty: int = None, num_questions: int = 10):
+    def start(self, category: str = None, difficulty: int = None, num_questions: int = 10,
+              endless: bool = False, buffer_size: int = 10):
         """Start the quiz game."""
         print("Starting BijbelQuiz game...")
         print("Press Ctrl+C at any time to quit.")
+
+        # Start fetching questions right away so they are ready when the game begins
+        prefetcher = QuestionPrefetcher(
+            self.api,
+            category=category,
+            difficulty=difficulty,
+            total=None if endless else num_questions,
+            buffer_size=buffer_size,
+        ).start()
         time.sleep(2)
         
         self.start_time = time.time()
         
         try:
-            # Get questions from API
             print("Loading questions...")
-            result = self.api.get_questions(category=category, limit=num_questions, difficulty=difficulty)
+            question_data = prefetcher.get()
             
-            if 'questions' not in result or not result['questions']:
+            if question_data is None:
                 print("❌ No questions available. Please check your API connection and try again.")
                 return
                 
-            questions = result['questions']
-            print(f"✅ Loaded {len(questions)} questions!")
+            ready = prefetcher.buffered + 1
+            if endless:
+                print(f"✅ Endless mode: {ready} questions ready, more keep loading while you play!")
+            elif ready < num_questions:
+                print(f"✅ {ready} of {num_questions} questions ready, the rest load while you play!")
+            else:
+                print(f"✅ Loaded {num_questions} questions!")
             time.sleep(1)
             
-            # Play each question
-            for i, question_data in enumerate(questions, 1):
+            # Play until the prefetcher runs out of questions
+            i = 0
+            while question_data is not None:
+                i += 1
                 if not self.play_round(question_data):
                     # Allow user to continue or quit on wrong answer
-                    if i < len(questions):
+                    if endless or i < num_questions:
                         continue_game = self.get_user_input(
                             "\nContinue playing? (y/n): ", ['y', 'n', 'yes', 'no']
                         )
                         if continue_game in ['n', 'no']:
                             break
+                question_data = prefetcher.get()
+
+            if prefetcher.exhausted:
+                print("\nℹ️ The server has no new questions left for this game.")
                             
             # End game
             self.end_game()
@@ -335,6 +1811,495 @@ class QuizGame:
         except Exception as e:
             print(f"\n❌ Error during game: {e}")
             print("Please check your API connection and try again.")
+        finally:
+            prefetcher.stop()
+
+
+class AnswerStrategy:
+    """Picks answers for headless games.
+
+    `spec` is one of `correct`, `random`, `accuracy:PCT` (correct with
+    probability PCT percent, otherwise a random wrong option) or
+    `file:PATH`. An answers file holds one answer per line, either the
+    1-based option number or the answer text; it is replayed from the top
+    when it runs out.
+    """
+
+    def __init__(self, spec: str, seed: Optional[int] = None):
+        self.spec = spec
+        self.rng = random.Random(seed)
+        kind, _, value = spec.partition(":")
+        self.kind = kind
+        self.accuracy = 1.0
+        self.answers = []
+        self._next_answer = 0
+        if kind == "accuracy":
+            try:
+                self.accuracy = float(value.rstrip("%")) / 100
+            except ValueError:
+                raise ValueError(f"Invalid accuracy in answer strategy {spec!r}") from None
+            if not 0 <= self.accuracy <= 1:
+                raise ValueError(f"Accuracy must be between 0 and 100, got {value!r}")
+        elif kind == "file":
+            with open(value, "r", encoding="utf-8") as f:
+                self.answers = [line.strip() for line in f if line.strip()]
+            if not self.answers:
+                raise ValueError(f"Answers file {value} is empty")
+        elif kind not in ("correct", "random") or value:
+            raise ValueError(f"Unknown answer strategy {spec!r}; use correct, random, accuracy:PCT or file:PATH")
+
+    def choose(self, question: QuizQuestion) -> int:
+        """Return the 0-based index of the option to answer."""
+        options = question.allOptions
+        if self.kind == "random":
+            return self.rng.randrange(len(options))
+        if self.kind == "file":
+            answer = self.answers[self._next_answer % len(self.answers)]
+            self._next_answer += 1
+            if answer.isdigit() and 1 <= int(answer) <= len(options):
+                return int(answer) - 1
+            return options.index(answer) if answer in options else -1
+        if self.kind == "accuracy" and self.rng.random() >= self.accuracy:
+            wrong = [i for i in range(len(options)) if i != question.correctAnswerIndex]
+            return self.rng.choice(wrong) if wrong else question.correctAnswerIndex
+        return question.correctAnswerIndex
+
+
+class HeadlessQuizRunner:
+    """Plays complete quiz games back to back without a terminal.
+
+    Every game loads its questions in one request, answers them with an
+    AnswerStrategy and adds the stars it earned with one direct
+    `stars/add` request, without prompts or pauses. The server's star
+    totals are read before and after the run so the stars that arrived can
+    be checked against the stars awarded.
+    """
+
+    def __init__(self, api: BijbelQuizAPI, strategy: AnswerStrategy, category: Optional[str] = None,
+                 difficulty: Optional[int] = None, questions_per_game: int = 10):
+        self.api = api
+        self.strategy = strategy
+        self.category = category
+        self.difficulty = difficulty
+        self.questions_per_game = questions_per_game
+
+    def play_game(self) -> QuizGame:
+        """Load and answer one game's questions. Returns the finished game."""
+        game = QuizGame(self.api)
+        result = self.api.get_questions(self.category, self.questions_per_game, self.difficulty)
+        for question_data in result.get("questions") or []:
+            question = QuizQuestion(**question_data)
+            game.grade(question, self.strategy.choose(question))
+        return game
+
+    def run(self, games: int) -> dict:
+        """Play `games` games and return a report."""
+        before = self.api.get_star_stats().get("stats", {})
+        played = questions = correct = stars = failed_games = failed_awards = 0
+        errors = {}
+
+        def count_error(error: BijbelQuizError):
+            message = describe_error(error)
+            errors[message] = errors.get(message, 0) + 1
+
+        started = time.perf_counter()
+        for _ in range(games):
+            try:
+                game = self.play_game()
+            except BijbelQuizError as e:
+                failed_games += 1
+                count_error(e)
+                continue
+            played += 1
+            questions += game.total_questions
+            correct += game.correct_answers
+            try:
+                game.award_stars()
+                stars += game.stars_earned
+            except BijbelQuizError as e:
+                failed_awards += 1
+                count_error(e)
+        elapsed = time.perf_counter() - started
+
+        after = self.api.get_star_stats().get("stats", {})
+        delta = {key: after.get(key, 0) - before.get(key, 0)
+                 for key in ("currentBalance", "totalEarned", "totalSpent", "totalTransactions")}
+        return {
+            "strategy": self.strategy.spec,
+            "games": played,
+            "failed_games": failed_games,
+            "failed_awards": failed_awards,
+            "errors": errors,
+            "questions": questions,
+            "correct": correct,
+            "accuracy": round(correct / questions, 4) if questions else 0.0,
+            "stars_awarded": stars,
+            "duration_s": round(elapsed, 3),
+            "games_per_second": round(played / elapsed, 2) if elapsed > 0 else 0.0,
+            "server_before": before,
+            "server_after": after,
+            "server_delta": delta,
+        }
+
+
+def print_soak_report(report: dict):
+    """Print a headless game report."""
+    print(f"Strategy: {report['strategy']} | Games: {report['games']} ({report['failed_games']} failed) "
+          f"in {report['duration_s']}s = {report['games_per_second']} games/s")
+    print(f"Questions: {report['questions']} | Correct: {report['correct']} ({report['accuracy'] * 100:.1f}%) | "
+          f"Stars awarded: {report['stars_awarded']} ({report['failed_awards']} award(s) rejected)")
+    for message, count in report["errors"].items():
+        print(f"  {count} x {message}")
+    after, delta = report["server_after"], report["server_delta"]
+    print(f"Server: balance {after.get('currentBalance')} ({delta['currentBalance']:+}), "
+          f"total earned {after.get('totalEarned')} ({delta['totalEarned']:+}), "
+          f"transactions {after.get('totalTransactions')} ({delta['totalTransactions']:+})")
+    if delta["totalEarned"] != report["stars_awarded"]:
+        print(f"Note: the server's total earned changed by {delta['totalEarned']}, "
+              f"not by the {report['stars_awarded']} stars awarded (other clients were active)")
+
+
+def percentile(sorted_values: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class LoadBenchmark:
+    """Load generator that drives a weighted mix of requests against the API."""
+
+    # name -> (method, endpoint, query params, JSON body)
+    ENDPOINTS = {
+        "health": ("GET", "health", None, None),
+        "questions": ("GET", "questions", {"limit": 10}, None),
+        "questions/<category>": ("GET", "questions/{category}", {"limit": 10}, None),
+        "progress": ("GET", "progress", None, None),
+        "stats": ("GET", "stats", None, None),
+        "settings": ("GET", "settings", None, None),
+        "stars/balance": ("GET", "stars/balance", None, None),
+        "stars/transactions": ("GET", "stars/transactions", {"limit": 50}, None),
+        "stars/stats": ("GET", "stars/stats", None, None),
+        "stars/add": ("POST", "stars/add", None, {"amount": 1, "reason": "bench"}),
+        "stars/spend": ("POST", "stars/spend", None, {"amount": 1, "reason": "bench"}),
+    }
+    DEFAULT_MIX = "questions=4,stats=2,progress=1,settings=1,stars/balance=1,stars/stats=1"
+
+    def __init__(self, api: BijbelQuizAPI, mix: dict, concurrency: int = 4,
+                 duration: Optional[float] = None, total_requests: Optional[int] = None,
+                 category: str = "Genesis"):
+        self.api = api
+        self.mix = mix
+        self.concurrency = max(1, concurrency)
+        self.duration = duration
+        self.total_requests = total_requests
+        self.category = category
+        # (endpoint name, latency ms, status or None, server processing ms or None, wire bytes, body bytes)
+        self.samples = []
+        self.elapsed = 0.0
+        self._issued = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def parse_mix(cls, spec: str) -> dict:
+        """Parse a mix specification like 'questions=4,stats=1' into weights."""
+        mix = {}
+        for part in spec.split(','):
+            name, _, weight = part.strip().partition('=')
+            if name not in cls.ENDPOINTS:
+                raise ValueError(f"Unknown endpoint {name!r}, choose from: {', '.join(cls.ENDPOINTS)}")
+            mix[name] = float(weight) if weight else 1.0
+        if not mix or sum(mix.values()) <= 0:
+            raise ValueError("Request mix must contain at least one endpoint with a positive weight")
+        return mix
+
+    def _next_slot(self, deadline: Optional[float]) -> bool:
+        """Claim the right to issue one more request."""
+        if deadline is not None and time.perf_counter() >= deadline:
+            return False
+        with self._lock:
+            if self.total_requests is not None and self._issued >= self.total_requests:
+                return False
+            self._issued += 1
+            return True
+
+    def _worker(self, deadline: Optional[float], samples: list):
+        names = list(self.mix)
+        weights = [self.mix[name] for name in names]
+        while self._next_slot(deadline):
+            name = random.choices(names, weights)[0]
+            method, endpoint, params, data = self.ENDPOINTS[name]
+            path = self.api._path(endpoint.format(category=urllib.parse.quote(self.category)), params)
+            body = json.dumps(data).encode('utf-8') if data is not None else None
+            started = time.perf_counter()
+            try:
+                status, _, _, payload = self.api._send(method, path, body)
+            except (OSError, http.client.HTTPException):
+                samples.append((name, (time.perf_counter() - started) * 1000, None, None, 0, 0))
+                continue
+            latency = (time.perf_counter() - started) * 1000
+            try:
+                server_ms = json.loads(payload.decode('utf-8')).get('processing_time_ms')
+            except (ValueError, AttributeError):
+                server_ms = None
+            samples.append((name, latency, status, server_ms, self.api._last_response.wire_size, len(payload)))
+
+    def run(self):
+        """Run the benchmark until the duration or request count is reached."""
+        deadline = time.perf_counter() + self.duration if self.duration else None
+        per_worker = [[] for _ in range(self.concurrency)]
+        threads = [threading.Thread(target=self._worker, args=(deadline, samples), daemon=True)
+                   for samples in per_worker]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.elapsed = time.perf_counter() - started
+        self.samples = [sample for samples in per_worker for sample in samples]
+        return self
+
+    def _summarize(self, samples: list) -> dict:
+        latencies = sorted(sample[1] for sample in samples)
+        server = sorted(sample[3] for sample in samples if isinstance(sample[3], (int, float)))
+        count = len(samples)
+        errors = sum(1 for sample in samples if sample[2] is None or sample[2] >= 400)
+        throttled = sum(1 for sample in samples if sample[2] == 429)
+        wire = sum(sample[4] for sample in samples)
+        body = sum(sample[5] for sample in samples)
+        return {
+            "requests": count,
+            "throughput_rps": round(count / self.elapsed, 2) if self.elapsed else 0.0,
+            "latency_ms": {
+                "p50": round(percentile(latencies, 50), 2),
+                "p95": round(percentile(latencies, 95), 2),
+                "p99": round(percentile(latencies, 99), 2),
+                "max": round(latencies[-1], 2) if latencies else 0.0,
+            },
+            "server_processing_ms": {
+                "p50": percentile(server, 50),
+                "p95": percentile(server, 95),
+                "p99": percentile(server, 99),
+                "max": server[-1] if server else 0,
+            },
+            "error_rate": round(errors / count, 4) if count else 0.0,
+            "rate_limited_rate": round(throttled / count, 4) if count else 0.0,
+            "bytes": {
+                "wire": wire,
+                "uncompressed": body,
+                "wire_per_request": round(wire / count) if count else 0,
+                "uncompressed_per_request": round(body / count) if count else 0,
+            },
+        }
+
+    def report(self) -> dict:
+        """Summarize the collected samples overall and per endpoint."""
+        by_endpoint = {}
+        for sample in self.samples:
+            by_endpoint.setdefault(sample[0], []).append(sample)
+        return {
+            "duration_s": round(self.elapsed, 3),
+            "concurrency": self.concurrency,
+            "total": self._summarize(self.samples),
+            "endpoints": {name: self._summarize(samples) for name, samples in sorted(by_endpoint.items())},
+        }
+
+
+def print_bench_report(report: dict):
+    """Print a benchmark report as a table."""
+    print(f"Duration: {report['duration_s']}s | Concurrency: {report['concurrency']}")
+    header = (f"{'endpoint':<22}{'reqs':>7}{'rps':>9}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}{'srv p50':>9}{'srv p95':>9}"
+              f"{'err%':>7}{'429%':>7}{'json B':>9}{'wire B':>9}")
+    print(header)
+    print("-" * len(header))
+    rows = list(report['endpoints'].items()) + [("TOTAL", report['total'])]
+    for name, summary in rows:
+        latency = summary['latency_ms']
+        server = summary['server_processing_ms']
+        print(f"{name:<22}{summary['requests']:>7}{summary['throughput_rps']:>9.1f}"
+              f"{latency['p50']:>9.1f}{latency['p95']:>9.1f}{latency['p99']:>9.1f}{latency['max']:>9.1f}"
+              f"{server['p50']:>9}{server['p95']:>9}"
+              f"{summary['error_rate'] * 100:>7.1f}{summary['rate_limited_rate'] * 100:>7.1f}"
+              f"{summary['bytes']['uncompressed_per_request']:>9}{summary['bytes']['wire_per_request']:>9}")
+    print("\nLatencies in milliseconds; 'srv' columns are the server's own processing_time_ms.")
+    total_bytes = report['total']['bytes']
+    if total_bytes['uncompressed']:
+        saved = 1 - total_bytes['wire'] / total_bytes['uncompressed']
+        print(f"Response bodies: {total_bytes['uncompressed'] / 1024:.1f} KiB of JSON, "
+              f"{total_bytes['wire'] / 1024:.1f} KiB on the wire ({saved * 100:.1f}% saved by compression); "
+              f"'json B'/'wire B' are bytes per request.")
+
+
+async def fetch_dashboard(url: str, api_key: str, concurrency: int, idle_timeout: float,
+                          rate_limiter: Optional[RateLimiter] = None) -> dict:
+    """Fetch the dashboard endpoints concurrently with a short-lived async client."""
+    async with AsyncBijbelQuizAPI(url, api_key, concurrency=concurrency, idle_timeout=idle_timeout,
+                                  rate_limiter=rate_limiter) as api:
+        return await api.dashboard()
+
+
+@dataclass
+class FleetHost:
+    """One device in a fleet query."""
+    url: str
+    api_key: Optional[str]
+
+    @property
+    def name(self) -> str:
+        return urllib.parse.urlsplit(self.url).netloc or self.url
+
+
+# Fleet query -> (AsyncBijbelQuizAPI method, key the data is nested under, table columns)
+FLEET_QUERIES = {
+    "health": ("health", None, ["status", "version"]),
+    "stats": ("get_stats", None, ["score", "currentStreak", "longestStreak", "incorrectAnswers"]),
+    "progress": ("get_progress", None, ["unlockedCount"]),
+    "stars-stats": ("get_star_stats", "stats", ["currentBalance", "totalEarned", "totalSpent", "totalTransactions"]),
+}
+
+
+def normalize_host_url(url: str) -> str:
+    """Accept a full base URL, or `host[:port]` for a device on the default port and /v1."""
+    if "://" not in url:
+        url = "http://" + (url if ":" in url else f"{url}:7777")
+    url = url.rstrip("/")
+    return url if urllib.parse.urlsplit(url).path else url + "/v1"
+
+
+def load_fleet_hosts(urls: Optional[list], api_keys: Optional[list], hosts_file: Optional[str],
+                     default_api_key: Optional[str]) -> list:
+    """Build the host list from --url/--api-key pairs and a hosts file.
+
+    `--api-key` values pair with `--url` values in order; a single key is
+    used for every URL. Hosts file lines are `URL [API_KEY]`, with `#`
+    comments. Hosts without a key of their own use `default_api_key`.
+    """
+    urls, api_keys = urls or [], api_keys or []
+    if len(api_keys) > 1 and len(api_keys) != len(urls):
+        raise ValueError(f"got {len(urls)} --url value(s) but {len(api_keys)} --api-key value(s)")
+    if len(api_keys) == 1:
+        default_api_key = api_keys[0]
+        api_keys = []
+
+    hosts = [FleetHost(normalize_host_url(url), api_keys[i] if api_keys else default_api_key)
+             for i, url in enumerate(urls)]
+    if hosts_file:
+        with open(hosts_file, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                fields = line.split("#", 1)[0].split()
+                if not fields:
+                    continue
+                if len(fields) > 2:
+                    raise ValueError(f"{hosts_file}:{line_no}: expected 'URL [API_KEY]'")
+                hosts.append(FleetHost(normalize_host_url(fields[0]),
+                                       fields[1] if len(fields) == 2 else default_api_key))
+    if not hosts:
+        raise ValueError("no hosts given; use --url or --hosts-file")
+    return hosts
+
+
+def describe_error(error: Exception) -> str:
+    """One-line description of a failed request, for tables and reports."""
+    if isinstance(error, APIError):
+        detail = error.data.get("error") if error.data else None
+        return f"HTTP {error.status}: {detail or error.reason}"
+    if isinstance(error, asyncio.TimeoutError):
+        return "timed out"
+    return str(error) or type(error).__name__
+
+
+async def query_fleet(hosts: list, query: str, concurrency: int = 64, timeout: float = 5.0) -> list:
+    """Run one read-only query against every host concurrently.
+
+    Each host gets its own short-lived async client. A host that does not
+    answer within `timeout` seconds (connecting included) counts as failed,
+    as does one that is rate limited; nothing is retried, so one sweep takes
+    about as long as the slowest host. Returns one result dict per host, in
+    host order.
+    """
+    method, nested, _ = FLEET_QUERIES[query]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def query_host(host: FleetHost) -> dict:
+        async with semaphore:
+            started = time.perf_counter()
+            api = AsyncBijbelQuizAPI(host.url, host.api_key, concurrency=1, timeout=timeout,
+                                     max_rate_limit_retries=0)
+            try:
+                data = await asyncio.wait_for(getattr(api, method)(), timeout)
+                error = None
+            except (BijbelQuizError, asyncio.TimeoutError, ValueError) as e:
+                data, error = None, e
+            finally:
+                await api.close()
+            entry = {"host": host.name, "url": host.url, "ok": error is None,
+                     "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+            if error is None:
+                entry["data"] = data.get(nested, data) if nested and isinstance(data, dict) else data
+            else:
+                entry["error"] = describe_error(error)
+            return entry
+
+    return list(await asyncio.gather(*(query_host(host) for host in hosts)))
+
+
+def fleet_report(query: str, results: list, elapsed: float) -> dict:
+    """Aggregate per-host fleet results: success counts, latency and column totals."""
+    columns = FLEET_QUERIES[query][2]
+    latencies = sorted(r["latency_ms"] for r in results if r["ok"])
+    totals = {}
+    for result in results:
+        if not result["ok"] or not isinstance(result.get("data"), dict):
+            continue
+        for column in columns:
+            value = result["data"].get(column)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                totals[column] = totals.get(column, 0) + value
+    return {
+        "query": query,
+        "hosts": len(results),
+        "ok": len(latencies),
+        "failed": len(results) - len(latencies),
+        "elapsed_s": round(elapsed, 3),
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "max": latencies[-1] if latencies else 0.0,
+        },
+        "totals": totals,
+        "results": results,
+    }
+
+
+def print_fleet_report(report: dict):
+    """Print a fleet report as a per-host table followed by a summary."""
+    columns = FLEET_QUERIES[report["query"]][2]
+    rows = []
+    for result in report["results"]:
+        data = result.get("data") if result["ok"] else None
+        values = [str(data.get(column, "")) if isinstance(data, dict) else "" for column in columns]
+        rows.append([result["host"], "ok" if result["ok"] else "FAIL", f"{result['latency_ms']:.1f}", *values,
+                     result.get("error", "")])
+    header = ["host", "status", "ms", *columns, "error"]
+    widths = [max(len(str(row[i])) for row in [header] + rows) for i in range(len(header))]
+    for row in [header] + rows:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)).rstrip())
+
+    latency = report["latency_ms"]
+    print(f"\n{report['ok']}/{report['hosts']} host(s) ok, {report['failed']} failed in {report['elapsed_s']:.2f}s; "
+          f"latency p50 {latency['p50']:.1f} ms, p95 {latency['p95']:.1f} ms, max {latency['max']:.1f} ms")
+    if report["totals"]:
+        print("Totals: " + ", ".join(f"{name} {round(value, 2)}" for name, value in report["totals"].items()))
+
+
+def open_journal(api: BijbelQuizAPI, path: str) -> Optional[StarJournal]:
+    """Open the star journal, or return None if another process is using it."""
+    journal = StarJournal(api, path)
+    if not journal.open():
+        print(f"Warning: star journal {path} is in use by another process", file=sys.stderr)
+        return None
+    return journal
 
 
 def print_json(data: dict):
@@ -342,10 +2307,75 @@ def print_json(data: dict):
     print(json.dumps(data, indent=2, ensure_ascii=False))
 
 
-def main():
+TRANSACTION_FIELDS = ("id", "timestamp", "type", "amount", "reason", "lessonId", "metadata")
+
+
+def write_transactions(transactions, fmt: str, out=None) -> int:
+    """Stream transactions to `out` as a JSON array, NDJSON or CSV.
+
+    Rows are written as they arrive so exports of any size run in constant
+    memory. Returns the number of transactions written.
+    """
+    out = out or sys.stdout
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(TRANSACTION_FIELDS)
+        for transaction in transactions:
+            row = [transaction.get(field) for field in TRANSACTION_FIELDS]
+            if row[-1] is not None:
+                row[-1] = json.dumps(row[-1], ensure_ascii=False)
+            writer.writerow(row)
+            count += 1
+    else:
+        return write_records(transactions, fmt, out)
+    out.flush()
+    return count
+
+
+def write_records(records, fmt: str, out=None) -> int:
+    """Stream records to `out` as a JSON array or NDJSON, in constant memory.
+
+    Returns the number of records written.
+    """
+    out = out or sys.stdout
+    count = 0
+    if fmt == "ndjson":
+        for record in records:
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    else:
+        out.write("[")
+        for record in records:
+            out.write(("," if count else "") + "\n  " + json.dumps(record, ensure_ascii=False))
+            count += 1
+        out.write("\n]\n" if count else "]\n")
+    out.flush()
+    return count
+
+
+def build_parser(global_options: bool = True) -> argparse.ArgumentParser:
+    """Build the command-line parser.
+
+    Without `global_options` only the commands are parsed; the shell uses
+    that to read command lines against the options it was started with.
+    """
     parser = argparse.ArgumentParser(description="BijbelQuiz API CLI")
-    parser.add_argument("--url", default="http://localhost:7777/v1", help="API base URL")
-    parser.add_argument("--api-key", required=True, help="API key for authentication")
+    if global_options:
+        parser.add_argument("--url", default="http://localhost:7777/v1", help="API base URL")
+        parser.add_argument("--api-key", help="API key for authentication (required except for fleet --hosts-file with keys)")
+        parser.add_argument("--pool-size", type=int, default=4, help="Maximum idle keep-alive connections to keep (default: 4)")
+        parser.add_argument("--idle-timeout", type=float, default=30.0, help="Seconds before an idle connection is discarded (default: 30)")
+        parser.add_argument("--journal", default=StarJournal.DEFAULT_PATH, help=f"Star journal file for queued star updates (default: {StarJournal.DEFAULT_PATH})")
+        parser.add_argument("--no-journal", action="store_true", help="Send game stars directly instead of through the journal")
+        parser.add_argument("--rate-limit", type=int, default=100, help="Client-side request limit per minute, matching the server (default: 100, 0 to disable)")
+        parser.add_argument("--retries", type=int, default=3, help="Retries for failed idempotent requests, with exponential backoff (default: 3, 0 to disable)")
+        parser.add_argument("--retry-backoff", type=float, default=0.5, help="Initial retry backoff in seconds, doubled on each retry (default: 0.5)")
+        parser.add_argument("--circuit-breaker", type=int, default=5, help="Consecutive failures before failing fast until /health recovers (default: 5, 0 to disable)")
+        parser.add_argument("--circuit-reset", type=float, default=10.0, help="Seconds to fail fast before probing /health again (default: 10)")
+        parser.add_argument("--no-compression", action="store_true", help="Do not ask the server for gzip-compressed responses")
+        parser.add_argument("--cache", action="store_true", help="Briefly cache settings, progress, stats and star balance responses")
+        parser.add_argument("--trace", metavar="FILE", help="Record per-request timings as Chrome trace-event JSON and print a latency summary on exit")
 
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
@@ -357,6 +2387,11 @@ def main():
     questions_parser.add_argument("--category", help="Filter by category")
     questions_parser.add_argument("--limit", type=int, default=10, help="Number of questions")
     questions_parser.add_argument("--difficulty", type=int, choices=range(1, 6), help="Difficulty level (1-5)")
+    questions_parser.add_argument("--ids", help="Comma separated question ids to look up (ignores the filters)")
+    questions_parser.add_argument("--all", action="store_true",
+                                  help="Stream every matching question from the stream endpoint (ignores --limit)")
+    questions_parser.add_argument("--format", choices=["json", "ndjson"], default="json",
+                                  help="Output format for --all (default: json)")
 
     # Progress command
     subparsers.add_parser("progress", help="Get user progress")
@@ -369,12 +2404,38 @@ def main():
     game_parser.add_argument("--category", help="Filter by category")
     game_parser.add_argument("--difficulty", type=int, choices=range(1, 6), help="Difficulty level (1-5)")
     game_parser.add_argument("--questions", type=int, default=10, help="Number of questions to play (default: 10)")
+    game_parser.add_argument("--endless", action="store_true", help="Keep streaming new questions until you quit")
+    game_parser.add_argument("--buffer-size", type=int, default=10, help="Number of upcoming questions to prefetch (default: 10)")
+    game_parser.add_argument("--headless", action="store_true", help="Play without a terminal: no prompts, no pauses and no --rate-limit pacing")
+    game_parser.add_argument("--games", type=int, default=1, help="Games to play back to back with --headless (default: 1)")
+    game_parser.add_argument("--strategy", default="correct",
+                             help="Answers for --headless: correct, random, accuracy:PCT or file:PATH (default: correct)")
+    game_parser.add_argument("--seed", type=int, help="Random seed for the random and accuracy strategies")
+    game_parser.add_argument("--json", action="store_true", help="Print the --headless report as JSON")
+    game_parser.set_defaults(subparser=game_parser)
 
     # Settings command
     subparsers.add_parser("settings", help="Get app settings")
 
+    # Dashboard command
+    dashboard_parser = subparsers.add_parser("dashboard", help="Fetch stats, progress and star data concurrently")
+    dashboard_parser.add_argument("--concurrency", type=int, default=4, help="Maximum concurrent requests (default: 4)")
+
+    # Bench command
+    bench_parser = subparsers.add_parser("bench", help="Load-test the API and report latency percentiles")
+    bench_parser.add_argument("--concurrency", type=int, default=4, help="Number of concurrent workers (default: 4)")
+    bench_parser.add_argument("--duration", type=float, help="Run for this many seconds (default: 10 unless --requests is given)")
+    bench_parser.add_argument("--requests", type=int, help="Stop after this many requests")
+    bench_parser.add_argument("--mix", default=LoadBenchmark.DEFAULT_MIX,
+                              help=f"Weighted request mix, e.g. 'questions=4,stats=1' (default: {LoadBenchmark.DEFAULT_MIX}). "
+                                   f"Endpoints: {', '.join(LoadBenchmark.ENDPOINTS)}")
+    bench_parser.add_argument("--category", default="Genesis", help="Category used for questions/<category> (default: Genesis)")
+    bench_parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    bench_parser.set_defaults(subparser=bench_parser)
+
     # Stars subcommands
     stars_parser = subparsers.add_parser("stars", help="Star management commands")
+    stars_parser.set_defaults(subparser=stars_parser)
     stars_subparsers = stars_parser.add_subparsers(dest="stars_command", help="Star commands")
 
     # Stars balance
@@ -385,90 +2446,372 @@ def main():
     add_parser.add_argument("amount", type=int, help="Amount of stars to add")
     add_parser.add_argument("reason", help="Reason for adding stars")
     add_parser.add_argument("--lesson-id", help="Lesson ID")
+    add_parser.add_argument("--queue", action="store_true", help="Queue in the star journal and send in the background")
+    add_parser.add_argument("--idempotency-key", help="Key that makes retries of this request safe (default: random)")
 
     # Stars spend
     spend_parser = stars_subparsers.add_parser("spend", help="Spend stars")
     spend_parser.add_argument("amount", type=int, help="Amount of stars to spend")
     spend_parser.add_argument("reason", help="Reason for spending stars")
     spend_parser.add_argument("--lesson-id", help="Lesson ID")
+    spend_parser.add_argument("--queue", action="store_true", help="Queue in the star journal and send in the background")
+    spend_parser.add_argument("--idempotency-key", help="Key that makes retries of this request safe (default: random)")
 
     # Stars transactions
     transactions_parser = stars_subparsers.add_parser("transactions", help="Get star transactions")
     transactions_parser.add_argument("--limit", type=int, default=50, help="Number of transactions")
     transactions_parser.add_argument("--type", choices=["earned", "spent", "lesson_reward", "refund"], help="Filter by transaction type")
     transactions_parser.add_argument("--lesson-id", help="Filter by lesson ID")
+    transactions_parser.add_argument("--all", action="store_true", help="Fetch every transaction, following pagination cursors")
+    transactions_parser.add_argument("--page-size", type=int, default=1000, help="Transactions per request with --all (default: 1000)")
+    transactions_parser.add_argument("--format", choices=["json", "ndjson", "csv"], default="json", help="Output format (default: json)")
 
     # Stars stats
     stars_subparsers.add_parser("stats", help="Get star statistics")
 
-    args = parser.parse_args()
+    # Stars flush
+    stars_subparsers.add_parser("flush", help="Send star updates left in the journal by earlier runs")
 
-    if not args.command:
-        parser.print_help()
-        sys.exit(1)
+    # Fleet command
+    fleet_parser = subparsers.add_parser("fleet", help="Query many API instances concurrently and aggregate the results")
+    fleet_parser.add_argument("query", choices=list(FLEET_QUERIES), help="What to fetch from every host")
+    fleet_parser.add_argument("--url", dest="fleet_urls", action="append", metavar="URL",
+                              help="Host base URL, host or host:port (repeatable)")
+    fleet_parser.add_argument("--api-key", dest="fleet_api_keys", action="append", metavar="KEY",
+                              help="API key for the --url in the same position, or one key for all (repeatable)")
+    fleet_parser.add_argument("--hosts-file", help="File with one 'URL [API_KEY]' per line")
+    fleet_parser.add_argument("--concurrency", type=int, default=64, help="Hosts queried at once (default: 64)")
+    fleet_parser.add_argument("--timeout", type=float, default=5.0, help="Seconds before a host counts as failed (default: 5)")
+    fleet_parser.add_argument("--json", action="store_true", help="Print the aggregated report as JSON")
+    fleet_parser.set_defaults(subparser=fleet_parser)
 
-    api = BijbelQuizAPI(args.url, args.api_key)
+    if global_options:
+        # Shell command (not available inside the shell itself)
+        shell_parser = subparsers.add_parser("shell", help="Run commands against one warm client, interactively or from a file")
+        shell_parser.add_argument("--batch", metavar="FILE", help="Run the commands in FILE ('-' for stdin) and print per-command timings")
+        shell_parser.add_argument("--stop-on-error", action="store_true", help="Stop a batch at the first failing command")
 
-    try:
-        if args.command == "health":
-            result = api.health()
-            print_json(result)
+    return parser
+
+
+class CLISession:
+    """The warm client shared by the commands of one CLI process.
 
-        elif args.command == "questions":
-            result = api.get_questions(args.category, args.limit, args.difficulty)
+    A single command and a whole shell session alike use one connection
+    pool, response cache, rate limiter and circuit breaker, and open the
+    star journal at most once.
+    """
+
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.tracer = RequestTracer() if args.trace else None
+        rate_limiter = RateLimiter(max_requests=args.rate_limit) if args.rate_limit > 0 else None
+        retry_policy = RetryPolicy(max_retries=args.retries, initial_backoff=args.retry_backoff) if args.retries > 0 else None
+        circuit_breaker = (CircuitBreaker(failure_threshold=args.circuit_breaker, reset_timeout=args.circuit_reset)
+                           if args.circuit_breaker > 0 else None)
+        self.api = BijbelQuizAPI(args.url, args.api_key, pool_size=args.pool_size, idle_timeout=args.idle_timeout,
+                                 rate_limiter=rate_limiter, tracer=self.tracer, retry_policy=retry_policy,
+                                 circuit_breaker=circuit_breaker, cache=ResponseCache() if args.cache else None,
+                                 compression=not args.no_compression)
+        self.journal = None
+
+    def open_journal(self) -> Optional[StarJournal]:
+        """Open the star journal on first use, or return None if another process has it."""
+        if self.journal is None:
+            self.journal = open_journal(self.api, self.args.journal)
+        return self.journal
+
+    def close(self):
+        """Flush the journal, close the client and write the trace, if any."""
+        if self.journal is not None:
+            left = self.journal.close()
+            if left:
+                print(f"{left} star update(s) saved in {self.journal.path}; they will be sent on the next run", file=sys.stderr)
+        self.api.close()
+        if self.tracer is not None:
+            self.tracer.write(self.args.trace)
+            self.tracer.print_summary()
+            print(f"Trace written to {self.args.trace}", file=sys.stderr)
+
+
+def run_command(session: CLISession, args: argparse.Namespace):
+    """Run one parsed command against the session's client."""
+    api = session.api
+    if args.command == "health":
+        result = api.health()
+        print_json(result)
+
+    elif args.command == "questions":
+        if args.all:
+            write_records(api.iter_questions(args.category, args.difficulty), args.format)
+        else:
+            if args.ids:
+                result = api.get_questions_by_ids(args.ids.split(","))
+            else:
+                result = api.get_questions(args.category, args.limit, args.difficulty)
             print_json(result)
 
-        elif args.command == "progress":
-            result = api.get_progress()
+    elif args.command == "progress":
+        result = api.get_progress()
+        print_json(result)
+
+    elif args.command == "stats":
+        result = api.get_stats()
+        print_json(result)
+
+    elif args.command == "game" and args.headless:
+        try:
+            strategy = AnswerStrategy(args.strategy, args.seed)
+        except (OSError, ValueError) as e:
+            args.subparser.error(str(e))
+        # Games per second should measure the server, so the soak client skips
+        # the session's client-side pacing; the server's 429s are still honoured
+        soak_api = BijbelQuizAPI(args.url, args.api_key, pool_size=args.pool_size, idle_timeout=args.idle_timeout,
+                                 tracer=session.tracer, compression=not args.no_compression)
+        try:
+            runner = HeadlessQuizRunner(soak_api, strategy, category=args.category, difficulty=args.difficulty,
+                                        questions_per_game=min(args.questions, BijbelQuizAPI.MAX_QUESTIONS_LIMIT))
+            report = runner.run(args.games)
+        finally:
+            soak_api.close()
+        if args.json:
+            print_json(report)
+        else:
+            print_soak_report(report)
+
+    elif args.command == "game":
+        journal = None if args.no_journal else session.open_journal()
+        game = QuizGame(api, journal)
+        game.start(
+            category=args.category,
+            difficulty=args.difficulty,
+            num_questions=args.questions,
+            endless=args.endless,
+            buffer_size=args.buffer_size
+        )
+
+    elif args.command == "settings":
+        result = api.get_settings()
+        print_json(result)
+
+    elif args.command == "dashboard":
+        result = asyncio.run(fetch_dashboard(args.url, args.api_key, args.concurrency, args.idle_timeout,
+                                            api.rate_limiter))
+        print_json(result)
+
+    elif args.command == "bench":
+        try:
+            mix = LoadBenchmark.parse_mix(args.mix)
+        except ValueError as e:
+            args.subparser.error(str(e))
+        duration = args.duration if args.duration or args.requests else 10.0
+        # The benchmark measures the server as-is, so it bypasses client-side pacing and retries
+        bench_api = BijbelQuizAPI(args.url, args.api_key, pool_size=args.concurrency, idle_timeout=args.idle_timeout,
+                                  compression=not args.no_compression)
+        try:
+            benchmark = LoadBenchmark(bench_api, mix, concurrency=args.concurrency, duration=duration,
+                                      total_requests=args.requests, category=args.category).run()
+        finally:
+            bench_api.close()
+        report = benchmark.report()
+        if args.json:
+            print_json(report)
+        else:
+            print_bench_report(report)
+
+    elif args.command == "fleet":
+        try:
+            hosts = load_fleet_hosts(args.fleet_urls, args.fleet_api_keys, args.hosts_file, args.api_key)
+        except (OSError, ValueError) as e:
+            args.subparser.error(str(e))
+        started = time.perf_counter()
+        results = asyncio.run(query_fleet(hosts, args.query, args.concurrency, args.timeout))
+        report = fleet_report(args.query, results, time.perf_counter() - started)
+        if args.json:
+            print_json(report)
+        else:
+            print_fleet_report(report)
+        if report["failed"]:
+            sys.exit(1)
+
+    elif args.command == "stars":
+        if args.stars_command == "balance":
+            result = api.get_star_balance()
             print_json(result)
 
-        elif args.command == "stats":
-            result = api.get_stats()
+        elif args.stars_command in ("add", "spend") and args.queue:
+            journal = session.open_journal()
+            if journal is None:
+                sys.exit(1)
+            if args.stars_command == "add":
+                journal.add_stars(args.amount, args.reason, args.lesson_id)
+            else:
+                journal.spend_stars(args.amount, args.reason, args.lesson_id)
+            print_json({"queued": True, "pending": journal.pending_count, "journal": journal.path})
+
+        elif args.stars_command == "add":
+            result = api.add_stars(args.amount, args.reason, args.lesson_id, args.idempotency_key)
             print_json(result)
 
-        elif args.command == "game":
-            game = QuizGame(api)
-            game.start(
-                category=args.category,
-                difficulty=args.difficulty,
-                num_questions=args.questions
-            )
+        elif args.stars_command == "spend":
+            result = api.spend_stars(args.amount, args.reason, args.lesson_id, args.idempotency_key)
+            print_json(result)
 
-        elif args.command == "settings":
-            result = api.get_settings()
+        elif args.stars_command == "flush":
+            journal = session.open_journal()
+            if journal is None:
+                sys.exit(1)
+            flushed = journal.flush(timeout=60)
+            result = {"flushed": flushed, "pending": journal.pending_count, "failed": len(journal.failed)}
+            if journal.last_result is not None:
+                result["balance"] = journal.last_result.get("balance")
             print_json(result)
 
-        elif args.command == "stars":
-            if args.stars_command == "balance":
-                result = api.get_star_balance()
+        elif args.stars_command == "transactions":
+            if args.all:
+                write_transactions(api.iter_star_transactions(args.page_size, args.type, args.lesson_id), args.format)
+            elif args.format == "json":
+                result = api.get_star_transactions(args.limit, args.type, args.lesson_id)
                 print_json(result)
+            else:
+                result = api.get_star_transactions(args.limit, args.type, args.lesson_id)
+                write_transactions(result.get("transactions", []), args.format)
 
-            elif args.stars_command == "add":
-                result = api.add_stars(args.amount, args.reason, args.lesson_id)
-                print_json(result)
+        elif args.stars_command == "stats":
+            result = api.get_star_stats()
+            print_json(result)
 
-            elif args.stars_command == "spend":
-                result = api.spend_stars(args.amount, args.reason, args.lesson_id)
-                print_json(result)
+        else:
+            args.subparser.print_help()
 
-            elif args.stars_command == "transactions":
-                result = api.get_star_transactions(args.limit, args.type, args.lesson_id)
-                print_json(result)
 
-            elif args.stars_command == "stats":
-                result = api.get_star_stats()
-                print_json(result)
+def _prompt_lines(prompt: str):
+    """Yield lines typed at the shell prompt until EOF (Ctrl+D)."""
+    while True:
+        try:
+            yield input(prompt)
+        except KeyboardInterrupt:
+            print()
+        except EOFError:
+            print()
+            return
 
-            else:
-                stars_parser.print_help()
 
+def run_shell_line(session: CLISession, command_parser: argparse.ArgumentParser, line: str) -> bool:
+    """Parse and run one shell command line. Returns False if it failed."""
+    try:
+        line_args = command_parser.parse_args(shlex.split(line))
+    except ValueError as e:  # unbalanced quotes
+        print(f"Error: {e}", file=sys.stderr)
+        return False
+    except SystemExit as e:  # usage errors and --help
+        return not e.code
+    if not line_args.command:
+        command_parser.print_help()
+        return False
+
+    args = argparse.Namespace(**{**vars(session.args), **vars(line_args)})
+    try:
+        run_command(session, args)
+    except KeyboardInterrupt:
+        print("\nOperation cancelled", file=sys.stderr)
+        return False
+    except BijbelQuizError as e:
+        report_error(e)
+        return False
+    except SystemExit as e:
+        return not e.code
+    return True
+
+
+def run_shell(session: CLISession, batch: Optional[str] = None, stop_on_error: bool = False) -> int:
+    """Run commands against one warm client until EOF or `exit`.
+
+    Each line is a command as it would follow the global options on the
+    command line, e.g. `stars add 5 "Daily bonus"`. With `batch` the lines
+    are read from that file ('-' for stdin) instead of a prompt and a timing
+    summary is printed at the end. Returns the number of failed commands.
+    """
+    command_parser = build_parser(global_options=False)
+    if batch is None and not sys.stdin.isatty():
+        batch = "-"
+    if batch is None:
+        try:
+            import readline  # noqa: F401  (line editing and history for input())
+        except ImportError:
+            pass
+        print("BijbelQuiz shell. Type 'help' for commands, 'exit' or Ctrl+D to leave.")
+        lines = _prompt_lines("bijbelquiz> ")
+    elif batch == "-":
+        lines = sys.stdin
+    else:
+        lines = open(batch, "r", encoding="utf-8")
+
+    timings = []
+    failed = 0
+    try:
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line in ("exit", "quit"):
+                break
+            if line in ("help", "?"):
+                command_parser.print_help()
+                continue
+
+            started = time.perf_counter()
+            ok = run_shell_line(session, command_parser, line)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            timings.append(elapsed_ms)
+            if not ok:
+                failed += 1
+            sys.stdout.flush()
+            print(f"[{elapsed_ms:8.1f} ms] {'ok  ' if ok else 'FAIL'} {line}", file=sys.stderr)
+            if not ok and stop_on_error:
+                break
+    finally:
+        if lines is not sys.stdin and hasattr(lines, "close"):
+            lines.close()
+
+    if batch is not None and timings:
+        total = sum(timings)
+        print(f"{len(timings)} command(s), {failed} failed, {total:.1f} ms total, "
+              f"{total / len(timings):.1f} ms mean, {max(timings):.1f} ms slowest", file=sys.stderr)
+    return failed
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+    if not args.api_key and args.command != "fleet":
+        parser.error("the following arguments are required: --api-key")
+
+    session = CLISession(args)
+    try:
+        if args.command == "shell":
+            if run_shell(session, args.batch, args.stop_on_error):
+                sys.exit(1)
         else:
-            parser.print_help()
+            run_command(session, args)
 
     except KeyboardInterrupt:
         print("\nOperation cancelled", file=sys.stderr)
         sys.exit(1)
+    except BijbelQuizError as e:
+        report_error(e)
+        sys.exit(1)
+    except BrokenPipeError:
+        # Output was piped into a command that stopped reading (e.g. head)
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        session.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
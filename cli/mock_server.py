@@ -0,0 +1,766 @@
+#!/usr/bin/env python3
+"""
+BijbelQuiz API Mock Server
+
+A pure-Python stand-in for the app's local API (ApiService) that serves the
+bundled question assets and keeps star balances and transactions in memory.
+Use it to try out and load-test the CLI without running the Flutter app.
+"""
+
+import argparse
+import base64
+import binascii
+import gzip
+import hashlib
+import json
+import random
+import sys
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Optional
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "app" / "assets"
+QUESTION_FILES = {
+    "nl": ASSETS_DIR / "questions-nl-sv.json",
+    "en": ASSETS_DIR / "questions-en.json",
+}
+API_VERSION = "v1"
+MAX_REQUEST_SIZE = 1024 * 1024
+COMPRESSION_THRESHOLD = 1024  # bytes; smaller bodies are sent uncompressed, as in ApiService
+MAX_DAILY_STARS = 150
+MAX_TRANSACTIONS = 1000
+MAX_IDEMPOTENCY_ENTRIES = 1000
+IDEMPOTENCY_KEY_TTL = 24 * 60 * 60
+MAX_IDEMPOTENCY_KEY_LENGTH = 255
+VALID_DIFFICULTIES = ['1', '2', '3', '4', '5']
+MAX_QUESTION_IDS = 500
+STREAM_CHUNK_SIZE = 50  # questions per chunk on /questions/stream
+
+
+def load_questions(path: Path) -> list:
+    """Load a question file and normalise it to the API's English field names."""
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+
+    questions = []
+    for item in raw:
+        difficulty = item.get('moeilijkheidsgraad', item.get('difficulty'))
+        questions.append({
+            'id': str(item.get('id', '')),
+            'question': item.get('vraag', item.get('question', '')),
+            'correctAnswer': item.get('juisteAntwoord', item.get('correctAnswer', '')),
+            'incorrectAnswers': item.get('fouteAntwoorden', item.get('incorrectAnswers')) or [],
+            'difficulty': str(difficulty) if difficulty is not None else '',
+            'type': item.get('type') or 'mc',
+            'categories': item.get('categories') or [],
+            'biblicalReference': item.get('biblicalReference'),
+        })
+
+    # QuestionCacheService keeps its metadata sorted by difficulty
+    questions.sort(key=lambda q: int(q['difficulty']) if q['difficulty'].isdigit() else 3)
+    return questions
+
+
+def build_filter_index(questions: list) -> dict:
+    """Map (difficulty, category) to matching questions, with None as wildcard.
+
+    Mirrors the filter index in QuestionCacheService; every list keeps the
+    difficulty order of `questions`.
+    """
+    index = {}
+    for question in questions:
+        difficulty = question['difficulty'].lower()
+        for key_difficulty in (None, difficulty):
+            index.setdefault((key_difficulty, None), []).append(question)
+            for category in set(question['categories']):
+                if category:
+                    index.setdefault((key_difficulty, category), []).append(question)
+    return index
+
+
+def question_to_api(question: dict) -> dict:
+    """Serialise a question the way the questions endpoints do, with shuffled options."""
+    options = list(question['incorrectAnswers']) + [question['correctAnswer']]
+    random.shuffle(options)
+    return {
+        'id': question['id'],
+        'question': question['question'],
+        'correctAnswer': question['correctAnswer'],
+        'incorrectAnswers': question['incorrectAnswers'],
+        'difficulty': question['difficulty'],
+        'type': question['type'],
+        'categories': question['categories'],
+        'biblicalReference': question['biblicalReference'],
+        'allOptions': options,
+        'correctAnswerIndex': options.index(question['correctAnswer']),
+    }
+
+
+def encode_transaction_cursor(transaction: dict) -> str:
+    """Opaque cursor pointing just after ``transaction`` (same format as the app)."""
+    raw = json.dumps({'id': transaction['id'], 'ts': transaction['timestamp']}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_transaction_cursor(cursor: str):
+    """Return ``(id, timestamp)`` for a cursor, or None if it is malformed."""
+    try:
+        data = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return str(data['id']), datetime.fromisoformat(data['ts'])
+    except (binascii.Error, ValueError, KeyError, TypeError):
+        return None
+
+
+class IdempotencyEntry:
+    """A star mutation seen with an Idempotency-Key, and its stored response."""
+
+    def __init__(self, fingerprint: bytes):
+        self.fingerprint = fingerprint
+        self.created = time.monotonic()
+        self.done = threading.Event()
+        self.response = None  # (status, body bytes) once stored
+
+
+class MockState:
+    """In-memory app state: questions, stars, stats, progress and settings."""
+
+    def __init__(self, api_key: str, initial_stars: int = 0, max_requests_per_minute: int = 100,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, max_daily_stars: int = MAX_DAILY_STARS):
+        self.api_key = api_key
+        self.max_requests_per_minute = max_requests_per_minute
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.max_daily_stars = max_daily_stars  # 0 disables the daily limit
+        self.started_at = time.time()
+        self.lock = threading.Lock()
+
+        self.questions = {lang: load_questions(path) for lang, path in QUESTION_FILES.items() if path.exists()}
+        self.question_index = {lang: build_filter_index(questions) for lang, questions in self.questions.items()}
+        self.questions_by_id = {lang: {q['id']: q for q in questions} for lang, questions in self.questions.items()}
+
+        self.balance = initial_stars
+        self.total_earned = initial_stars
+        self.total_spent = 0
+        self.transactions = []  # newest first, like StarTransactionService
+        self.daily_stars_added = {}  # date -> total stars added
+        self.request_log = {}  # client ip -> request timestamps
+        self.idempotency = OrderedDict()  # "scope:key" -> IdempotencyEntry, oldest first
+        self._last_transaction_id = 0
+
+        self.stats = {'score': 0, 'currentStreak': 0, 'longestStreak': 0, 'incorrectAnswers': 0}
+        self.progress = {'unlockedCount': 1, 'bestStarsByLesson': {}}
+        self.settings = {
+            'themeMode': 'system',
+            'gameSpeed': 'medium',
+            'mute': False,
+            'analyticsEnabled': True,
+            'notificationEnabled': True,
+        }
+
+    def simulate_latency(self):
+        """Sleep for the configured server-side latency."""
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def check_rate_limit(self, client_ip: str) -> bool:
+        """Record a request and return False if the client exceeded the per-minute limit."""
+        now = time.monotonic()
+        with self.lock:
+            log = [t for t in self.request_log.get(client_ip, []) if now - t <= 60]
+            self.request_log[client_ip] = log
+            if len(log) >= self.max_requests_per_minute:
+                return False
+            log.append(now)
+            return True
+
+    def record_transaction(self, type_: str, amount: int, reason: str, lesson_id: Optional[str]) -> dict:
+        """Append a transaction (caller holds the lock)."""
+        # Millisecond timestamps like the app, kept unique under load
+        self._last_transaction_id = max(self._last_transaction_id + 1, int(time.time() * 1000))
+        transaction = {
+            'id': str(self._last_transaction_id),
+            'timestamp': datetime.now().isoformat(),
+            'type': type_,
+            'amount': amount,
+            'reason': reason,
+            'lessonId': lesson_id,
+            'metadata': None,
+        }
+        self.transactions.insert(0, transaction)
+        del self.transactions[MAX_TRANSACTIONS:]
+        return transaction
+
+    def transaction_stats(self) -> dict:
+        """Mirror StarTransactionService.getTransactionStats."""
+        now = datetime.now()
+
+        def since(delta):
+            cutoff = now - delta
+            return sum(1 for t in self.transactions if datetime.fromisoformat(t['timestamp']) > cutoff)
+
+        return {
+            'totalTransactions': len(self.transactions),
+            'currentBalance': self.balance,
+            'totalEarned': self.total_earned,
+            'totalSpent': self.total_spent,
+            'netTotal': self.total_earned - self.total_spent,
+            'transactionsLast24h': since(timedelta(hours=24)),
+            'transactionsLast7d': since(timedelta(days=7)),
+            'transactionsLast30d': since(timedelta(days=30)),
+            'averageTransactionAmount': (sum(abs(t['amount']) for t in self.transactions) / len(self.transactions)
+                                         if self.transactions else 0),
+        }
+
+
+class MockApiHandler(BaseHTTPRequestHandler):
+    """Request handler implementing the /v1 routes of ApiService."""
+
+    protocol_version = "HTTP/1.1"
+    server_version = "BijbelQuiz-API"
+    sys_version = ""
+    # Buffer each response so headers and body leave in one segment
+    wbufsize = 64 * 1024
+    disable_nagle_algorithm = True
+
+    state: MockState = None  # set by create_server()
+    quiet = True
+
+    # --- plumbing -------------------------------------------------------
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+    def _send_json(self, status: int, data: dict, extra_headers: Optional[dict] = None):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self._send_body(status, body, extra_headers)
+
+    def _accepts_gzip(self) -> bool:
+        for part in (self.headers.get('Accept-Encoding') or '').split(','):
+            coding, *params = [p.strip() for p in part.split(';')]
+            if coding in ('gzip', '*'):
+                return not any(p.startswith('q=') and p[2:] in ('0', '0.0', '0.00', '0.000') for p in params)
+        return False
+
+    def _send_body(self, status: int, body: bytes, extra_headers: Optional[dict] = None):
+        self.captured_response = (status, body)
+        if self._accepts_gzip():
+            extra_headers = {**(extra_headers or {}), 'Vary': 'Accept-Encoding'}
+            if len(body) >= COMPRESSION_THRESHOLD:
+                body = gzip.compress(body, compresslevel=6)
+                extra_headers['Content-Encoding'] = 'gzip'
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self._send_common_headers()
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    def _send_common_headers(self):
+        # Security headers and CORS, as added by the ApiService middleware
+        self.send_header('X-Content-Type-Options', 'nosniff')
+        self.send_header('X-Frame-Options', 'DENY')
+        self.send_header('X-XSS-Protection', '1; mode=block')
+        self.send_header('Referrer-Policy', 'strict-origin-when-cross-origin')
+        self.send_header('Content-Security-Policy', "default-src 'self'")
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, PUT, DELETE, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers',
+                         'Content-Type, Authorization, X-API-Key, Idempotency-Key, If-None-Match')
+        self.send_header('Access-Control-Expose-Headers', 'ETag')
+        self.send_header('Access-Control-Max-Age', '86400')
+
+    def _send_conditional(self, state: dict):
+        """Send `state` with a strong ETag, or 304 if the client already has it."""
+        digest = hashlib.sha1(json.dumps(state, separators=(',', ':'), ensure_ascii=False).encode('utf-8'))
+        etag = f'"{digest.hexdigest()}"'
+        cache_headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match and any(tag.strip() in ('*', etag, f'W/{etag}') for tag in if_none_match.split(',')):
+            self.captured_response = (304, b'')
+            self.send_response(304)
+            for name, value in cache_headers.items():
+                self.send_header(name, value)
+            self._send_common_headers()
+            self.end_headers()
+            return
+        self._send_json(200, {
+            **state,
+            'timestamp': datetime.now().isoformat(),
+            'processing_time_ms': self._processing_time_ms(),
+        }, cache_headers)
+
+    def _send_not_found(self):
+        body = b'Route not found'
+        self.send_response(404)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Content-Length', str(len(body)))
+        self._send_common_headers()
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status: int, error: str, message: str, **extra):
+        self._send_json(status, {
+            'error': error,
+            'message': message,
+            'timestamp': datetime.now().isoformat(),
+            **extra,
+        })
+
+    def _client_ip(self) -> str:
+        forwarded_for = self.headers.get('X-Forwarded-For')
+        if forwarded_for:
+            return forwarded_for.split(',')[0].strip()
+        return self.headers.get('X-Real-IP') or self.client_address[0]
+
+    def _authorized(self) -> bool:
+        auth = self.headers.get('Authorization', '')
+        provided = auth[7:] if auth.startswith('Bearer ') else self.headers.get('X-API-Key')
+        return provided is not None and provided == self.state.api_key
+
+    def _read_body(self) -> bytes:
+        if self.body is None:
+            length = int(self.headers.get('Content-Length') or 0)
+            self.body = self.rfile.read(length) if length else b''
+        return self.body
+
+    def _read_json(self) -> Optional[dict]:
+        body = self._read_body()
+        try:
+            payload = json.loads(body.decode('utf-8')) if body else None
+        except ValueError:
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    def _dispatch(self, method: str):
+        self.body = None
+        parsed = urllib.parse.urlsplit(self.path)
+        self.query = {k: v[-1] for k, v in urllib.parse.parse_qs(parsed.query).items()}
+        parts = [urllib.parse.unquote(p) for p in parsed.path.strip('/').split('/')]
+        if not parts or parts[0] != API_VERSION:
+            self._drain_body()
+            return self._send_not_found()
+        route = parts[1:]
+
+        # Middleware, in the order ApiService applies it
+        is_health = route == ['health']
+        if not is_health and self.state.max_requests_per_minute > 0 \
+                and not self.state.check_rate_limit(self._client_ip()):
+            self._drain_body()
+            return self._error(
+                429, 'Rate limit exceeded',
+                f'Too many requests. Maximum {self.state.max_requests_per_minute} requests per minute allowed.',
+                retry_after=60)
+        if not is_health and not self._authorized():
+            self._drain_body()
+            return self._error(
+                403, 'Invalid or missing API key',
+                'Please provide a valid API key via Authorization header (Bearer token) or X-API-Key header')
+        if int(self.headers.get('Content-Length') or 0) > MAX_REQUEST_SIZE:
+            self.close_connection = True
+            return self._error(413, 'Request too large', 'Request payload exceeds maximum allowed size of 1MB')
+
+        handler = self._route(method, route)
+        if handler is None:
+            self._drain_body()
+            return self._send_not_found()
+
+        self.start_time = time.perf_counter()
+        self.state.simulate_latency()
+        key = self.headers.get('Idempotency-Key')
+        if method == 'POST' and route[0] == 'stars' and key:
+            self._handle_idempotent('/'.join(route), key, handler)
+        else:
+            handler()
+
+    def _handle_idempotent(self, scope: str, key: str, handler):
+        """Run a star mutation at most once per Idempotency-Key, replaying the stored response."""
+        if len(key) > MAX_IDEMPOTENCY_KEY_LENGTH:
+            self._drain_body()
+            return self._error(400, 'Invalid idempotency key',
+                               f'Idempotency-Key must be at most {MAX_IDEMPOTENCY_KEY_LENGTH} characters')
+
+        state = self.state
+        body = self._read_body()
+        cache_key = f"{scope}:{key}"
+        with state.lock:
+            entry = state.idempotency.get(cache_key)
+            if entry is not None and time.monotonic() - entry.created > IDEMPOTENCY_KEY_TTL:
+                entry = None
+        if entry is not None:
+            if entry.fingerprint != body:
+                return self._error(422, 'Idempotency key reused',
+                                   'This Idempotency-Key was already used with a different request body')
+            # Wait for the original request if it is still being processed
+            entry.done.wait()
+            if entry.response is not None:
+                status, stored_body = entry.response
+                return self._send_body(status, stored_body, {'Idempotent-Replayed': 'true'})
+            # The original attempt was not stored (server error or rate limit), so process it again
+
+        entry = IdempotencyEntry(body)
+        with state.lock:
+            state.idempotency.pop(cache_key, None)
+            state.idempotency[cache_key] = entry
+            while len(state.idempotency) > MAX_IDEMPOTENCY_ENTRIES:
+                state.idempotency.popitem(last=False)
+        self.captured_response = None
+        try:
+            handler()
+        finally:
+            status = self.captured_response[0] if self.captured_response else 500
+            # Only outcomes that a retry would reproduce are kept for replay
+            if status < 500 and status != 429:
+                entry.response = self.captured_response
+            else:
+                with state.lock:
+                    if state.idempotency.get(cache_key) is entry:
+                        del state.idempotency[cache_key]
+            entry.done.set()
+
+    def _drain_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if 0 < length <= MAX_REQUEST_SIZE:
+            self.rfile.read(length)
+        elif length:
+            self.close_connection = True
+
+    def _route(self, method: str, route: list):
+        if method == 'GET':
+            if route == ['health']:
+                return self.handle_health
+            if route == ['questions']:
+                return self.handle_questions
+            if route == ['questions', 'stream']:
+                return self.handle_questions_stream
+            if len(route) == 2 and route[0] == 'questions':
+                return lambda: self.handle_questions(category=route[1])
+            if route == ['progress']:
+                return self.handle_progress
+            if route == ['stats']:
+                return self.handle_stats
+            if route == ['settings']:
+                return self.handle_settings
+            if route == ['stars', 'balance']:
+                return self.handle_star_balance
+            if route == ['stars', 'transactions']:
+                return self.handle_star_transactions
+            if route == ['stars', 'stats']:
+                return self.handle_star_stats
+        elif method == 'POST':
+            if route == ['stars', 'add']:
+                return self.handle_add_stars
+            if route == ['stars', 'spend']:
+                return self.handle_spend_stars
+        return None
+
+    def _processing_time_ms(self) -> int:
+        return int((time.perf_counter() - self.start_time) * 1000)
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def do_OPTIONS(self):
+        self._drain_body()
+        self._send_not_found()
+
+    # --- endpoints ------------------------------------------------------
+
+    def handle_health(self):
+        self._send_json(200, {
+            'status': 'healthy',
+            'timestamp': datetime.now().isoformat(),
+            'service': 'BijbelQuiz API',
+            'version': API_VERSION,
+            'uptime': 'running',
+        })
+
+    def handle_questions(self, category: Optional[str] = None):
+        if category is None and 'ids' in self.query:
+            return self.handle_questions_by_ids()
+        category = category or self.query.get('category')
+        difficulty = self.query.get('difficulty')
+        language = self.query.get('language', 'nl')
+        limit = self.query.get('limit', '10')
+        if not limit.isdigit() or not 1 <= int(limit) <= 50:
+            return self._error(400, 'Invalid limit parameter', 'Limit must be a number between 1 and 50',
+                               valid_range='1-50')
+        limit = int(limit)
+        if difficulty and difficulty.lower() not in VALID_DIFFICULTIES:
+            return self._error(400, 'Invalid difficulty parameter', 'Difficulty must be a number between 1 and 5',
+                               valid_values=VALID_DIFFICULTIES)
+
+        index = self.state.question_index.get(language, self.state.question_index.get('nl', {}))
+        matching = index.get((difficulty.lower() if difficulty else None, category or None), [])
+        questions = matching[:limit]
+
+        self._send_json(200, {
+            'questions': [question_to_api(q) for q in questions],
+            'count': len(questions),
+            'total_matching': len(matching),
+            'category': category,
+            'difficulty': difficulty,
+            'timestamp': datetime.now().isoformat(),
+            'processing_time_ms': self._processing_time_ms(),
+        })
+
+    def handle_questions_stream(self):
+        category = self.query.get('category')
+        difficulty = self.query.get('difficulty')
+        language = self.query.get('language', 'nl')
+        limit = self.query.get('limit')
+        if limit is not None and (not limit.isdigit() or int(limit) < 1):
+            return self._error(400, 'Invalid limit parameter', 'Limit must be a positive number')
+        if difficulty and difficulty.lower() not in VALID_DIFFICULTIES:
+            return self._error(400, 'Invalid difficulty parameter', 'Difficulty must be a number between 1 and 5',
+                               valid_values=VALID_DIFFICULTIES)
+
+        index = self.state.question_index.get(language, self.state.question_index.get('nl', {}))
+        matching = index.get((difficulty.lower() if difficulty else None, category or None), [])
+        questions = matching[:int(limit)] if limit else matching
+
+        # Newline-delimited JSON in chunked encoding, never compressed, so
+        # clients can handle each question as soon as its line arrives
+        self.captured_response = (200, b'')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.send_header('X-Total-Matching', str(len(matching)))
+        self._send_common_headers()
+        self.end_headers()
+        if self.command == 'HEAD':
+            return
+        for start in range(0, len(questions), STREAM_CHUNK_SIZE):
+            chunk = ''.join(json.dumps(question_to_api(q), ensure_ascii=False) + '\n'
+                            for q in questions[start:start + STREAM_CHUNK_SIZE]).encode('utf-8')
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+            self.wfile.flush()
+        self.wfile.write(b'0\r\n\r\n')
+
+    def handle_questions_by_ids(self):
+        language = self.query.get('language', 'nl')
+        ids = [i.strip() for i in self.query['ids'].split(',') if i.strip()]
+        if not 1 <= len(ids) <= MAX_QUESTION_IDS:
+            return self._error(400, 'Invalid ids parameter',
+                               f'ids must be a comma separated list of 1 to {MAX_QUESTION_IDS} question ids',
+                               valid_range=f'1-{MAX_QUESTION_IDS}')
+
+        by_id = self.state.questions_by_id.get(language, self.state.questions_by_id.get('nl', {}))
+        found = {}
+        for question_id in ids:
+            if question_id in by_id:
+                found.setdefault(question_id, by_id[question_id])
+        missing = list(dict.fromkeys(i for i in ids if i not in found))
+
+        self._send_json(200, {
+            'questions': [question_to_api(q) for q in found.values()],
+            'count': len(found),
+            'missing': missing,
+            'timestamp': datetime.now().isoformat(),
+            'processing_time_ms': self._processing_time_ms(),
+        })
+
+    def handle_progress(self):
+        with self.state.lock:
+            progress = dict(self.state.progress)
+        self._send_conditional(progress)
+
+    def handle_stats(self):
+        with self.state.lock:
+            # The app's star balance is the GameStatsProvider score
+            stats = {**self.state.stats, 'score': self.state.balance}
+        self._send_conditional(stats)
+
+    def handle_settings(self):
+        self._send_conditional(dict(self.state.settings))
+
+    def handle_star_balance(self):
+        self._send_json(200, {
+            'balance': self.state.balance,
+            'timestamp': datetime.now().isoformat(),
+            'processing_time_ms': self._processing_time_ms(),
+        })
+
+    def _read_star_payload(self):
+        payload = self._read_json() or {}
+        amount = payload.get('amount')
+        reason = payload.get('reason')
+        if not isinstance(amount, int) or isinstance(amount, bool) or amount <= 0:
+            self._error(400, 'Invalid amount', 'Amount must be a positive integer')
+            return None
+        if not isinstance(reason, str) or not reason:
+            self._error(400, 'Invalid reason', 'Reason is required and cannot be empty')
+            return None
+        return amount, reason, payload.get('lessonId')
+
+    def handle_add_stars(self):
+        parsed = self._read_star_payload()
+        if parsed is None:
+            return
+        amount, reason, lesson_id = parsed
+
+        state = self.state
+        with state.lock:
+            today = datetime.now().strftime('%Y-%m-%d')
+            daily_total = state.daily_stars_added.get(today, 0)
+            limit = state.max_daily_stars
+            if limit and daily_total + amount > limit:
+                return self._error(
+                    429, 'Daily star limit exceeded',
+                    f'Cannot add {amount} stars. Daily limit of {limit} stars exceeded.',
+                    current_daily_total=daily_total,
+                    requested_amount=amount,
+                    remaining_allowed=limit - daily_total)
+            state.balance += amount
+            state.total_earned += amount
+            state.record_transaction('earned', amount, reason, lesson_id)
+            state.daily_stars_added[today] = daily_total + amount
+            balance, daily_total = state.balance, state.daily_stars_added[today]
+
+        self._send_json(200, {
+            'success': True,
+            'balance': balance,
+            'amount_added': amount,
+            'reason': reason,
+            'daily_total_added': daily_total,
+            'timestamp': datetime.now().isoformat(),
+            'processing_time_ms': self._processing_time_ms(),
+        })
+
+    def handle_spend_stars(self):
+        parsed = self._read_star_payload()
+        if parsed is None:
+            return
+        amount, reason, lesson_id = parsed
+
+        state = self.state
+        with state.lock:
+            if state.balance < amount:
+                return self._error(400, 'Insufficient stars', 'Not enough stars in balance for this transaction',
+                                   current_balance=state.balance, requested_amount=amount)
+            state.balance -= amount
+            state.total_spent += amount
+            state.record_transaction('spent', -amount, reason, lesson_id)
+            balance = state.balance
+
+        self._send_json(200, {
+            'success': True,
+            'balance': balance,
+            'amount_spent': amount,
+            'reason': reason,
+            'timestamp': datetime.now().isoformat(),
+            'processing_time_ms': self._processing_time_ms(),
+        })
+
+    def handle_star_transactions(self):
+        limit = self.query.get('limit', '50')
+        type_filter = self.query.get('type')
+        lesson_id = self.query.get('lessonId')
+        cursor = self.query.get('cursor')
+        if not limit.isdigit() or not 1 <= int(limit) <= 1000:
+            return self._error(400, 'Invalid limit parameter', 'Limit must be a number between 1 and 1000',
+                               valid_range='1-1000')
+        limit = int(limit)
+        position = decode_transaction_cursor(cursor) if cursor else None
+        if cursor and position is None:
+            return self._error(400, 'Invalid cursor parameter',
+                               'Cursor must be a next_cursor value returned by a previous request')
+
+        with self.state.lock:
+            matching = list(self.state.transactions)
+        if type_filter:
+            matching = [t for t in matching if t['type'] == type_filter]
+        elif lesson_id:
+            matching = [t for t in matching if t['lessonId'] == lesson_id]
+
+        # Newest first; resume after the cursor, or after its timestamp if it was trimmed
+        start = 0
+        if position is not None:
+            after_id, after_ts = position
+            start = next((i + 1 for i, t in enumerate(matching) if t['id'] == after_id), None)
+            if start is None:
+                start = next((i for i, t in enumerate(matching) if datetime.fromisoformat(t['timestamp']) < after_ts),
+                             len(matching))
+        transactions = matching[start:start + limit]
+        has_more = start + len(transactions) < len(matching)
+
+        self._send_json(200, {
+            'transactions': transactions,
+            'count': len(transactions),
+            'type_filter': type_filter,
+            'lesson_filter': lesson_id,
+            'has_more': has_more,
+            'next_cursor': encode_transaction_cursor(transactions[-1]) if has_more and transactions else None,
+            'timestamp': datetime.now().isoformat(),
+            'processing_time_ms': self._processing_time_ms(),
+        })
+
+    def handle_star_stats(self):
+        with self.state.lock:
+            stats = self.state.transaction_stats()
+        self._send_json(200, {
+            'stats': stats,
+            'timestamp': datetime.now().isoformat(),
+            'processing_time_ms': self._processing_time_ms(),
+        })
+
+
+def create_server(host: str = "127.0.0.1", port: int = 7777, state: Optional[MockState] = None,
+                  quiet: bool = True) -> ThreadingHTTPServer:
+    """Create (but do not start) a threaded mock API server."""
+    handler = type('BoundMockApiHandler', (MockApiHandler,), {
+        'state': state or MockState(api_key='test'),
+        'quiet': quiet,
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BijbelQuiz API mock server")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to bind to (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=7777, help="Port to listen on (default: 7777)")
+    parser.add_argument("--api-key", default="test", help="API key clients must send (default: test)")
+    parser.add_argument("--initial-stars", type=int, default=0, help="Starting star balance (default: 0)")
+    parser.add_argument("--rate-limit", type=int, default=100, help="Requests per minute per client IP (default: 100, 0 to disable)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Added server-side latency per request in ms")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random extra latency of up to this many ms")
+    parser.add_argument("--daily-star-limit", type=int, default=MAX_DAILY_STARS,
+                        help=f"Stars that may be added per day, as in the app (default: {MAX_DAILY_STARS}, 0 to disable)")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    state = MockState(
+        api_key=args.api_key,
+        initial_stars=args.initial_stars,
+        max_requests_per_minute=args.rate_limit,
+        latency_ms=args.latency,
+        jitter_ms=args.jitter,
+        max_daily_stars=args.daily_star_limit,
+    )
+    server = create_server(args.host, args.port, state, quiet=not args.verbose)
+    counts = ', '.join(f"{lang}: {len(qs)}" for lang, qs in state.questions.items())
+    print(f"BijbelQuiz mock API listening on http://{args.host}:{args.port}/{API_VERSION} ({counts} questions)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down", file=sys.stderr)
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
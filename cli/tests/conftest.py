@@ -0,0 +1,76 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import bijbelquiz_cli  # noqa: E402
+import mock_server  # noqa: E402
+
+
+class FakeClock:
+    """Stands in for time.monotonic; tests move it forward with advance()."""
+
+    def __init__(self, start: float = 1000.0):
+        self.now = start
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(bijbelquiz_cli.time, 'monotonic', fake)
+    return fake
+
+
+class FakeTransport:
+    """Replaces BijbelQuizAPI._send with canned responses and records every request."""
+
+    def __init__(self, api, responses):
+        self.requests = []
+        self._responses = responses
+        api._send = self.send
+
+    def send(self, method, path, body=None, headers=None, timings=None):
+        self.requests.append((method, path, headers))
+        response = self._responses(method, path) if callable(self._responses) else self._responses.pop(0)
+        status, payload, *response_headers = response
+        return status, 'OK' if status < 400 else 'Error', (response_headers or [{}])[0], payload
+
+    def paths(self):
+        return [path for _, path, _ in self.requests]
+
+
+@pytest.fixture
+def fake_transport():
+    """Factory that installs a FakeTransport on a client: fake_transport(api, responses)."""
+    return FakeTransport
+
+
+@pytest.fixture
+def mock_api():
+    """Factory for an in-process mock API without request rate limiting.
+
+    mock_api(**state_options) returns (state, base URL); servers are shut
+    down after the test.
+    """
+    servers = []
+
+    def start(**options):
+        state = mock_server.MockState(api_key='test', max_requests_per_minute=0, **options)
+        server = mock_server.create_server('127.0.0.1', 0, state)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return state, f"http://127.0.0.1:{server.server_address[1]}/{mock_server.API_VERSION}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
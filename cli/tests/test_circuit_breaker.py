@@ -0,0 +1,130 @@
+import pytest
+
+from bijbelquiz_cli import APIError, BijbelQuizAPI, CircuitBreaker, CircuitOpenError
+
+
+class FlakyServer:
+    """Answers /stats with `stats_status` and /health with `health_status`."""
+
+    def __init__(self):
+        self.stats_status = 503
+        self.health_status = 503
+
+    def __call__(self, method, path):
+        if path.endswith('/health'):
+            return self.health_status, b'{"status": "ok"}'
+        return self.stats_status, b'{"score": 1}'
+
+
+@pytest.fixture
+def server():
+    return FlakyServer()
+
+
+@pytest.fixture
+def api(clock, server, fake_transport):
+    api = BijbelQuizAPI('http://api.test/v1', circuit_breaker=CircuitBreaker(failure_threshold=2, reset_timeout=10.0))
+    api.transport = fake_transport(api, server)
+    return api
+
+
+def open_circuit(api):
+    for _ in range(2):
+        with pytest.raises(APIError):
+            api.get_stats()
+    assert api.circuit_breaker.state == CircuitBreaker.OPEN
+
+
+def test_opens_after_consecutive_failures_and_fails_fast(api):
+    open_circuit(api)
+    sent = len(api.transport.requests)
+
+    with pytest.raises(CircuitOpenError):
+        api.get_stats()
+    assert len(api.transport.requests) == sent
+
+
+def test_success_resets_the_failure_count(api, server):
+    with pytest.raises(APIError):
+        api.get_stats()
+    server.stats_status = 200
+    api.get_stats()
+    server.stats_status = 503
+    with pytest.raises(APIError):
+        api.get_stats()
+
+    assert api.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_stays_open_until_reset_timeout(api, clock):
+    open_circuit(api)
+
+    clock.advance(9.9)
+    with pytest.raises(CircuitOpenError):
+        api.get_stats()
+    assert not any(path.endswith('/health') for path in api.transport.paths())
+
+
+def test_failed_health_probe_keeps_the_circuit_open(api, clock):
+    open_circuit(api)
+    clock.advance(10.0)
+
+    with pytest.raises(CircuitOpenError):
+        api.get_stats()
+    assert api.transport.paths()[-1] == '/v1/health'
+    assert api.circuit_breaker.state == CircuitBreaker.OPEN
+
+    # The failed probe starts a new reset_timeout
+    sent = len(api.transport.requests)
+    clock.advance(5.0)
+    with pytest.raises(CircuitOpenError):
+        api.get_stats()
+    assert len(api.transport.requests) == sent
+
+
+def test_healthy_probe_closes_the_circuit(api, clock, server):
+    open_circuit(api)
+    clock.advance(10.0)
+    server.health_status = server.stats_status = 200
+
+    assert api.get_stats() == {'score': 1}
+    assert api.transport.paths()[-2:] == ['/v1/health', '/v1/stats']
+    assert api.circuit_breaker.state == CircuitBreaker.CLOSED
+
+
+def test_only_one_caller_probes_while_half_open(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0)
+    breaker.record_failure()
+    clock.advance(10.0)
+    seen = []
+
+    def probe():
+        seen.append(breaker.state)
+        with pytest.raises(CircuitOpenError):
+            breaker.before_request(probe)
+        return True
+
+    breaker.before_request(probe)
+    assert seen == [CircuitBreaker.HALF_OPEN]
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_probe_that_raises_counts_as_unhealthy(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10.0)
+    breaker.record_failure()
+    clock.advance(10.0)
+
+    def probe():
+        raise OSError("connection refused")
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request(probe)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_health_checks_bypass_the_circuit(api):
+    open_circuit(api)
+
+    with pytest.raises(APIError):
+        api.health()
+    assert api.transport.paths()[-1] == '/v1/health'
@@ -0,0 +1,95 @@
+import pytest
+
+import bijbelquiz_cli
+from bijbelquiz_cli import BijbelQuizAPI, RateLimiter, parse_retry_after
+
+
+def test_burst_is_free_then_requests_wait_for_a_token(clock):
+    limiter = RateLimiter(max_requests=20, window=60.0, burst=5)  # refills 15 tokens a minute
+
+    assert [limiter.reserve() for _ in range(5)] == [0.0] * 5
+    assert limiter.reserve() == pytest.approx(4.0)
+    assert limiter.reserve() == pytest.approx(8.0)
+
+
+def test_tokens_refill_over_time_up_to_the_burst(clock):
+    limiter = RateLimiter(max_requests=20, window=60.0, burst=5)
+    for _ in range(5):
+        limiter.reserve()
+
+    clock.advance(8.0)  # two tokens
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == pytest.approx(4.0)
+
+    clock.advance(3600.0)
+    assert [limiter.reserve() for _ in range(5)] == [0.0] * 5
+    assert limiter.reserve() > 0
+
+
+def test_bucket_never_exceeds_the_server_limit_in_a_window(clock):
+    limiter = RateLimiter(max_requests=100, window=60.0, burst=10)
+    sent = []
+    while True:
+        wait = limiter.reserve()
+        clock.advance(wait)
+        if clock.now > 1060.0:
+            break
+        sent.append(clock.now)
+
+    assert len(sent) <= 100
+
+
+def test_pause_holds_every_token_back_for_the_given_time(clock):
+    limiter = RateLimiter(max_requests=20, window=60.0, burst=5)
+
+    limiter.pause(10.0)
+    assert limiter.reserve() >= 10.0
+
+    clock.advance(30.0)
+    assert limiter.reserve() == pytest.approx(0.0, abs=1e-9)
+
+
+@pytest.mark.parametrize('status, headers, payload, expected', [
+    (429, {}, b'{"error": "Rate limit exceeded", "retry_after": 7}', 7.0),
+    (429, {'retry-after': '3'}, b'{"error": "Rate limit exceeded"}', 3.0),
+    (429, {}, b'not json', None),
+    (429, {}, b'{"error": "Daily star limit exceeded"}', None),
+    (503, {}, b'{"retry_after": 7}', None),
+])
+def test_parse_retry_after(status, headers, payload, expected):
+    assert parse_retry_after(status, headers, payload) == expected
+
+
+def test_client_honours_retry_after_through_the_limiter(clock, monkeypatch, fake_transport):
+    sleeps = []
+    monkeypatch.setattr(bijbelquiz_cli.time, 'sleep', sleeps.append)
+    api = BijbelQuizAPI('http://api.test/v1', rate_limiter=RateLimiter(max_requests=100, burst=10))
+    transport = fake_transport(api, [(429, b'{"retry_after": 7}'), (200, b'{"score": 1}')])
+
+    assert api.get_stats() == {'score': 1}
+    assert len(transport.requests) == 2
+    # The retry waits out retry_after before it may take a token again
+    assert sleeps[0] == 0.0
+    assert sleeps[1] >= 7.0
+
+
+def test_client_without_limiter_sleeps_for_retry_after(monkeypatch, fake_transport):
+    sleeps = []
+    monkeypatch.setattr(bijbelquiz_cli.time, 'sleep', sleeps.append)
+    api = BijbelQuizAPI('http://api.test/v1')
+    fake_transport(api, [(429, b'{"retry_after": 2}'), (200, b'{"score": 1}')])
+
+    assert api.get_stats() == {'score': 1}
+    assert sleeps == [2.0]
+
+
+def test_client_gives_up_after_max_rate_limit_retries(monkeypatch, fake_transport):
+    monkeypatch.setattr(bijbelquiz_cli.time, 'sleep', lambda seconds: None)
+    api = BijbelQuizAPI('http://api.test/v1', max_rate_limit_retries=2)
+    transport = fake_transport(api, lambda method, path: (429, b'{"retry_after": 1}'))
+
+    with pytest.raises(bijbelquiz_cli.APIError) as error:
+        api.get_stats()
+    assert error.value.status == 429
+    assert len(transport.requests) == 3
@@ -0,0 +1,84 @@
+import threading
+
+from bijbelquiz_cli import BijbelQuizAPI, ResponseCache
+
+
+def test_serves_a_copy_until_the_ttl_expires(clock):
+    cache = ResponseCache({'stats': 5.0})
+    cache.put('stats', '/v1/stats', {'score': 1}, cache.generation)
+
+    clock.advance(4.9)
+    cached = cache.get('stats', '/v1/stats')
+    assert cached == {'score': 1}
+    cached['score'] = 2
+    assert cache.get('stats', '/v1/stats') == {'score': 1}
+
+    clock.advance(0.1)
+    assert cache.get('stats', '/v1/stats') is None
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_endpoints_without_a_ttl_are_never_cached(clock):
+    cache = ResponseCache({'stats': 5.0})
+    cache.put('questions', '/v1/questions', {'questions': []}, cache.generation)
+
+    assert cache.get('questions', '/v1/questions') is None
+
+
+def test_invalidate_drops_entries_and_bumps_the_generation(clock):
+    cache = ResponseCache()
+    cache.put('settings', '/v1/settings', {'mute': False}, cache.generation)
+    generation = cache.generation
+
+    cache.invalidate()
+    assert cache.generation == generation + 1
+    assert cache.get('settings', '/v1/settings') is None
+
+
+def test_response_fetched_before_an_invalidation_is_not_stored(clock):
+    cache = ResponseCache()
+    generation = cache.generation  # a GET starts...
+    cache.invalidate()  # ...a star mutation lands while it is in flight...
+    cache.put('stars/balance', '/v1/stars/balance', {'balance': 5}, generation)  # ...and it returns
+
+    assert cache.get('stars/balance', '/v1/stars/balance') is None
+
+
+def test_client_caches_gets_and_star_mutations_invalidate(clock, fake_transport):
+    api = BijbelQuizAPI('http://api.test/v1', cache=ResponseCache())
+    transport = fake_transport(api, lambda method, path: (200, b'{"balance": 5}'))
+
+    api.get_star_balance()
+    api.get_star_balance()
+    assert transport.paths() == ['/v1/stars/balance']
+
+    api.add_stars(1, 'test')
+    api.get_star_balance()
+    assert transport.paths() == ['/v1/stars/balance', '/v1/stars/add', '/v1/stars/balance']
+
+    clock.advance(ResponseCache.DEFAULT_TTLS['stars/balance'])
+    api.get_star_balance()
+    assert transport.paths()[-1] == '/v1/stars/balance'
+    assert len(transport.requests) == 4
+
+
+def test_mutation_during_a_get_keeps_the_stale_response_out(clock, fake_transport):
+    api = BijbelQuizAPI('http://api.test/v1', cache=ResponseCache())
+    in_get, resume = threading.Event(), threading.Event()
+
+    def respond(method, path):
+        if path == '/v1/stats' and not in_get.is_set():
+            in_get.set()
+            resume.wait(5)
+        return 200, b'{"score": 1}'
+
+    transport = fake_transport(api, respond)
+    reader = threading.Thread(target=api.get_stats)
+    reader.start()
+    in_get.wait(5)
+    api.add_stars(1, 'test')
+    resume.set()
+    reader.join(5)
+
+    api.get_stats()
+    assert transport.paths() == ['/v1/stats', '/v1/stars/add', '/v1/stats']
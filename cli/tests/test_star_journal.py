@@ -0,0 +1,157 @@
+import json
+import threading
+import uuid
+
+import pytest
+
+from bijbelquiz_cli import BijbelQuizAPI, StarJournal, TransportError, idempotency_headers
+
+
+class RecordingAPI:
+    """Stands in for BijbelQuizAPI: records star requests, optionally failing them."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.requests = []
+        self.attempted = threading.Event()
+
+    def _post(self, endpoint, data, headers=None):
+        self.requests.append((endpoint, data, headers['Idempotency-Key']))
+        self.attempted.set()
+        if self.fail:
+            raise TransportError("connection refused")
+        return {'success': True}
+
+
+def entry(amount, reason='Quiz', op='add'):
+    return {'id': uuid.uuid4().hex, 'op': op, 'amount': amount, 'reason': reason, 'lessonId': None, 'ts': 0}
+
+
+def write_journal(path, *records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records), encoding='utf-8')
+
+
+def journal_records(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return tmp_path / 'star_journal.jsonl'
+
+
+def replay(api, path):
+    journal = StarJournal(api, str(path))
+    assert journal.open()
+    assert journal.flush(timeout=5)
+    assert journal.close() == 0
+    return journal
+
+
+def test_replay_after_crash_reuses_the_journaled_batch_key(path):
+    # Crashed after journaling the batch key, before the response arrived
+    first, second = entry(3), entry(4)
+    write_journal(path, first, second, {'batch': 'batch-key', 'ids': [first['id'], second['id']]})
+    api = RecordingAPI()
+
+    replay(api, path)
+
+    assert api.requests == [('stars/add', {'amount': 7, 'reason': 'Quiz'}, 'batch-key')]
+    assert journal_records(path) == []
+
+
+def test_batch_key_survives_a_restart_after_failed_sends(path):
+    offline = RecordingAPI(fail=True)
+    journal = StarJournal(offline, str(path), initial_backoff=60.0)
+    assert journal.open()
+    journal.add_stars(5, 'Quiz')
+    assert offline.attempted.wait(5)
+    assert journal.close(timeout=0) == 1
+
+    online = RecordingAPI()
+    replay(online, path)
+
+    keys = {key for _, _, key in offline.requests}
+    assert len(keys) == 1
+    assert online.requests == [('stars/add', {'amount': 5, 'reason': 'Quiz'}, keys.pop())]
+
+
+def test_replayed_batch_is_applied_once_by_the_server(path, mock_api):
+    state, url = mock_api()
+    api = BijbelQuizAPI(url, 'test')
+    # The server applied the batch, but the process crashed before journaling that
+    api.add_stars(7, 'Quiz', idempotency_key='batch-key')
+    first, second = entry(3), entry(4)
+    write_journal(path, first, second, {'batch': 'batch-key', 'ids': [first['id'], second['id']]})
+
+    replay(api, path)
+    api.close()
+
+    assert state.balance == 7
+    assert len(state.transactions) == 1
+
+
+def test_done_entries_are_not_replayed(path):
+    sent, unsent = entry(3), entry(4)
+    write_journal(path, sent, unsent, {'done': [sent['id']]})
+    api = RecordingAPI()
+
+    replay(api, path)
+
+    assert [data['amount'] for _, data, _ in api.requests] == [4]
+
+
+def test_coalesces_matching_entries_up_to_the_batch_amount(path):
+    write_journal(path, entry(10), entry(10), entry(10), entry(5, reason='Les'), entry(30), entry(30),
+                  entry(2, op='spend'))
+    api = RecordingAPI()
+
+    replay(api, path)
+
+    assert [(endpoint, data['amount'], data['reason']) for endpoint, data, _ in api.requests] == [
+        ('stars/add', 30, 'Quiz'),
+        ('stars/add', 5, 'Les'),
+        ('stars/add', 30, 'Quiz'),  # 30 + 30 would pass MAX_BATCH_AMOUNT
+        ('stars/add', 30, 'Quiz'),
+        ('stars/spend', 2, 'Quiz'),
+    ]
+    assert len({key for _, _, key in api.requests}) == 5
+
+
+def test_daily_limit_splits_the_batch_and_drops_what_does_not_fit(path, mock_api):
+    state, url = mock_api(max_daily_stars=20)
+    api = BijbelQuizAPI(url, 'test')
+    write_journal(path, entry(15), entry(10))
+
+    journal = replay(api, path)
+    api.close()
+
+    assert state.balance == 15
+    assert [failed['amount'] for failed in journal.failed] == [10]
+    assert journal_records(path) == []
+
+
+def test_spend_without_enough_stars_is_dropped(path, mock_api):
+    state, url = mock_api()
+    api = BijbelQuizAPI(url, 'test')
+    write_journal(path, entry(5, op='spend'), entry(2))
+
+    journal = replay(api, path)
+    api.close()
+
+    assert state.balance == 2
+    assert [failed['op'] for failed in journal.failed] == ['spend']
+
+
+def test_second_process_cannot_open_a_journal_in_use(path):
+    first = StarJournal(RecordingAPI(), str(path))
+    assert first.open()
+    try:
+        assert not StarJournal(RecordingAPI(), str(path)).open()
+    finally:
+        first.close()
+
+
+def test_idempotency_headers_use_the_given_key():
+    assert idempotency_headers('batch-key') == {'Idempotency-Key': 'batch-key'}
+    assert len(idempotency_headers()['Idempotency-Key']) == 32
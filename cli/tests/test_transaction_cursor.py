@@ -0,0 +1,90 @@
+import base64
+import json
+from datetime import datetime
+
+import pytest
+
+from bijbelquiz_cli import APIError, BijbelQuizAPI
+from mock_server import decode_transaction_cursor, encode_transaction_cursor
+
+TRANSACTION = {'id': '1760781600123', 'timestamp': '2026-10-18T10:00:00.123456'}
+
+
+def test_cursor_is_base64url_of_id_and_timestamp():
+    cursor = encode_transaction_cursor(TRANSACTION)
+
+    assert json.loads(base64.urlsafe_b64decode(cursor)) == {'id': '1760781600123', 'ts': '2026-10-18T10:00:00.123456'}
+    assert not set(cursor) & set('+/')
+
+
+def test_cursor_round_trips():
+    cursor = encode_transaction_cursor(TRANSACTION)
+
+    assert decode_transaction_cursor(cursor) == ('1760781600123', datetime(2026, 10, 18, 10, 0, 0, 123456))
+
+
+def test_cursor_decodes_without_padding():
+    cursor = encode_transaction_cursor({'id': '7', 'timestamp': '2026-10-18T10:00:00'})
+    assert cursor.endswith('=')
+
+    assert decode_transaction_cursor(cursor.rstrip('=')) == ('7', datetime(2026, 10, 18, 10, 0))
+
+
+def test_numeric_cursor_ids_decode_as_strings():
+    cursor = base64.urlsafe_b64encode(b'{"id":42,"ts":"2026-10-18T10:00:00"}').decode('ascii')
+
+    assert decode_transaction_cursor(cursor) == ('42', datetime(2026, 10, 18, 10, 0))
+
+
+@pytest.mark.parametrize('cursor', [
+    '!!!',
+    base64.urlsafe_b64encode(b'not json').decode('ascii'),
+    base64.urlsafe_b64encode(b'{"id":"1"}').decode('ascii'),
+    base64.urlsafe_b64encode(b'{"id":"1","ts":"yesterday"}').decode('ascii'),
+    base64.urlsafe_b64encode(b'[1, 2]').decode('ascii'),
+])
+def test_malformed_cursors_decode_to_none(cursor):
+    assert decode_transaction_cursor(cursor) is None
+
+
+@pytest.fixture
+def api(mock_api):
+    state, url = mock_api(max_daily_stars=0)
+    client = BijbelQuizAPI(url, 'test')
+    for amount in range(1, 11):
+        client.add_stars(amount, 'Quiz')
+    yield client
+    client.close()
+
+
+def test_iter_star_transactions_follows_the_cursor(api):
+    transactions = list(api.iter_star_transactions(page_size=3))
+
+    assert [t['amount'] for t in transactions] == list(range(10, 0, -1))
+    assert len({t['id'] for t in transactions}) == 10
+
+
+def test_last_page_has_no_cursor(api):
+    first = api.get_star_transactions(limit=6)
+    last = api.get_star_transactions(limit=6, cursor=first['next_cursor'])
+
+    assert first['has_more'] and first['next_cursor']
+    assert [t['amount'] for t in last['transactions']] == [4, 3, 2, 1]
+    assert not last['has_more'] and last['next_cursor'] is None
+
+
+def test_trimmed_cursor_resumes_by_timestamp(api):
+    newest = api.get_star_transactions(limit=10)['transactions']
+    # The cursor's transaction is gone, so the page starts at the first older one
+    cursor = encode_transaction_cursor({'id': 'trimmed', 'timestamp': newest[3]['timestamp']})
+    page = api.get_star_transactions(limit=10, cursor=cursor)['transactions']
+
+    assert page
+    assert all(t['timestamp'] < newest[3]['timestamp'] for t in page)
+
+
+def test_invalid_cursor_is_rejected(api):
+    with pytest.raises(APIError) as excinfo:
+        api.get_star_transactions(cursor='not-a-cursor')
+
+    assert excinfo.value.status == 400
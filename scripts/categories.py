@@ -4,6 +4,8 @@ import sys
 import os
 import argparse
 
+from questions import QuestionStore
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 QUESTIONS_FILE = os.path.join(SCRIPT_DIR, "..", "app", "assets", "questions-nl-sv.json")
 QUESTIONS_FILE_WITH_CATEGORIES = os.path.join(SCRIPT_DIR, "..", "app", "assets", "questions-nl-sv_with_categories.json")
@@ -69,9 +71,9 @@ of [\"none\"] als geen enkele categorie past.
 
 def categoriseer_cli(model_naam):
     print("[DEBUG] Starting categorization...", file=sys.stderr)
+    store = QuestionStore()
     try:
-        with open(QUESTIONS_FILE, "r", encoding="utf-8") as f:
-            vragen = json.load(f)
+        vragen = store.load_file(QUESTIONS_FILE)
         with open(CATEGORIES_FILE, "r", encoding="utf-8") as f:
             categorieen = json.load(f)
     except Exception as e:
@@ -83,13 +85,12 @@ def categoriseer_cli(model_naam):
 
     changed = False
     for idx, v in enumerate(vragen):
-        if not v.get("categories"):
-            print(f"[INFO] Categorizing question {idx+1}/{len(vragen)}: {v.get('vraag', '')[:60]}...", file=sys.stderr)
-            v["categories"] = vraag_ollama(v.get("vraag", ""), categorieen, model_naam)
+        if not v.categories:
+            print(f"[INFO] Categorizing question {idx+1}/{len(vragen)}: {v.question[:60]}...", file=sys.stderr)
+            store.update(v, categories=vraag_ollama(v.question, categorieen, model_naam))
             changed = True
             try:
-                with open(temp_file, "w", encoding="utf-8") as f:
-                    json.dump(vragen, f, ensure_ascii=False, indent=2)
+                store.save(path=temp_file)
                 print(f"[DEBUG] Progress saved to {temp_file} after question {idx+1}", file=sys.stderr)
             except Exception as e:
                 print(f"[ERROR] Could not save progress: {e}", file=sys.stderr)
@@ -98,8 +99,7 @@ def categoriseer_cli(model_naam):
 
     if changed:
         try:
-            with open(output_file, "w", encoding="utf-8") as f:
-                json.dump(vragen, f, ensure_ascii=False, indent=2)
+            store.save(path=output_file)
             print(f"[INFO] Geslaagd! Resultaat opgeslagen in '{output_file}'.", file=sys.stderr)
             if os.path.exists(temp_file):
                 os.remove(temp_file)
@@ -112,22 +112,26 @@ def categoriseer_cli(model_naam):
 def check_and_clean_categories():
     with open(CATEGORIES_FILE, "r", encoding="utf-8") as f:
         valid_categories = set(json.load(f))
-    with open(QUESTIONS_FILE_WITH_CATEGORIES, "r", encoding="utf-8") as f:
-        questions = json.load(f)
+    store = QuestionStore()
+    store.load_file(QUESTIONS_FILE_WITH_CATEGORIES)
+    # Only questions with a category missing from the list need to change
+    affected = {}
+    for cat in store.values("category"):
+        if cat not in valid_categories:
+            for q in store.by_category(cat):
+                affected[q.position] = q
     changes = []
-    for idx, q in enumerate(questions):
-        q_cats = q.get("categories", [])
-        invalid = [cat for cat in q_cats if cat not in valid_categories]
-        if invalid:
-            new_cats = [cat for cat in q_cats if cat in valid_categories]
-            questions[idx]["categories"] = new_cats
-            changes.append((idx, q.get("vraag", "<geen vraag>"), invalid))
+    for idx in sorted(affected):
+        q = affected[idx]
+        invalid = [cat for cat in q.categories if cat not in valid_categories]
+        new_cats = [cat for cat in q.categories if cat in valid_categories]
+        store.update(q, categories=new_cats)
+        changes.append((idx, q.question if q.has_field("question") else "<geen vraag>", invalid))
     if changes:
         print("Ongeldige categorieën verwijderd:")
         for idx, vraag, cats in changes:
             print(f"Vraag #{idx+1}: '{vraag}' -> Verwijderd: {cats}")
-        with open(QUESTIONS_FILE_WITH_CATEGORIES, "w", encoding="utf-8") as f:
-            json.dump(questions, f, ensure_ascii=False, indent=2)
+        store.save()
         print(f"Totaal: {len(changes)} vragen aangepast. Bestand bijgewerkt.")
     else:
         print("Alle categorieën zijn geldig. Geen wijzigingen nodig.")
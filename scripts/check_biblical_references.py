@@ -4,12 +4,10 @@ Simple Biblical reference checker - lists only failing question IDs and book nam
 """
 
 import json
-import urllib.request
-import urllib.parse
-import urllib.error
 import re
-import time
-from typing import List, Dict, Set, Tuple, Optional
+from typing import List, Dict, Tuple, Optional
+
+from questions import QuestionStore
 
 
 class SimpleBiblicalChecker:
@@ -161,8 +159,7 @@ class SimpleBiblicalChecker:
     def check_questions_file(self, file_path: str, max_checks: int = 100) -> List[Tuple[str, str]]:
         """Check references and return list of (question_id, book_name) for failing ones."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                questions = json.load(f)
+            questions = QuestionStore().load_file(file_path, packed=True)
         except FileNotFoundError:
             raise Exception(f"File not found: {file_path}")
         except json.JSONDecodeError as e:
@@ -172,8 +169,8 @@ class SimpleBiblicalChecker:
         checked = 0
         
         for question in questions:
-            question_id = question.get('id', 'unknown')
-            reference = question.get('biblicalReference')
+            question_id = question.id if question.has_field('id') else 'unknown'
+            reference = question.biblical_reference
             
             if not self.check_reference(question_id, reference):
                 # Extract book name for reporting
@@ -7,13 +7,38 @@ to populate the questions table.
 The script outputs SQL to a file and uses ON CONFLICT to handle:
 - Adding new records if ID doesn't exist
 - Updating existing records if ID already exists
+
+By default only the changes are written: a delta file
+(questions_data.<language>.delta.sql) with upserts and deletes for the
+questions added, changed or removed since the previous export. The script
+finds those through a manifest of a content hash per question id
+(questions_data.<language>.manifest.json), so syncing a large corpus after a
+one-question edit is a one-row operation and unchanged rows keep their
+updated_at. The manifest records what was last generated, not what was
+applied to the database, so apply each delta before generating the next one.
+Without a manifest the delta contains every question.
+
+With --full every question is written, to the seed file
+database_supabase/questions_data.sql, and the manifest is rewritten to match.
+Delta and manifest files are not committed.
+
+Output formats (--format):
+- statements: one INSERT ... ON CONFLICT statement per question (default)
+- multirow:   rows go into a temporary staging table with multi-row INSERTs
+              of --batch-size rows, then one INSERT ... SELECT ... ON CONFLICT
+              merges them into the table
+- copy:       as multirow, but the staging table is filled with a single
+              COPY ... FROM STDIN; run this file with psql
 """
 
+import hashlib
 import json
 import sys
 import argparse
 from pathlib import Path
 
+from questions import QUESTION_FILES, QuestionStore
+
 def escape_sql_string(s):
     """Escape single quotes for SQL"""
     if s is None:
@@ -27,11 +52,168 @@ def array_to_sql(arr):
     escaped_items = [f"'{item.replace(chr(39), chr(39) + chr(39))}'" for item in arr]
     return f"ARRAY[{','.join(escaped_items)}]"
 
+COLUMNS = {
+    'en': ('id', 'question', 'correct_answer', 'incorrect_answers', 'difficulty', 'type', 'categories', 'biblical_reference'),
+    'nl': ('id', 'vraag', 'juiste_antwoord', 'foute_antwoorden', 'moeilijkheidsgraad', 'type', 'categories', 'biblical_reference'),
+}
+
+def table_for(language):
+    """Name of the table that holds questions of a language"""
+    return 'questions_en' if language == 'en' else 'questions'
+
+def question_id(question):
+    """Id a question is stored under ('' if it has none, as before)"""
+    return question.id if question.has_field('id') else ''
+
+def question_values(question):
+    """SQL literals for a question, in COLUMNS order"""
+    return (
+        escape_sql_string(question_id(question)),
+        escape_sql_string(question.question),
+        escape_sql_string(question.correct_answer),
+        array_to_sql(question.incorrect_answers),
+        f"{question.difficulty}",
+        escape_sql_string(question.type),
+        array_to_sql(question.categories),
+        escape_sql_string(question.biblical_reference),
+    )
+
+def merge_columns_sql(columns):
+    """ON CONFLICT (id) DO UPDATE clause that takes every column from the new row"""
+    updates = ''.join(f"    {column} = EXCLUDED.{column},\n" for column in columns[1:])
+    return f"""ON CONFLICT (id) DO UPDATE SET
+{updates}    updated_at = NOW();"""
+
+def upsert_sql(question, language):
+    """INSERT ... ON CONFLICT (id) DO UPDATE statement for one question"""
+    columns = COLUMNS[language]
+    return f"""INSERT INTO {table_for(language)} ({', '.join(columns)})
+VALUES ({', '.join(question_values(question))})
+{merge_columns_sql(columns)}"""
+
+def staging_table_for(language):
+    """Name of the temporary table bulk loads go through"""
+    return f"{table_for(language)}_staging"
+
+def staging_table_sql(language):
+    """Temporary staging table shaped like the target table, dropped at commit"""
+    return (f"CREATE TEMP TABLE {staging_table_for(language)} "
+            f"(LIKE {table_for(language)} INCLUDING DEFAULTS) ON COMMIT DROP;")
+
+def merge_staging_sql(language):
+    """Upsert every staged row into the target table"""
+    columns = ', '.join(COLUMNS[language])
+    return f"""INSERT INTO {table_for(language)} ({columns})
+SELECT {columns} FROM {staging_table_for(language)}
+{merge_columns_sql(COLUMNS[language])}"""
+
+def unique_by_id(questions):
+    """Questions with duplicate ids collapsed to the last one, as one upsert per question would leave them"""
+    return list({question_id(question): question for question in questions}.values())
+
+def multirow_sql(questions, language, batch_size):
+    """Staging INSERTs of up to batch_size rows each"""
+    questions = unique_by_id(questions)
+    columns = ', '.join(COLUMNS[language])
+    statements = []
+    for start in range(0, len(questions), batch_size):
+        rows = ',\n'.join(f"({', '.join(question_values(question))})"
+                          for question in questions[start:start + batch_size])
+        statements.append(f"INSERT INTO {staging_table_for(language)} ({columns}) VALUES\n{rows};")
+    return statements
+
+def copy_text(value):
+    """Escape a value for COPY's text format"""
+    if value is None:
+        return '\\N'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+def copy_array(values):
+    """PostgreSQL array literal for a list of strings, e.g. {"a","b \\"c\\""}"""
+    if values is None:
+        return None
+    items = ('NULL' if item is None else
+             '"' + str(item).replace('\\', '\\\\').replace('"', '\\"') + '"'
+             for item in values)
+    return '{' + ','.join(items) + '}'
+
+def copy_row(question):
+    """One question as a line of COPY text format, in COLUMNS order"""
+    fields = (
+        question_id(question),
+        question.question,
+        question.correct_answer,
+        copy_array(question.incorrect_answers or []),
+        question.difficulty,
+        question.type,
+        copy_array(question.categories or []),
+        question.biblical_reference,
+    )
+    return '\t'.join(copy_text(field) for field in fields)
+
+def copy_sql(questions, language):
+    """COPY ... FROM STDIN block that fills the staging table"""
+    lines = [f"COPY {staging_table_for(language)} ({', '.join(COLUMNS[language])}) FROM STDIN;"]
+    lines.extend(copy_row(question) for question in unique_by_id(questions))
+    lines.append('\\.')
+    return '\n'.join(lines)
+
+def delete_sql(question_ids, language):
+    """DELETE statement for the given question ids"""
+    ids = ', '.join(escape_sql_string(question_id) for question_id in question_ids)
+    return f"DELETE FROM {table_for(language)} WHERE id IN ({ids});"
+
+def content_hash(question):
+    """Hash of everything that ends up in a question's row"""
+    row = question_values(question)
+    return hashlib.sha256('\x1f'.join(row).encode('utf-8')).hexdigest()[:16]
+
+DEFAULT_OUTPUT = Path('database_supabase/questions_data.sql')
+
+def default_delta_path(language):
+    """Incremental output file, e.g. database_supabase/questions_data.nl.delta.sql"""
+    return DEFAULT_OUTPUT.with_name(f"{DEFAULT_OUTPUT.stem}.{language}.delta.sql")
+
+def default_manifest_path(language):
+    """Manifest of incremental exports, e.g. database_supabase/questions_data.nl.manifest.json"""
+    return DEFAULT_OUTPUT.with_name(f"{DEFAULT_OUTPUT.stem}.{language}.manifest.json")
+
+def load_manifest(path):
+    """Question id -> content hash from the last export, or None without a manifest"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)['questions']
+    except FileNotFoundError:
+        return None
+
+def save_manifest(path, language, source_name, hashes):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'language': language, 'table': table_for(language), 'source': source_name,
+                   'questions': hashes}, f, indent=2, ensure_ascii=False)
+
+def diff_questions(questions, manifest):
+    """Split questions into (inserted, updated, deleted ids, unchanged count) against a manifest"""
+    inserted, updated = [], []
+    unchanged = 0
+    for question in questions:
+        previous = manifest.get(question_id(question))
+        if previous is None:
+            inserted.append(question)
+        elif previous != content_hash(question):
+            updated.append(question)
+        else:
+            unchanged += 1
+    current_ids = {question_id(question) for question in questions}
+    deleted = [question_id for question_id in manifest if question_id not in current_ids]
+    return inserted, updated, deleted, unchanged
+
 def main():
     parser = argparse.ArgumentParser(description='Convert questions JSON to SQL statements')
     parser.add_argument('--output', '-o', 
-                       default='database_supabase/questions_data.sql',
-                       help='Output SQL file path (default: database_supabase/questions_data.sql)')
+                       default=None,
+                       help='Output SQL file path (default: database_supabase/questions_data.<language>.delta.sql, '
+                            'or database_supabase/questions_data.sql with --full)')
     parser.add_argument('--json-file', '-j',
                        default=None,
                        help='Path to JSON file (default: app/assets/questions-nl-sv.json)')
@@ -40,91 +222,107 @@ def main():
                        choices=['nl', 'en'],
                        default='nl',
                        help='Language of the questions (nl or en). Default: nl')
+    parser.add_argument('--manifest', '-m',
+                       default=None,
+                       help='Content hash manifest of the last export '
+                            '(default: database_supabase/questions_data.<language>.manifest.json)')
+    parser.add_argument('--full',
+                       action='store_true',
+                       help='Write every question instead of only the changes since the last export, '
+                            'and rewrite the manifest')
+    parser.add_argument('--format', '-f',
+                       choices=['statements', 'multirow', 'copy'],
+                       default='statements',
+                       help='statements: one upsert per question (default); '
+                            'multirow: batched INSERTs into a staging table; '
+                            'copy: COPY FROM STDIN into a staging table (needs psql)')
+    parser.add_argument('--batch-size', '-b',
+                       type=int,
+                       default=500,
+                       help='Rows per INSERT with --format multirow (default: 500)')
     
     args = parser.parse_args()
+    if args.batch_size < 1:
+        parser.error("--batch-size must be at least 1")
     
     # Determine JSON file path
     if args.json_file:
         json_path = Path(args.json_file)
     else:
-        if args.language == 'en':
-            json_path = Path(__file__).parent.parent / "app" / "assets" / "questions-en.json"
-        else:
-            json_path = Path(__file__).parent.parent / "app" / "assets" / "questions-nl-sv.json"
+        json_path = QUESTION_FILES[args.language]
 
     if not json_path.exists():
         print(f"Error: Questions JSON file not found at {json_path}")
         sys.exit(1)
 
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            questions = json.load(f)
+        questions = QuestionStore().load_file(json_path, args.language, packed=True)
     except Exception as e:
         print(f"Error reading JSON file: {e}")
         sys.exit(1)
 
+    # Ensure output directory exists
+    if args.output:
+        output_path = Path(args.output)
+    else:
+        output_path = DEFAULT_OUTPUT if args.full else default_delta_path(args.language)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    manifest_path = Path(args.manifest) if args.manifest else default_manifest_path(args.language)
+
+    manifest = None
+    if not args.full:
+        try:
+            # Without a manifest every question counts as inserted
+            manifest = load_manifest(manifest_path) or {}
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Error reading manifest {manifest_path}: {e} (use --full to rebuild it)")
+            sys.exit(1)
+
+    if manifest is None:
+        # Full export: every question as an upsert, nothing deleted
+        changed, deleted = questions, []
+    else:
+        inserted, updated, deleted, unchanged = diff_questions(questions, manifest)
+        changed = sorted(inserted + updated, key=lambda question: question.position)
+
     # Prepare SQL output
     sql_lines = []
     sql_lines.append(f"-- SQL INSERT statements for {args.language} questions table")
     sql_lines.append(f"-- Generated from {json_path.name}")
     sql_lines.append(f"-- Generated on: {Path(__file__).stat().st_mtime}")
+    if manifest is not None:
+        sql_lines.append(f"-- Incremental export: {len(inserted)} inserted, {len(updated)} updated, "
+                         f"{len(deleted)} deleted, {unchanged} unchanged")
     sql_lines.append("")
-    
-    # Ensure output directory exists
-    output_path = Path(args.output)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    table_name = 'questions_en' if args.language == 'en' else 'questions'
+    if args.format == 'statements':
+        for question in changed:
+            sql_lines.append(upsert_sql(question, args.language))
+            sql_lines.append("")
 
-    for question in questions:
-        # Extract fields based on language
-        question_id = escape_sql_string(question.get('id', ''))
-        
-        if args.language == 'en':
-            q_text = escape_sql_string(question.get('question', ''))
-            correct = escape_sql_string(question.get('correctAnswer', ''))
-            incorrect = array_to_sql(question.get('incorrectAnswers', []))
-            difficulty = question.get('difficulty', 3)
-            q_type = escape_sql_string(question.get('type', 'mc'))
-            categories = array_to_sql(question.get('categories', []))
-            bib_ref = escape_sql_string(question.get('biblicalReference'))
-            
-            # Generate INSERT statement for English
-            sql = f"""INSERT INTO {table_name} (id, question, correct_answer, incorrect_answers, difficulty, type, categories, biblical_reference)
-VALUES ({question_id}, {q_text}, {correct}, {incorrect}, {difficulty}, {q_type}, {categories}, {bib_ref})
-ON CONFLICT (id) DO UPDATE SET
-    question = EXCLUDED.question,
-    correct_answer = EXCLUDED.correct_answer,
-    incorrect_answers = EXCLUDED.incorrect_answers,
-    difficulty = EXCLUDED.difficulty,
-    type = EXCLUDED.type,
-    categories = EXCLUDED.categories,
-    biblical_reference = EXCLUDED.biblical_reference,
-    updated_at = NOW();"""
-
-        else: # Dutch
-            q_text = escape_sql_string(question.get('vraag', ''))
-            correct = escape_sql_string(question.get('juisteAntwoord', ''))
-            incorrect = array_to_sql(question.get('fouteAntwoorden', []))
-            difficulty = question.get('moeilijkheidsgraad', 3)
-            q_type = escape_sql_string(question.get('type', 'mc'))
-            categories = array_to_sql(question.get('categories', []))
-            bib_ref = escape_sql_string(question.get('biblicalReference'))
-
-            # Generate INSERT statement for Dutch
-            sql = f"""INSERT INTO {table_name} (id, vraag, juiste_antwoord, foute_antwoorden, moeilijkheidsgraad, type, categories, biblical_reference)
-VALUES ({question_id}, {q_text}, {correct}, {incorrect}, {difficulty}, {q_type}, {categories}, {bib_ref})
-ON CONFLICT (id) DO UPDATE SET
-    vraag = EXCLUDED.vraag,
-    juiste_antwoord = EXCLUDED.juiste_antwoord,
-    foute_antwoorden = EXCLUDED.foute_antwoorden,
-    moeilijkheidsgraad = EXCLUDED.moeilijkheidsgraad,
-    type = EXCLUDED.type,
-    categories = EXCLUDED.categories,
-    biblical_reference = EXCLUDED.biblical_reference,
-    updated_at = NOW();"""
-
-        sql_lines.append(sql)
+        if deleted:
+            sql_lines.append(delete_sql(deleted, args.language))
+            sql_lines.append("")
+    elif changed or deleted:
+        # Stage, merge and delete in one transaction
+        sql_lines.append("BEGIN;")
+        sql_lines.append("")
+        if changed:
+            sql_lines.append(staging_table_sql(args.language))
+            sql_lines.append("")
+            if args.format == 'copy':
+                sql_lines.append(copy_sql(changed, args.language))
+                sql_lines.append("")
+            else:
+                for statement in multirow_sql(changed, args.language, args.batch_size):
+                    sql_lines.append(statement)
+                    sql_lines.append("")
+            sql_lines.append(merge_staging_sql(args.language))
+            sql_lines.append("")
+        if deleted:
+            sql_lines.append(delete_sql(deleted, args.language))
+            sql_lines.append("")
+        sql_lines.append("COMMIT;")
         sql_lines.append("")
 
     sql_lines.append(f"-- Total questions processed: {len(questions)}")
@@ -133,11 +331,16 @@ ON CONFLICT (id) DO UPDATE SET
     try:
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write('\n'.join(sql_lines))
+        save_manifest(manifest_path, args.language, json_path.name,
+                      {question_id(question): content_hash(question) for question in questions})
         print(f"SQL statements successfully written to: {output_path}")
         print(f"Total questions processed: {len(questions)}")
+        if manifest is not None:
+            print(f"Changes since last export: {len(inserted)} inserted, {len(updated)} updated, "
+                  f"{len(deleted)} deleted ({unchanged} unchanged)")
     except Exception as e:
         print(f"Error writing to output file: {e}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Load the question files straight into PostgreSQL.
+
+Streams the questions of each language with COPY into a temporary staging
+table and merges that into questions or questions_en in one transaction, so
+readers see either the old or the new set and never a partial load. Rows
+that did not change keep their updated_at. With --prune, rows whose id is no
+longer in the JSON file are deleted in the same transaction.
+
+Languages are loaded concurrently over a small connection pool.
+
+Needs psycopg 3 with its pool (pip install -r scripts/load_requirements.txt).
+
+Usage:
+    python scripts/load_questions.py --dsn postgresql://postgres@localhost/bijbelquiz
+    DATABASE_URL=... python scripts/load_questions.py --language en --prune
+
+To try it against a throwaway database:
+    createdb bijbelquiz_test
+    python scripts/load_questions.py --dsn postgresql:///bijbelquiz_test --create-tables
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import psycopg
+    from psycopg_pool import ConnectionPool, PoolTimeout
+except ImportError:
+    psycopg = None
+
+from json_to_sql import COLUMNS, copy_row, question_id, staging_table_for, staging_table_sql, table_for, unique_by_id
+from questions import QUESTION_FILES, QuestionStore
+
+COPY_CHUNK_ROWS = 1000
+
+# Same columns as database_supabase/questions.sql and questions_en.sql, without
+# the Supabase-specific policies, for local test databases
+TABLE_SQL = """CREATE TABLE IF NOT EXISTS {table} (
+    {columns[0]} TEXT PRIMARY KEY,
+    {columns[1]} TEXT NOT NULL,
+    {columns[2]} TEXT NOT NULL,
+    {columns[3]} TEXT[] NOT NULL,
+    {columns[4]} INTEGER NOT NULL,
+    {columns[5]} TEXT NOT NULL,
+    {columns[6]} TEXT[],
+    {columns[7]} TEXT,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW() NOT NULL
+)"""
+
+
+def merge_sql(language):
+    """Upsert the staging table into the target table, touching only changed rows.
+
+    Returns one row with the number of inserted and updated rows.
+    """
+    table = table_for(language)
+    columns = COLUMNS[language]
+    column_list = ', '.join(columns)
+    updates = ''.join(f"    {column} = EXCLUDED.{column},\n" for column in columns[1:])
+    changed = ', '.join(f"{table}.{column}" for column in columns[1:])
+    excluded = ', '.join(f"EXCLUDED.{column}" for column in columns[1:])
+    return f"""WITH merged AS (
+INSERT INTO {table} ({column_list})
+SELECT {column_list} FROM {staging_table_for(language)}
+ON CONFLICT (id) DO UPDATE SET
+{updates}    updated_at = NOW()
+WHERE ({changed}) IS DISTINCT FROM ({excluded})
+RETURNING (xmax = 0) AS inserted
+)
+SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM merged"""
+
+
+def prune_sql(language):
+    """Delete rows whose id is not in the staging table"""
+    table = table_for(language)
+    return (f"DELETE FROM {table} WHERE NOT EXISTS "
+            f"(SELECT 1 FROM {staging_table_for(language)} s WHERE s.id = {table}.id)")
+
+
+def load_language(pool, language, json_path, prune=False, create_tables=False):
+    """Load one question file; returns a dict with row counts and timings."""
+    started = time.perf_counter()
+    questions = unique_by_id(QuestionStore().load_file(json_path, language, packed=True))
+    if any(question_id(question) == '' for question in questions):
+        raise ValueError(f"{json_path.name} has questions without an id; run add_unique_ids.py first")
+    parsed = time.perf_counter()
+
+    with pool.connection() as conn:
+        with conn.transaction():
+            cur = conn.cursor()
+            if create_tables:
+                cur.execute(TABLE_SQL.format(table=table_for(language), columns=COLUMNS[language]))
+            cur.execute(staging_table_sql(language))
+            with cur.copy(f"COPY {staging_table_for(language)} ({', '.join(COLUMNS[language])}) FROM STDIN") as copy:
+                for start in range(0, len(questions), COPY_CHUNK_ROWS):
+                    chunk = questions[start:start + COPY_CHUNK_ROWS]
+                    copy.write(''.join(copy_row(question) + '\n' for question in chunk))
+            copied = time.perf_counter()
+            cur.execute(merge_sql(language))
+            inserted, updated = cur.fetchone()
+            deleted = 0
+            if prune:
+                cur.execute(prune_sql(language))
+                deleted = cur.rowcount
+    finished = time.perf_counter()
+
+    return {
+        'language': language,
+        'table': table_for(language),
+        'rows': len(questions),
+        'inserted': inserted,
+        'updated': updated,
+        'unchanged': len(questions) - inserted - updated,
+        'deleted': deleted,
+        'parse_seconds': parsed - started,
+        'copy_seconds': copied - parsed,
+        'seconds': finished - started,
+    }
+
+
+def print_report(result):
+    rate = result['rows'] / result['seconds'] if result['seconds'] > 0 else 0
+    print(f"{result['language']} -> {result['table']}: {result['rows']} rows "
+          f"({result['inserted']} inserted, {result['updated']} updated, "
+          f"{result['unchanged']} unchanged, {result['deleted']} deleted) "
+          f"in {result['seconds']:.3f}s, {rate:,.0f} rows/s "
+          f"(parse {result['parse_seconds']*1000:.1f} ms, copy {result['copy_seconds']*1000:.1f} ms)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load questions JSON into PostgreSQL')
+    parser.add_argument('--dsn', '-d',
+                        default=os.getenv('DATABASE_URL'),
+                        help='PostgreSQL connection string (default: $DATABASE_URL)')
+    parser.add_argument('--language', '-l',
+                        choices=['nl', 'en', 'all'],
+                        default='all',
+                        help='Language to load (default: all)')
+    parser.add_argument('--json-file', '-j',
+                        default=None,
+                        help='Path to JSON file (default: the app asset for the language)')
+    parser.add_argument('--prune',
+                        action='store_true',
+                        help='Delete rows whose id is no longer in the JSON file')
+    parser.add_argument('--create-tables',
+                        action='store_true',
+                        help='Create the tables if they do not exist (for local test databases)')
+    parser.add_argument('--connect-timeout',
+                        type=float,
+                        default=10.0,
+                        help='Seconds to wait for a database connection (default: 10)')
+    args = parser.parse_args()
+
+    if psycopg is None:
+        print("Error: psycopg is not installed. Run: pip install -r scripts/load_requirements.txt")
+        sys.exit(1)
+    if not args.dsn:
+        parser.error("--dsn or DATABASE_URL is required")
+
+    languages = ['nl', 'en'] if args.language == 'all' else [args.language]
+    if args.json_file and len(languages) > 1:
+        parser.error("--json-file needs a single --language")
+
+    sources = {language: Path(args.json_file) if args.json_file else QUESTION_FILES[language]
+               for language in languages}
+    for language, json_path in sources.items():
+        if not json_path.exists():
+            print(f"Error: Questions JSON file not found at {json_path}")
+            sys.exit(1)
+
+    started = time.perf_counter()
+    try:
+        with ConnectionPool(args.dsn, min_size=1, max_size=len(languages), open=False,
+                            kwargs={'client_encoding': 'utf8'}) as pool:
+            pool.open(wait=True, timeout=args.connect_timeout)
+            with ThreadPoolExecutor(max_workers=len(languages)) as executor:
+                futures = [executor.submit(load_language, pool, language, json_path, args.prune, args.create_tables)
+                           for language, json_path in sources.items()]
+                results = [future.result() for future in futures]
+    except PoolTimeout:
+        print(f"Error: could not connect to the database within {args.connect_timeout:g}s")
+        sys.exit(1)
+    except (psycopg.Error, OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    elapsed = time.perf_counter() - started
+
+    for result in results:
+        print_report(result)
+    if len(results) > 1:
+        rows = sum(result['rows'] for result in results)
+        print(f"Total: {rows} rows in {elapsed:.3f}s, {rows / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Compile the question files into binary packs and read them with mmap.
+
+A pack holds the normalised questions of one language (see questions.py) in
+five sections:
+
+    header      magic, version, language, record count, the size and mtime
+                of the JSON file it was built from, and the section offsets
+    strings     every distinct UTF-8 string, concatenated
+    lists       (offset, length) string references that make up the answer
+                and category lists
+    records     one fixed-width record per question, in file order, with a
+                bit per field saying whether the JSON entry had it
+    index       (id offset, id length, record number), sorted by id
+
+QuestionPack maps the file and only decodes the records that are asked for,
+so looking up one question does not parse the whole corpus. Packs are
+rebuilt automatically when their JSON file has changed.
+
+QuestionStore.load_file(..., packed=True) reads the app's question files
+through their packs; the read-only scripts load questions that way.
+
+Usage:
+    python scripts/question_pack.py                 # build both languages if stale
+    python scripts/question_pack.py --force -l en   # rebuild the English pack
+    python scripts/question_pack.py --get 000042    # print one question
+"""
+
+import argparse
+import bisect
+import json
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from questions import DEFAULTS, QUESTION_FILES, SOURCE_KEYS, Question, QuestionStore, difficulty_key
+
+PACK_DIR = Path(__file__).resolve().parent / "build"
+PACK_MAGIC = b"BQPK"
+PACK_VERSION = 2
+
+HEADER = struct.Struct('<4sH2sIQqIIIIII')
+# id, question, correct answer, reference and type as (offset, length) string
+# references, answers and categories as (first, count) list references, then
+# the difficulty and the bits of the fields the JSON entry has (in Question.FIELDS order)
+RECORD = struct.Struct('<IIIIIIIIIIIHIHhH')
+STRING_REF = struct.Struct('<II')
+INDEX_ENTRY = struct.Struct('<III')
+
+NONE = 0xFFFFFFFF  # string offset of a missing string
+NONE_LIST = 0xFFFF  # list count of a missing list
+NONE_DIFFICULTY = -32768
+
+
+def default_pack_path(language: str) -> Path:
+    """Where the pack for a language lives unless told otherwise."""
+    return PACK_DIR / f"questions-{language}.pack"
+
+
+class _PackWriter:
+    """Collects strings and lists while records are encoded."""
+
+    def __init__(self):
+        self.strings = bytearray()
+        self.string_refs = {}
+        self.lists = bytearray()
+        self.list_count = 0
+
+    def string(self, value) -> tuple:
+        if value is None:
+            return NONE, 0
+        if not isinstance(value, str):
+            value = str(value)
+        ref = self.string_refs.get(value)
+        if ref is None:
+            data = value.encode('utf-8')
+            ref = (len(self.strings), len(data))
+            self.strings += data
+            self.string_refs[value] = ref
+        return ref
+
+    def string_list(self, values) -> tuple:
+        if values is None:
+            return 0, NONE_LIST
+        if len(values) >= NONE_LIST:
+            raise ValueError(f"List of {len(values)} items is too long for a pack record")
+        first = self.list_count
+        for value in values:
+            self.lists += STRING_REF.pack(*self.string(value))
+        self.list_count += len(values)
+        return first, len(values)
+
+
+def compile_pack(source, output=None, language: str = 'nl') -> Path:
+    """Build the pack for one question file and return its path.
+
+    The pack is written to a temporary file and moved into place, so readers
+    never see a half-written pack.
+    """
+    source = Path(source)
+    output = Path(output) if output else default_pack_path(language)
+    stat = source.stat()
+    questions = QuestionStore().load_file(source, language)
+
+    writer = _PackWriter()
+    records = bytearray()
+    index = []
+    for number, question in enumerate(questions):
+        difficulty = difficulty_key(question.difficulty)
+        if difficulty is None:
+            difficulty = NONE_DIFFICULTY
+        elif not isinstance(difficulty, int) or not -32768 < difficulty < 32768:
+            raise ValueError(f"Question {question.id!r} has a difficulty the pack cannot store: {difficulty!r}")
+        id_ref = writer.string(question.id)
+        records += RECORD.pack(
+            *id_ref,
+            *writer.string(question.question),
+            *writer.string(question.correct_answer),
+            *writer.string(question.biblical_reference),
+            *writer.string(question.type),
+            *writer.string_list(question.incorrect_answers),
+            *writer.string_list(question.categories),
+            difficulty,
+            sum(1 << bit for bit, field in enumerate(Question.FIELDS) if question.has_field(field)),
+        )
+        if question.id is not None:
+            index.append((str(question.id).encode('utf-8'), id_ref, number))
+
+    index.sort(key=lambda entry: entry[0])
+    index_data = b''.join(INDEX_ENTRY.pack(*id_ref, number) for _, id_ref, number in index)
+
+    strings_offset = HEADER.size
+    lists_offset = strings_offset + len(writer.strings)
+    records_offset = lists_offset + len(writer.lists)
+    index_offset = records_offset + len(records)
+    header = HEADER.pack(PACK_MAGIC, PACK_VERSION, language.encode('ascii')[:2].ljust(2), len(questions),
+                         stat.st_size, stat.st_mtime_ns, strings_offset, len(writer.strings),
+                         lists_offset, records_offset, index_offset, len(index))
+
+    output.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = output.with_name(output.name + '.tmp')
+    with open(temp_path, 'wb') as f:
+        f.write(header)
+        f.write(writer.strings)
+        f.write(writer.lists)
+        f.write(records)
+        f.write(index_data)
+    os.replace(temp_path, output)
+    return output
+
+
+def pack_is_current(source, pack) -> bool:
+    """Whether the pack exists and was built from the source file as it is now."""
+    try:
+        with open(pack, 'rb') as f:
+            header = f.read(HEADER.size)
+        stat = Path(source).stat()
+    except OSError:
+        return False
+    if len(header) < HEADER.size:
+        return False
+    magic, version, _, _, source_size, source_mtime_ns, *_ = HEADER.unpack(header)
+    return (magic == PACK_MAGIC and version == PACK_VERSION
+            and source_size == stat.st_size and source_mtime_ns == stat.st_mtime_ns)
+
+
+def ensure_pack(language: str = 'nl', source=None, pack=None) -> Path:
+    """Path of an up-to-date pack for a language, compiling it first if needed."""
+    source = Path(source) if source else QUESTION_FILES[language]
+    pack = Path(pack) if pack else default_pack_path(language)
+    if not pack_is_current(source, pack):
+        compile_pack(source, pack, language)
+    return pack
+
+
+class QuestionPack:
+    """Read-only, memory-mapped view of a question pack.
+
+    Questions are decoded on access; indexing by position and lookups by id
+    touch only the bytes of the records involved.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, language, self._count, self.source_size, self.source_mtime_ns,
+             self._strings_offset, _, self._lists_offset, self._records_offset,
+             self._index_offset, self._index_count) = HEADER.unpack_from(self._mm, 0)
+        except struct.error:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a question pack")
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            self._mm.close()
+            raise ValueError(f"{self.path} is not a version {PACK_VERSION} question pack")
+        self.language = language.decode('ascii').strip()
+        self._index_keys = _IndexKeys(self)
+        self._key_orders = {}  # field bits -> source keys, shared by records
+
+    @classmethod
+    def open(cls, language: str = 'nl', source=None, pack=None) -> 'QuestionPack':
+        """Open the pack for a language, rebuilding it first if its JSON file changed."""
+        return cls(ensure_pack(language, source, pack))
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, position: int) -> Question:
+        if position < 0:
+            position += self._count
+        if not 0 <= position < self._count:
+            raise IndexError(f"Question position {position} out of range")
+        return self._decode(position)
+
+    def __iter__(self) -> Iterator[Question]:
+        for position in range(self._count):
+            yield self._decode(position)
+
+    def all(self) -> List[Question]:
+        """Every question, in file order.
+
+        Decodes the records in one pass and each distinct string once, which
+        is quicker than iterating when the whole corpus is needed.
+        """
+        strings = {}
+
+        def string(offset, length):
+            if offset == NONE:
+                return None
+            value = strings.get(offset)
+            if value is None:
+                value = strings[offset] = self._string(offset, length)
+            return value
+
+        def string_list(first, count):
+            if count == NONE_LIST:
+                return None
+            start = self._lists_offset + first * STRING_REF.size
+            return [string(*ref) for ref in
+                    STRING_REF.iter_unpack(self._mm[start:start + count * STRING_REF.size])]
+
+        records = self._mm[self._records_offset:self._records_offset + self._count * RECORD.size]
+        return [self._question(position, record, string, string_list)
+                for position, record in enumerate(RECORD.iter_unpack(records))]
+
+    def get(self, question_id: str) -> Optional[Question]:
+        """The question with this id, or None."""
+        key = str(question_id).encode('utf-8')
+        slot = bisect.bisect_left(self._index_keys, key)
+        if slot < self._index_count and self._index_keys[slot] == key:
+            _, _, position = INDEX_ENTRY.unpack_from(self._mm, self._index_offset + slot * INDEX_ENTRY.size)
+            return self._decode(position)
+        return None
+
+    def ids(self) -> List[str]:
+        """Every question id, in sorted order."""
+        return [self._index_keys[slot].decode('utf-8') for slot in range(self._index_count)]
+
+    def _string(self, offset: int, length: int) -> Optional[str]:
+        if offset == NONE:
+            return None
+        start = self._strings_offset + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+    def _string_list(self, first: int, count: int) -> Optional[List[str]]:
+        if count == NONE_LIST:
+            return None
+        start = self._lists_offset + first * STRING_REF.size
+        return [self._string(*STRING_REF.unpack_from(self._mm, start + i * STRING_REF.size))
+                for i in range(count)]
+
+    def _decode(self, position: int) -> Question:
+        record = RECORD.unpack_from(self._mm, self._records_offset + position * RECORD.size)
+        return self._question(position, record, self._string, self._string_list)
+
+    def _question(self, position: int, record: tuple, string, string_list) -> Question:
+        (id_offset, id_length, question_offset, question_length, correct_offset, correct_length,
+         reference_offset, reference_length, type_offset, type_length,
+         answers_first, answers_count, categories_first, categories_count,
+         difficulty, fields) = record
+        question = Question.__new__(Question)
+        question.language = self.language
+        question.position = position
+        question.id = string(id_offset, id_length)
+        question.question = string(question_offset, question_length)
+        question.correct_answer = string(correct_offset, correct_length)
+        question.incorrect_answers = string_list(answers_first, answers_count)
+        question.difficulty = None if difficulty == NONE_DIFFICULTY else difficulty
+        question.type = string(type_offset, type_length)
+        question.categories = string_list(categories_first, categories_count)
+        question.biblical_reference = string(reference_offset, reference_length)
+        question._source_keys = self._source_keys(fields)
+        question._extra = None
+        return question
+
+    def _source_keys(self, fields: int) -> tuple:
+        keys = self._key_orders.get(fields)
+        if keys is None:
+            source_keys = SOURCE_KEYS[self.language]
+            keys = self._key_orders[fields] = tuple(source_keys[field] for bit, field in enumerate(Question.FIELDS)
+                                                    if fields & 1 << bit)
+        return keys
+
+
+class _IndexKeys:
+    """The sorted id index as a sequence of id bytes, for bisect."""
+
+    def __init__(self, pack: QuestionPack):
+        self._pack = pack
+
+    def __len__(self) -> int:
+        return self._pack._index_count
+
+    def __getitem__(self, slot: int) -> bytes:
+        pack = self._pack
+        offset, length, _ = INDEX_ENTRY.unpack_from(pack._mm, pack._index_offset + slot * INDEX_ENTRY.size)
+        start = pack._strings_offset + offset
+        return pack._mm[start:start + length]
+
+
+def load_pack(language: str = 'nl') -> List[Question]:
+    """Every question of a language's app file, read from its pack (rebuilt first if stale)."""
+    with QuestionPack.open(language) as pack:
+        return pack.all()
+
+
+def question_to_dict(question: Question) -> dict:
+    """The normalised fields of a question, for printing."""
+    return {field: getattr(question, field) for field in DEFAULTS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compile question files into binary packs')
+    parser.add_argument('--language', '-l',
+                        choices=['nl', 'en', 'all'],
+                        default='all',
+                        help='Language to build (default: all)')
+    parser.add_argument('--json-file', '-j',
+                        default=None,
+                        help='Path to JSON file (default: the app asset for the language)')
+    parser.add_argument('--output', '-o',
+                        default=None,
+                        help=f'Pack file path (default: {PACK_DIR}/questions-<language>.pack)')
+    parser.add_argument('--force', '-f',
+                        action='store_true',
+                        help='Rebuild even if the pack is up to date')
+    parser.add_argument('--get',
+                        metavar='ID',
+                        help='Print the question with this id from the pack')
+    args = parser.parse_args()
+
+    languages = ['nl', 'en'] if args.language == 'all' else [args.language]
+    if (args.json_file or args.output) and len(languages) > 1:
+        parser.error("--json-file and --output need a single --language")
+
+    for language in languages:
+        source = Path(args.json_file) if args.json_file else QUESTION_FILES[language]
+        pack_path = Path(args.output) if args.output else default_pack_path(language)
+        try:
+            if args.force or not pack_is_current(source, pack_path):
+                compile_pack(source, pack_path, language)
+                print(f"Built {pack_path} from {source.name} ({pack_path.stat().st_size} bytes)")
+            elif not args.get:
+                print(f"{pack_path} is up to date")
+
+            if args.get:
+                with QuestionPack(pack_path) as pack:
+                    question = pack.get(args.get)
+                    if question is not None:
+                        print(json.dumps(question_to_dict(question), ensure_ascii=False, indent=2))
+                    elif len(languages) == 1:
+                        print(f"Error: no question with id {args.get} in {pack_path}")
+                        sys.exit(1)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Shared question store for the scripts in this directory.
+
+Loads the Dutch and English question files once into normalised records with
+the same field names for both languages (`question` rather than `vraag` or
+`question`, `correct_answer` rather than `juisteAntwoord` or `correctAnswer`,
+and so on), and keeps indexes by id, difficulty, category, book and type so
+lookups and filters do not have to scan the whole corpus.
+
+Records can be changed through QuestionStore.update() and written back with
+QuestionStore.save(), which reproduces the original file format exactly:
+same keys, same key order, indent=2. Scripts that only read can pass
+packed=True to load the app's question files from their compiled packs
+(see question_pack.py) instead of parsing the JSON.
+
+Example:
+    from questions import QuestionStore
+
+    store = QuestionStore.load()
+    question = store.get('000042')
+    hard_genesis = store.filter(difficulty=5, book='Genesis')
+"""
+
+import bisect
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+ASSETS_DIR = Path(__file__).resolve().parent.parent / "app" / "assets"
+QUESTION_FILES = {
+    'nl': ASSETS_DIR / "questions-nl-sv.json",
+    'en': ASSETS_DIR / "questions-en.json",
+}
+
+# Normalised field name -> JSON key, per language file
+SOURCE_KEYS = {
+    'nl': {
+        'id': 'id',
+        'question': 'vraag',
+        'correct_answer': 'juisteAntwoord',
+        'incorrect_answers': 'fouteAntwoorden',
+        'difficulty': 'moeilijkheidsgraad',
+        'type': 'type',
+        'categories': 'categories',
+        'biblical_reference': 'biblicalReference',
+    },
+    'en': {
+        'id': 'id',
+        'question': 'question',
+        'correct_answer': 'correctAnswer',
+        'incorrect_answers': 'incorrectAnswers',
+        'difficulty': 'difficulty',
+        'type': 'type',
+        'categories': 'categories',
+        'biblical_reference': 'biblicalReference',
+    },
+}
+
+# Values for keys a question does not have (the app uses the same defaults)
+DEFAULTS = {
+    'id': None,
+    'question': '',
+    'correct_answer': '',
+    'incorrect_answers': [],
+    'difficulty': 3,
+    'type': 'mc',
+    'categories': [],
+    'biblical_reference': None,
+}
+
+# Key orders seen in the files; records share these tuples instead of each
+# keeping its own copy
+_KEY_ORDERS = {}
+
+
+def reference_book(reference: Optional[str]) -> Optional[str]:
+    """Book name of a reference like 'Genesis 1:1-3', '1 Samuël 2', 'Genesis 2 en 3' or 'Psalmen'."""
+    if not reference or not reference.strip():
+        return None
+    words = reference.strip().split(' en ')[0].split()
+    while len(words) > 1 and words[-1][0].isdigit():
+        words.pop()
+    return ' '.join(words)
+
+
+def detect_language(path, data: Optional[list] = None) -> str:
+    """Language of a question file: from its name (questions-en*.json is English),
+    else from the keys of its first question, else Dutch."""
+    name = Path(path).name
+    for language, default_path in QUESTION_FILES.items():
+        if name.startswith(default_path.stem):
+            return language
+    if data and isinstance(data[0], dict):
+        for language, keys in SOURCE_KEYS.items():
+            if keys['question'] in data[0] and keys['correct_answer'] in data[0]:
+                return language
+    return 'nl'
+
+
+def difficulty_key(difficulty):
+    """Difficulty as an int where possible, so 3 and '3' index alike."""
+    if isinstance(difficulty, str) and difficulty.strip().isdigit():
+        return int(difficulty)
+    return difficulty
+
+
+class Question:
+    """One question with language-independent field names."""
+
+    __slots__ = ('language', 'position', 'id', 'question', 'correct_answer', 'incorrect_answers',
+                 'difficulty', 'type', 'categories', 'biblical_reference', '_source_keys', '_extra')
+
+    FIELDS = tuple(DEFAULTS)
+
+    def __init__(self, language: str = 'nl', position: int = 0, **fields):
+        unknown = set(fields) - set(self.FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown question field(s): {', '.join(sorted(unknown))}")
+        self.language = language
+        self.position = position
+        for field in self.FIELDS:
+            setattr(self, field, fields.get(field, DEFAULTS[field]))
+        keys = SOURCE_KEYS[language]
+        self._source_keys = tuple(keys[field] for field in self.FIELDS if field in fields)
+        self._extra = None
+
+    @classmethod
+    def from_source(cls, data: dict, language: str = 'nl', position: int = 0) -> 'Question':
+        """Build a record from one entry of a question file."""
+        keys = SOURCE_KEYS[language]
+        question = cls.__new__(cls)
+        question.language = language
+        question.position = position
+        for field, key in keys.items():
+            setattr(question, field, data.get(key, DEFAULTS[field]))
+        order = tuple(data)
+        question._source_keys = _KEY_ORDERS.setdefault(order, order)
+        known = set(keys.values())
+        extra = {key: value for key, value in data.items() if key not in known}
+        question._extra = extra or None
+        return question
+
+    def to_source(self) -> dict:
+        """The question in its language file's format, with its keys in their original order."""
+        fields = {key: field for field, key in SOURCE_KEYS[self.language].items()}
+        return {key: getattr(self, fields[key]) if key in fields else self._extra[key]
+                for key in self._source_keys}
+
+    def has_field(self, field: str) -> bool:
+        """Whether the source entry has this field (rather than using its default)."""
+        return SOURCE_KEYS[self.language][field] in self._source_keys
+
+    @property
+    def book(self) -> Optional[str]:
+        """Book name from the biblical reference, if there is one."""
+        return reference_book(self.biblical_reference)
+
+    def __repr__(self):
+        return f"Question({self.language}:{self.id!r}, {str(self.question)[:40]!r})"
+
+
+class QuestionStore:
+    """Questions of one or more languages with secondary indexes.
+
+    Every index maps (language, value) to that language's questions with
+    the value, in file order. Lookups by id are O(1); filters cost O(k) in
+    the smallest matching index instead of O(n) in the corpus.
+    """
+
+    INDEXES = ('difficulty', 'category', 'book', 'type')
+
+    def __init__(self):
+        self.questions = {}  # language -> [Question] in file order
+        self.paths = {}  # language -> file the questions were loaded from
+        self.packed = set()  # languages loaded from a pack, which cannot be saved
+        self._by_id = {}  # (language, id) -> Question
+        self._indexes = {name: {} for name in self.INDEXES}
+
+    @classmethod
+    def load(cls, languages=('nl', 'en'), paths: Optional[Dict[str, str]] = None) -> 'QuestionStore':
+        """Load the question file of each language (the app's assets unless `paths` says otherwise)."""
+        store = cls()
+        for language in languages:
+            store.load_file((paths or {}).get(language) or QUESTION_FILES[language], language)
+        return store
+
+    def load_file(self, path, language: Optional[str] = None, packed: bool = False) -> List[Question]:
+        """Load (or reload) one language from a question file and index it.
+
+        Without a language it is detected from the file (see detect_language).
+        With packed=True one of the app's question files is read from its pack,
+        which is rebuilt first if the file changed; other files, and packs
+        that cannot be built or read, are parsed as JSON. Packed records keep
+        neither unknown keys nor key order, so that language cannot be saved.
+
+        Raises OSError if the file cannot be read and ValueError if it is not
+        a JSON list of questions.
+        """
+        if packed and language is None:
+            language = detect_language(path)
+        records = self._load_pack(path, language) if packed else None
+        if records is None:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, list):
+                raise ValueError(f"Expected a list of questions in {path}")
+            if language is None:
+                language = detect_language(path, data)
+            records = [Question.from_source(item, language, i) for i, item in enumerate(data)]
+            self.packed.discard(language)
+        else:
+            self.packed.add(language)
+
+        if language in self.questions:
+            for question in self.questions[language]:
+                self._unindex(question)
+        self.questions[language] = records
+        self.paths[language] = Path(path)
+        for question in records:
+            self._index(question)
+        return records
+
+    @staticmethod
+    def _load_pack(path, language: str) -> Optional[List[Question]]:
+        """Records of an app question file from its pack, or None to parse the JSON instead."""
+        if Path(path).resolve() != QUESTION_FILES[language]:
+            return None
+        from question_pack import load_pack  # question_pack imports this module
+        try:
+            return load_pack(language)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, language: str = 'nl', path=None):
+        """Write one language back in its original format (to `path`, or where it was loaded from)."""
+        if language in self.packed:
+            raise ValueError(f"The {language} questions were loaded from a pack and cannot be saved")
+        with open(path or self.paths[language], 'w', encoding='utf-8') as f:
+            json.dump([question.to_source() for question in self.questions[language]], f,
+                      ensure_ascii=False, indent=2)
+
+    def _index_entries(self, question: Question) -> Iterator[tuple]:
+        yield 'difficulty', difficulty_key(question.difficulty)
+        yield 'type', question.type
+        book = question.book
+        if book:
+            yield 'book', book
+        for category in dict.fromkeys(question.categories or []):
+            yield 'category', category
+
+    def _index(self, question: Question):
+        if question.id is not None:
+            self._by_id.setdefault((question.language, question.id), question)
+        for name, value in self._index_entries(question):
+            entries = self._indexes[name].setdefault((question.language, value), [])
+            if entries and entries[-1].position > question.position:
+                bisect.insort(entries, question, key=lambda q: q.position)
+            else:
+                entries.append(question)
+
+    def _unindex(self, question: Question):
+        if self._by_id.get((question.language, question.id)) is question:
+            del self._by_id[(question.language, question.id)]
+        for name, value in self._index_entries(question):
+            key = (question.language, value)
+            entries = self._indexes[name].get(key, [])
+            if question in entries:
+                entries.remove(question)
+            if not entries:
+                self._indexes[name].pop(key, None)
+
+    def update(self, question: Question, **fields):
+        """Change fields of a question and keep the indexes in step.
+
+        Fields the source entry did not have are added to it, so they are
+        written by save().
+        """
+        unknown = set(fields) - set(Question.FIELDS)
+        if unknown:
+            raise TypeError(f"Unknown question field(s): {', '.join(sorted(unknown))}")
+        self._unindex(question)
+        keys = SOURCE_KEYS[question.language]
+        added = tuple(keys[field] for field in fields if keys[field] not in question._source_keys)
+        if added:
+            order = question._source_keys + added
+            question._source_keys = _KEY_ORDERS.setdefault(order, order)
+        for field, value in fields.items():
+            setattr(question, field, value)
+        self._index(question)
+
+    def __len__(self) -> int:
+        return sum(len(questions) for questions in self.questions.values())
+
+    def __iter__(self) -> Iterator[Question]:
+        for questions in self.questions.values():
+            yield from questions
+
+    def all(self, language: str = 'nl') -> List[Question]:
+        """Every question of a language, in file order."""
+        return list(self.questions.get(language, []))
+
+    def get(self, question_id: str, language: str = 'nl') -> Optional[Question]:
+        """The question with this id, or None."""
+        return self._by_id.get((language, question_id))
+
+    def values(self, index: str, language: str = 'nl') -> Dict[object, int]:
+        """Distinct values of an index (e.g. every category) with their question counts."""
+        return {value: len(entries) for (entry_language, value), entries in self._indexes[index].items()
+                if entry_language == language}
+
+    def by_difficulty(self, difficulty, language: str = 'nl') -> List[Question]:
+        return list(self._indexes['difficulty'].get((language, difficulty_key(difficulty)), []))
+
+    def by_category(self, category: str, language: str = 'nl') -> List[Question]:
+        return list(self._indexes['category'].get((language, category), []))
+
+    def by_book(self, book: str, language: str = 'nl') -> List[Question]:
+        return list(self._indexes['book'].get((language, book), []))
+
+    def by_type(self, question_type: str, language: str = 'nl') -> List[Question]:
+        return list(self._indexes['type'].get((language, question_type), []))
+
+    def filter(self, language: str = 'nl', difficulty=None, category: Optional[str] = None,
+               book: Optional[str] = None, type: Optional[str] = None) -> List[Question]:
+        """Questions matching every given criterion, in file order.
+
+        Starts from the smallest matching index and checks the other
+        criteria on its entries only.
+        """
+        criteria = {name: value for name, value in (('difficulty', difficulty_key(difficulty)),
+                                                     ('category', category), ('book', book), ('type', type))
+                    if value is not None}
+        if not criteria:
+            return self.all(language)
+
+        candidates = {name: self._indexes[name].get((language, value), []) for name, value in criteria.items()}
+        smallest = min(candidates, key=lambda name: len(candidates[name]))
+        checks = [(name, value) for name, value in criteria.items() if name != smallest]
+        return [question for question in candidates[smallest]
+                if all(self._matches(question, name, value) for name, value in checks)]
+
+    @staticmethod
+    def _matches(question: Question, name: str, value) -> bool:
+        if name == 'difficulty':
+            return difficulty_key(question.difficulty) == value
+        if name == 'category':
+            return value in (question.categories or [])
+        if name == 'book':
+            return question.book == value
+        return question.type == value
@@ -0,0 +1,71 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent
+
+QUESTIONS = [
+    {"id": "000001", "vraag": "Wie bouwde de ark?", "juisteAntwoord": "Noach",
+     "fouteAntwoorden": ["Mozes", "Abraham", "David"], "moeilijkheidsgraad": 1, "type": "mc",
+     "categories": ["Oude Testament"], "biblicalReference": "Genesis 6:14"},
+    {"id": "000002", "vraag": "Hoeveel discipelen had Jezus?", "juisteAntwoord": "12",
+     "fouteAntwoorden": ["10", "7", "3"], "moeilijkheidsgraad": 2, "type": "mc",
+     "categories": ["Nieuwe Testament"], "biblicalReference": "Matteüs 10:1-4"},
+]
+
+
+def run_export(tmp_path, *extra):
+    return subprocess.run(
+        [sys.executable, str(SCRIPTS_DIR / 'json_to_sql.py'),
+         '--json-file', str(tmp_path / 'questions.json'),
+         '--output', str(tmp_path / 'delta.sql'),
+         '--manifest', str(tmp_path / 'manifest.json'), *extra],
+        check=True, capture_output=True, text=True)
+
+
+def statements(tmp_path):
+    sql = (tmp_path / 'delta.sql').read_text(encoding='utf-8')
+    return [line for line in sql.splitlines() if line.startswith(('INSERT', 'DELETE'))]
+
+
+def write_questions(tmp_path, questions):
+    (tmp_path / 'questions.json').write_text(json.dumps(questions, ensure_ascii=False), encoding='utf-8')
+
+
+def test_second_run_writes_empty_delta(tmp_path):
+    write_questions(tmp_path, QUESTIONS)
+
+    run_export(tmp_path)
+    assert len(statements(tmp_path)) == 2
+
+    result = run_export(tmp_path)
+    assert statements(tmp_path) == []
+    assert '0 inserted, 0 updated, 0 deleted (2 unchanged)' in result.stdout
+
+
+def test_delta_holds_only_changed_and_removed_questions(tmp_path):
+    write_questions(tmp_path, QUESTIONS)
+    run_export(tmp_path)
+
+    changed = dict(QUESTIONS[1], juisteAntwoord="Twaalf")
+    write_questions(tmp_path, [changed])
+    run_export(tmp_path)
+
+    sql = (tmp_path / 'delta.sql').read_text(encoding='utf-8')
+    assert statements(tmp_path) == ["INSERT INTO questions (id, vraag, juiste_antwoord, foute_antwoorden, "
+                                    "moeilijkheidsgraad, type, categories, biblical_reference)",
+                                    "DELETE FROM questions WHERE id IN ('000001');"]
+    assert "'Twaalf'" in sql
+
+
+def test_full_writes_every_question_and_rewrites_manifest(tmp_path):
+    write_questions(tmp_path, QUESTIONS)
+    run_export(tmp_path)
+    (tmp_path / 'manifest.json').write_text(json.dumps({'questions': {}}), encoding='utf-8')
+
+    run_export(tmp_path, '--full')
+    assert len(statements(tmp_path)) == 2
+
+    run_export(tmp_path)
+    assert statements(tmp_path) == []
@@ -0,0 +1,96 @@
+import json
+import os
+
+import pytest
+
+import question_pack
+from question_pack import QuestionPack, compile_pack, ensure_pack, pack_is_current
+from questions import QUESTION_FILES, Question, QuestionStore
+
+
+@pytest.fixture(autouse=True)
+def pack_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(question_pack, 'PACK_DIR', tmp_path / 'build')
+    return tmp_path / 'build'
+
+
+def assert_same_question(packed, parsed):
+    assert packed.position == parsed.position
+    for field in Question.FIELDS:
+        assert getattr(packed, field) == getattr(parsed, field), (parsed.id, field)
+        assert packed.has_field(field) == parsed.has_field(field), (parsed.id, field)
+
+
+@pytest.mark.parametrize('language', sorted(QUESTION_FILES))
+def test_pack_round_trips_every_question(tmp_path, language):
+    parsed = QuestionStore().load_file(QUESTION_FILES[language], language)
+    path = compile_pack(QUESTION_FILES[language], tmp_path / 'questions.pack', language)
+
+    with QuestionPack(path) as pack:
+        assert pack.language == language
+        assert len(pack) == len(parsed)
+        for packed, question in zip(pack.all(), parsed):
+            assert_same_question(packed, question)
+        for packed, question in zip(pack, parsed):
+            assert_same_question(packed, question)
+        for question in parsed:
+            assert_same_question(pack.get(question.id), question)
+        assert pack.get('no such id') is None
+        assert pack.ids() == sorted(question.id for question in parsed)
+
+
+def test_pack_keeps_missing_fields_and_nulls(tmp_path):
+    source = tmp_path / 'questions-custom.json'
+    source.write_text(json.dumps([
+        {"vraag": "Zonder id", "juisteAntwoord": "Ja"},
+        {"id": "000002", "vraag": "Met lege velden", "juisteAntwoord": "Ja", "fouteAntwoorden": None,
+         "moeilijkheidsgraad": "4", "biblicalReference": None},
+    ]), encoding='utf-8')
+    parsed = QuestionStore().load_file(source, 'nl')
+
+    with QuestionPack(compile_pack(source, tmp_path / 'custom.pack', 'nl')) as pack:
+        first, second = pack.all()
+    assert_same_question(first, parsed[0])
+    assert not first.has_field('id')
+    assert second.incorrect_answers is None
+    assert second.difficulty == 4
+
+
+def test_pack_is_rebuilt_when_source_changes(tmp_path):
+    source = tmp_path / 'questions.json'
+    source.write_text(json.dumps([{"id": "000001", "vraag": "Eerste", "juisteAntwoord": "A"}]), encoding='utf-8')
+    pack_path = tmp_path / 'questions.pack'
+    ensure_pack('nl', source, pack_path)
+    assert pack_is_current(source, pack_path)
+
+    source.write_text(json.dumps([{"id": "000001", "vraag": "Gewijzigd", "juisteAntwoord": "A"},
+                                  {"id": "000002", "vraag": "Tweede", "juisteAntwoord": "B"}]), encoding='utf-8')
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert not pack_is_current(source, pack_path)
+
+    with QuestionPack(ensure_pack('nl', source, pack_path)) as pack:
+        assert [question.question for question in pack] == ['Gewijzigd', 'Tweede']
+
+
+def test_store_loads_app_files_from_their_pack(pack_dir):
+    store = QuestionStore()
+    questions = store.load_file(QUESTION_FILES['en'], packed=True)
+
+    assert store.packed == {'en'}
+    assert (pack_dir / 'questions-en.pack').exists()
+    assert questions == store.all('en')
+    assert store.get(questions[0].id, 'en') is questions[0]
+    with pytest.raises(ValueError):
+        store.save('en')
+
+
+def test_store_parses_other_files_as_json(tmp_path, pack_dir):
+    source = tmp_path / 'questions-custom.json'
+    source.write_text(json.dumps([{"id": "000001", "vraag": "Eerste", "juisteAntwoord": "A"}]), encoding='utf-8')
+    store = QuestionStore()
+    store.load_file(source, 'nl', packed=True)
+
+    assert store.packed == set()
+    assert not pack_dir.exists()
+    store.save('nl')
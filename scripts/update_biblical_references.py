@@ -6,7 +6,8 @@ This script maps old biblical book names to the new normalized versions.
 
 import json
 import re
-from typing import Dict, List, Optional
+
+from questions import QuestionStore
 
 class BiblicalReferenceUpdater:
     """Updates biblical references to use normalized book names."""
@@ -72,21 +73,21 @@ class BiblicalReferenceUpdater:
         # Create reverse mapping for faster lookups
         self._reverse_mapping = {v: k for k, v in self.BOOK_NAME_MAPPING.items()}
     
-    def update_biblical_references(self, questions: List[Dict]) -> List[Dict]:
-        """Update all biblical references in the questions list."""
+    def update_biblical_references(self, store: QuestionStore, language: str = 'nl') -> int:
+        """Update all biblical references of a language in the store; returns how many changed."""
         updated_count = 0
         
-        for question in questions:
-            if 'biblicalReference' in question and question['biblicalReference']:
-                old_reference = question['biblicalReference']
+        for question in store.all(language):
+            if question.biblical_reference:
+                old_reference = question.biblical_reference
                 new_reference = self.update_reference_string(old_reference)
                 
                 if new_reference != old_reference:
-                    question['biblicalReference'] = new_reference
+                    store.update(question, biblical_reference=new_reference)
                     updated_count += 1
                     print(f"Updated: {old_reference} → {new_reference}")
         
-        return questions, updated_count
+        return updated_count
     
     def update_reference_string(self, reference: str) -> str:
         """Update a single biblical reference string."""
@@ -163,34 +164,36 @@ class BiblicalReferenceUpdater:
         print(f"Loading questions from: {file_path}")
         
         # Load the JSON file
+        store = QuestionStore()
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                questions = json.load(f)
+            questions = store.load_file(file_path)
         except FileNotFoundError:
             raise Exception(f"File not found: {file_path}")
         except json.JSONDecodeError as e:
             raise Exception(f"Invalid JSON in {file_path}: {e}")
-        
-        if not isinstance(questions, list):
+        except ValueError:
             raise Exception("Expected questions to be a list")
         
-        print(f"Loaded {len(questions)} questions")
+        language = next(iter(store.questions))
+        print(f"Loaded {len(questions)} questions ({language})")
+        if language != 'nl':
+            # BOOK_NAME_MAPPING normalises Dutch book names only
+            print("✅ No biblical references updated: only Dutch book names are normalised")
+            return
         
         # Create backup if requested
         if backup:
             backup_path = f"{file_path}.backup"
             print(f"Creating backup: {backup_path}")
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(questions, f, ensure_ascii=False, indent=2)
+            store.save(path=backup_path)
         
         # Update references
-        updated_questions, updated_count = self.update_biblical_references(questions)
+        updated_count = self.update_biblical_references(store)
         
         if updated_count > 0:
             # Write updated questions back to file
-            print(f"Writing {len(updated_questions)} updated questions to: {file_path}")
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(updated_questions, f, ensure_ascii=False, indent=2)
+            print(f"Writing {len(questions)} updated questions to: {file_path}")
+            store.save()
             
             print(f"✅ Successfully updated {updated_count} biblical references")
         else: